@@ -1,477 +1,407 @@
-import re
-import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
-import arabic_reshaper
-from bidi.algorithm import get_display
-from collections import Counter
-
-def parse_whatsapp_chat(folder_path):
-    """
-    Membaca semua file .txt di sebuah folder, mem-parsingnya, 
-    dan mengubahnya menjadi DataFrame Pandas.
-    """
-    all_data = []
-    
-    # Pola Regex ini disesuaikan untuk format WhatsApp: DD/MM/YY HH.MM - Sender: Message
-    # Contoh: 20/08/25 02.54 - Nama Pengirim: Pesan
-    # Dibuat lebih spesifik untuk format tahun 2 digit (YY) untuk meningkatkan akurasi.
-    pattern = re.compile(r"(\d{1,2}/\d{1,2}/\d{2}) (\d{1,2}\.\d{2}) - (.*?): (.*)")
-
-    for filename in os.listdir(folder_path):
-        if filename.endswith(".txt"):
-            file_path = os.path.join(folder_path, filename)
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    match = pattern.match(line)
-                    if match:
-                        date_str, time_str, sender, message = match.groups()
-                        # Membersihkan karakter kontrol tak terlihat (seperti LTR/RTL marks) dari nama pengirim
-                        cleaned_sender = ''.join(c for c in sender if c.isprintable()).strip()
-                        all_data.append([f"{date_str}, {time_str}", cleaned_sender, message.strip(), filename])
-    
-    if not all_data:
-        return pd.DataFrame() 
-
-    df = pd.DataFrame(all_data, columns=['Timestamp', 'Sender', 'Message', 'Filename'])
-    df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='%d/%m/%y, %H.%M', errors='coerce')
-    df.dropna(subset=['Timestamp'], inplace=True) 
-    
-    return df
-
-# --- BAGIAN EKSEKUSI UTAMA ---
-
-# !!! PENTING: Ganti path font ini dengan path font Arab yang ada di sistem Anda
-# Contoh untuk Windows: 'C:/Windows/Fonts/arial.ttf'
-# Contoh untuk MacOS: '/System/Library/Fonts/Supplemental/Arial.ttf'
-# Contoh untuk Linux: '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
-# Jika tidak ditemukan, Word Cloud tidak akan dibuat.
-font_path_arabic = 'C:/Windows/Fonts/arial.ttf' # Ganti dengan path yang benar jika perlu
-
-
-folder_path = 'data-whatsapp'
-df_full = parse_whatsapp_chat(folder_path)
-
-if df_full.empty:
-    print("Tidak ada data yang berhasil dibaca atau diproses.")
-    print("Pastikan pola Regex di dalam kode sesuai dengan format chat di file .txt Anda.")
-else:
+import json
+import argparse
+
+from exporters import EXPORT_FORMATS
+from instrumentation import Tracer, activate, span
+from report_renderer import REPORT_FORMATS
+
+# Modul analisis (pandas), penggambaran grafik (matplotlib, seaborn) dan
+# pembentukan teks Arab (arabic_reshaper, bidi) sengaja diimpor di dalam
+# perintah yang membutuhkannya saja, agar 'ingest', 'stats' dan 'export'
+# tetap cepat dijalankan.
+
+# --- KONFIGURASI ---
+# Nilai bawaan. Bisa ditimpa lewat file konfigurasi JSON (--config) dengan
+# kunci yang sama, lalu lewat argumen baris perintah.
+DEFAULT_CONFIG = {
+    # Folder berisi file ekspor chat WhatsApp (.txt)
+    'folder': 'data-whatsapp',
+    # Cache ingest: hanya file chat yang baru atau berubah yang di-parsing ulang
+    # (null / --no-cache untuk selalu mem-parsing ulang semua file)
+    'cache': 'cache_ingest',
+    # Folder hasil ekspor CSV
+    'output': 'hasil_analisis_csv',
+    # Format ekspor: 'csv' (utf-8-sig), 'parquet' (dipartisi per tanggal),
+    # 'feather' dan/atau 'sqlite' (dengan index pengirim, percakapan, tanggal)
+    'export_formats': ['csv'],
+    # Store pesan terindeks (SQLite + FTS5) untuk perintah 'query'; dibangun
+    # ulang otomatis jika isi folder chat atau penjual berubah
+    'store': 'indeks_pesan.sqlite',
+    # Nama akun penjual; pesannya dipisahkan dari pesan pembeli. Bisa berupa
+    # daftar nama jika satu toko dilayani beberapa akun
+    'seller': 'Nusa Restoria',
+    # Jeda tanpa pesan (menit) yang memulai sesi baru dalam satu percakapan
+    'session_gap_minutes': 24 * 60,
+    # Jumlah proses worker untuk parsing dan render (null = jumlah core)
+    'workers': None,
+    # Font yang mendukung karakter Arab untuk semua grafik, agar nama Arab tidak
+    # error atau tampil sebagai kotak-kotak (misal: 'Arial' atau 'Tahoma')
+    'font': 'Arial',
+    # !!! PENTING: Ganti path font ini dengan path font Arab yang ada di sistem Anda
+    # Contoh untuk Windows: 'C:/Windows/Fonts/arial.ttf'
+    # Contoh untuk MacOS: '/System/Library/Fonts/Supplemental/Arial.ttf'
+    # Contoh untuk Linux: '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+    # Jika tidak ditemukan, Word Cloud tidak akan dibuat.
+    'font_path_arabic': 'C:/Windows/Fonts/arial.ttf',
+    # Folder laporan grafik; jika kosong, grafik ditampilkan di jendela
+    'report_dir': None,
+    'report_format': 'png',
+    # Mode pantau: jeda minimum (detik) antar penerbitan ulang hasil, dan
+    # interval polling folder jika paket watchdog tidak terpasang
+    'watch_debounce': 2.0,
+    'watch_poll': 0.5,
+    # Mode batch: daftar tenant {"seller": ..., "folder": ..., "name": opsional}
+    # yang dianalisis paralel (cache di <cache>/tenants/<nama>), dan batas
+    # memori (MB) per proses tenant
+    'tenants': [],
+    'tenant_memory_mb': None,
+    # Instrumentasi: file Chrome trace JSON berisi waktu, CPU, baris dan memori
+    # per tahap, serta tahap yang di-profil dengan cProfile ('all' = semua
+    # tahap utama) dan folder hasil profilnya
+    'trace': None,
+    'profile': None,
+    'profile_dir': 'profil',
+}
+
+
+def load_config(args):
+    """Menggabungkan DEFAULT_CONFIG, file --config (JSON) dan argumen baris perintah."""
+    config = dict(DEFAULT_CONFIG)
+    options = vars(args).copy()
+    options.pop('command', None)
+
+    config_path = options.pop('config', None)
+    if config_path is not None:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            file_config = json.load(f)
+        unknown = set(file_config) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise SystemExit(f"Kunci konfigurasi tidak dikenal di '{config_path}': {', '.join(sorted(unknown))}")
+        config.update(file_config)
+
+    config.update(options)
+    return config
+
+
+def load_messages(config):
+    from chat_parser import parse_whatsapp_chat
+
+    with span('load') as s:
+        df_full = parse_whatsapp_chat(config['folder'], workers=config['workers'], cache_dir=config['cache'])
+        s.rows_out = len(df_full)
+
+    if df_full.empty:
+        print("Tidak ada data yang berhasil dibaca atau diproses.")
+        print("Pastikan pola Regex di dalam kode sesuai dengan format chat di file .txt Anda.")
+        return None
+
     print("Data berhasil di-parsing! Jumlah pesan yang terdeteksi:", len(df_full))
+    return df_full
+
+
+def open_analysis(config):
+    df_full = load_messages(config)
+    if df_full is None:
+        return None
+
+    from analysis import Analysis
 
     # --- FILTER DATA ---
-    # Memfilter data untuk tidak menyertakan 'Nusa Restoria' agar hanya data pembeli yang dianalisis
-    # df_full digunakan untuk analisis yang butuh konteks penjual dan pembeli
-    df = df_full[df_full['Sender'] != 'Nusa Restoria']
-    print(f"Data setelah memfilter 'Nusa Restoria' (hanya menampilkan data pembeli): {len(df)} pesan.")
+    # Pesan penjual dipisahkan agar hanya data pembeli yang dianalisis;
+    # df_full tetap dipakai untuk analisis yang butuh konteks penjual dan pembeli
+    analysis = Analysis(df_full, config['seller'], session_gap_minutes=config['session_gap_minutes'])
+    seller = config['seller'] if isinstance(config['seller'], str) else ', '.join(config['seller'])
+    print(f"Data setelah memfilter '{seller}' (hanya menampilkan data pembeli): {len(analysis.buyers)} pesan.")
+    return analysis
+
+
+def command_ingest(config):
+    """Mem-parsing folder chat dan memperbarui cache ingest saja."""
+    load_messages(config)
+
+
+def command_stats(config):
+    """Menampilkan statistik pengirim dan aktivitas di terminal."""
+    analysis = open_analysis(config)
+    if analysis is not None:
+        print("\nMemulai analisis data...")
+        with span('print_stats'):
+            analysis.print_stats()
+
+
+def command_export(config):
+    """Mengekspor hasil analisis (CSV, Parquet, Feather atau SQLite)."""
+    analysis = open_analysis(config)
+    if analysis is not None:
+        with span('export'):
+            analysis.export_tables(config['output'], formats=config['export_formats'])
+
+
+def show_or_render(analysis, config):
+    from report_renderer import render_report, show_charts
+
+    with span('build_charts') as s:
+        charts = analysis.build_charts(font_path_arabic=config['font_path_arabic'])
+        s.rows_out = len(charts)
+
+    if config['report_dir'] is not None:
+        # Mode headless: semua grafik dirender paralel ke file, tanpa jendela
+        print(f"\nMerender {len(charts)} grafik ke folder '{config['report_dir']}' (format {config['report_format']})...")
+        with span('render', rows_in=len(charts)) as s:
+            paths = render_report(
+                charts, config['report_dir'], fmt=config['report_format'],
+                workers=config['workers'], font_family=config['font'],
+            )
+            s.rows_out = len(paths)
+        for path in paths:
+            print(f"- File '{path}' berhasil disimpan.")
+        return
 
-    # --- ANALISIS DATA ---
-    print("\nMemulai analisis data...")
+    # Menampilkan semua grafik
+    print("\nMenampilkan grafik... Tutup semua jendela grafik untuk mengakhiri program.")
+    show_charts(charts, font_family=config['font'])
+
+
+def command_report(config):
+    """Membuat semua grafik (jendela interaktif, atau file dengan --laporan)."""
+    analysis = open_analysis(config)
+    if analysis is not None:
+        show_or_render(analysis, config)
+
+
+def command_watch(config):
+    """Memantau folder chat dan memperbarui statistik begitu ada pesan baru."""
+    from live_watch import watch
+
+    watch(
+        config['folder'], config['seller'], config['output'], formats=config['export_formats'],
+        debounce=config['watch_debounce'], poll_interval=config['watch_poll'],
+    )
+
+
+def command_batch(config):
+    """Menganalisis beberapa penjual (tenant) sekaligus, per tenant dan gabungan."""
+    from tenant_batch import parse_tenants, run_batch
 
-    df['Hour'] = df['Timestamp'].dt.hour
-    df['Day'] = df['Timestamp'].dt.day_name()
-    df['Date'] = df['Timestamp'].dt.date
-
-    sender_counts = df['Sender'].value_counts()
-    top_10_senders = sender_counts.head(10)
-    print("\n" + "="*30)
-    print("     TOP 10 PENGIRIM PESAN TERBANYAK")
-    print("="*30)
-    print(top_10_senders)
-
-    day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    daily_activity = df['Day'].value_counts().reindex(day_order)
-    print("\n" + "="*30)
-    print("        AKTIVITAS PESAN PER HARI")
-    print("="*30)
-    print(daily_activity)
-
-    date_activity = df['Date'].value_counts().sort_index()
-    print("\n" + "="*30)
-    print("      AKTIVITAS PESAN PER TANGGAL")
-    print("="*30)
-    print(date_activity)
-
-
-    # --- EKSPOR DATA KE CSV ---
-    print("\n\nMengekspor hasil analisis ke folder 'hasil_analisis_csv'...")
-    output_folder = 'hasil_analisis_csv'
-    os.makedirs(output_folder, exist_ok=True)
-
-    # 1. Ekspor semua data chat yang sudah di-parse
-    df.to_csv(os.path.join(output_folder, 'semua_pesan.csv'), index=False, encoding='utf-8-sig')
-    print(f"- File 'semua_pesan.csv' berhasil disimpan.")
-
-    # 2. Ekspor top 10 pengirim
-    df_top_senders = top_10_senders.reset_index()
-    df_top_senders.columns = ['Pengirim', 'Jumlah Pesan']
-    df_top_senders.to_csv(os.path.join(output_folder, 'top_10_pengirim.csv'), index=False, encoding='utf-8-sig')
-    print(f"- File 'top_10_pengirim.csv' berhasil disimpan.")
-
-    # 3. Ekspor aktivitas harian
-    df_daily_activity = daily_activity.reset_index()
-    df_daily_activity.columns = ['Hari', 'Jumlah Pesan']
-    df_daily_activity.to_csv(os.path.join(output_folder, 'aktivitas_harian.csv'), index=False, encoding='utf-8-sig')
-    print(f"- File 'aktivitas_harian.csv' berhasil disimpan.")
-
-    # 4. Ekspor aktivitas per tanggal
-    df_date_activity = date_activity.reset_index()
-    df_date_activity.columns = ['Tanggal', 'Jumlah Pesan']
-    df_date_activity.to_csv(os.path.join(output_folder, 'aktivitas_per_tanggal.csv'), index=False, encoding='utf-8-sig')
-    print(f"- File 'aktivitas_per_tanggal.csv' berhasil disimpan.")
-
-    # --- VISUALISASI DATA ---
-    print("\nMembuat visualisasi data...")
-    sns.set_style("whitegrid")
-
-    # Mengatur font yang mendukung karakter Arab untuk semua grafik.
-    # Ini adalah perbaikan penting agar nama Arab tidak error atau tampil sebagai kotak-kotak.
-    # Pastikan Anda memiliki font seperti 'Arial' atau 'Tahoma' yang terinstall.
     try:
-        plt.rcParams['font.family'] = 'Arial'
-        print("-> Font 'Arial' berhasil diatur untuk semua grafik.")
-    except RuntimeError:
-        print("-> Peringatan: Font 'Arial' tidak ditemukan. Label berbahasa Arab mungkin tidak akan tampil dengan benar.")
-        print("   Silakan ganti dengan nama font lain yang terinstall di sistem Anda (misal: 'Tahoma').")
-
-    # Grafik 1: Top 10 Pengirim
-    plt.figure(figsize=(12, 8))
-    
-    # Reshape label nama pengirim agar teks Arab tampil benar
-    reshaped_labels = [get_display(arabic_reshaper.reshape(label)) for label in top_10_senders.index]
-    
-    # Menggunakan bar chart horizontal agar nama yang panjang lebih mudah dibaca
-    sns.barplot(x=top_10_senders.values, y=reshaped_labels, palette='viridis')
-    plt.title('Top 10 Anggota Paling Aktif', fontsize=16)
-    plt.xlabel('Jumlah Pesan', fontsize=12)
-    plt.ylabel('Nama Pengirim', fontsize=12)
-    plt.tight_layout()
-
-    # Grafik 2: Aktivitas Chat per Jam
-    plt.figure(figsize=(12, 6))
-    hourly_activity = df['Hour'].value_counts().sort_index()
-    hourly_activity.plot(kind='line', marker='o', color='coral')
-    plt.title('Distribusi Pesan Sepanjang Hari', fontsize=16)
-    plt.xlabel('Jam', fontsize=12)
-    plt.ylabel('Jumlah Pesan', fontsize=12)
-    plt.xticks(range(0, 24))
-    plt.grid(True)
-    plt.tight_layout()
-
-    # Grafik 3: Aktivitas Pesan per Tanggal (dengan Nama Hari)
-    plt.figure(figsize=(15, 7))
-    ax = date_activity.plot(kind='line', marker='o', color='purple')
-    plt.title('Aktivitas Pesan per Tanggal', fontsize=16)
-    plt.xlabel('Tanggal', fontsize=12)
-    plt.ylabel('Jumlah Pesan', fontsize=12)
-
-    # Buat label kustom dengan nama hari dalam Bahasa Indonesia
-    day_map_en_to_id = {
-        'Monday': 'Senin', 'Tuesday': 'Selasa', 'Wednesday': 'Rabu',
-        'Thursday': 'Kamis', 'Friday': 'Jumat', 'Saturday': 'Sabtu', 'Sunday': 'Minggu'
-    }
-    
-    # Konversi index (objek datetime.date) ke pandas Timestamps untuk menggunakan .dt
-    timestamps = pd.to_datetime(date_activity.index)
-    
-    # Buat label baru dalam format "Hari, DD-MM-YY"
-    new_labels = [f"{day_map_en_to_id[ts.day_name()]}, {ts.strftime('%d-%m-%y')}" for ts in timestamps]
-    
-    # Atur label kustom pada sumbu-x
-    ax.set_xticks(timestamps)
-    ax.set_xticklabels(new_labels, rotation=45, ha='right')
-    
-    plt.grid(True)
-    plt.tight_layout()
-
-    # --- Grafik 5: Analisis Jenis Gaharu yang Dicari ---
-    print("\nMembuat grafik analisis jenis gaharu yang dicari...")
-    
-    gaharu_keywords = {
-        'Scented Bakhoor (بخور معطر)': ['بخور معطر'],
-        'Natural (طبيعي)': ['طبيعي', 'الطبيعي'],
-        'Enhanced (محسن)': ['محسن', 'المحسن'],
-        'Artificial (صناعي)': ['صناعي', 'الصناعي'],
-        'Sumatra (سومطرة)': ['سومطرة', 'sumatra'],
-        'Kalimantan (كاليمانتان)': ['كاليمانتان', 'kalimantan'],
-        'Merauke (ميروكي)': ['ميروكي', 'merauke']
-    }
-    
-    gaharu_counts = {key: 0 for key in gaharu_keywords.keys()}
-    
-    # Menggunakan pesan dari pembeli saja (df sudah difilter)
-    for message in df['Message']:
-        # Pastikan pesan adalah string untuk menghindari error
-        if isinstance(message, str):
-            for gaharu_type, keywords in gaharu_keywords.items():
-                if any(keyword in message for keyword in keywords):
-                    gaharu_counts[gaharu_type] += 1
-    
-    # Filter jenis gaharu yang tidak pernah disebutkan
-    gaharu_counts = {k: v for k, v in gaharu_counts.items() if v > 0}
-    
-    if gaharu_counts:
-        # Membuat Series Pandas untuk di-plot
-        gaharu_series = pd.Series(gaharu_counts).sort_values(ascending=True)
-        
-        plt.figure(figsize=(12, 8))
-        
-        # Reshape label agar teks Arab tampil benar
-        reshaped_labels = [get_display(arabic_reshaper.reshape(label)) for label in gaharu_series.index]
-        
-        sns.barplot(x=gaharu_series.values, y=reshaped_labels, palette='plasma')
-        plt.title('Jenis Gaharu yang Paling Sering Disebutkan', fontsize=16)
-        plt.xlabel('Jumlah Penyebutan', fontsize=12)
-        plt.ylabel('Jenis Gaharu', fontsize=12)
-        # Menambahkan label angka di ujung setiap bar
-        for index, value in enumerate(gaharu_series.values):
-            plt.text(value, index, f' {value}', va='center', ha='left')
-        plt.tight_layout()
-    else:
-        print("-> Tidak ditemukan penyebutan jenis gaharu spesifik dalam chat.")
-
-    # --- Grafik 6: Analisis Pertanyaan Umum ---
-    print("\nMembuat grafik analisis pertanyaan umum dari pelanggan...")
-
-    # Kata kunci untuk pertanyaan umum (dalam bentuk lowercase untuk pencocokan)
-    question_keywords = {
-        'Tanya Harga (كم سعر)': ['كم سعر', 'كم السعر', 'الأسعار', 'كم سعره', 'كم عر'],
-        'Tanya Detail Produk (تفاصيل)': ['تفاصيل', 'ايش العروض', 'ماهي الاعواد', 'اي نوع', 'ما هو النوع'],
-        'Tanya Ketersediaan (هل متوفر)': ['هل يوجد', 'هل عندكم', 'متوفر'],
-        'Minta Gambar/Katalog (صور)': ['صور', 'العرض', 'كاتلوج'],
-        'Tanya Lokasi/Pengiriman (المكان فين)': ['المكان فين', 'كيف نوصل', 'كيف ترسل']
-    }
-
-    question_counts = {key: 0 for key in question_keywords.keys()}
-
-    # Iterasi hanya pada pesan dari pelanggan (df)
-    for message in df['Message']:
-        if isinstance(message, str):
-            msg_lower = message.lower()
-            # Iterasi pada setiap kategori pertanyaan
-            for category, keywords in question_keywords.items():
-                # Jika ada kata kunci yang cocok, hitung dan hentikan pencarian untuk pesan ini
-                if any(keyword in msg_lower for keyword in keywords):
-                    question_counts[category] += 1
-                    break # Agar satu pesan tidak dihitung di beberapa kategori
-
-    # Filter kategori yang tidak pernah ditanyakan
-    question_counts = {k: v for k, v in question_counts.items() if v > 0}
-
-    if question_counts:
-        question_series = pd.Series(question_counts).sort_values(ascending=True)
-        plt.figure(figsize=(12, 8))
-        reshaped_labels = [get_display(arabic_reshaper.reshape(label)) for label in question_series.index]
-        sns.barplot(x=question_series.values, y=reshaped_labels, palette='crest')
-        plt.title('Top 5 Kategori Pertanyaan Umum dari Pelanggan', fontsize=16)
-        plt.xlabel('Jumlah Pertanyaan', fontsize=12)
-        plt.ylabel('Kategori Pertanyaan', fontsize=12)
-        for index, value in enumerate(question_series.values):
-            plt.text(value, index, f' {value}', va='center', ha='left')
-        plt.tight_layout()
-    else:
-        print("-> Tidak ditemukan pertanyaan umum yang cocok dengan kata kunci.")
-
-    # --- Grafik 7: Analisis Penyebab Chat Tidak Dibalas ---
-    print("\nMembuat grafik analisis penyebab chat tidak dibalas...")
-
-    unreplied_chats = []
-    # Group by conversation file, menggunakan df_full yang berisi semua chat
-    for filename, group in df_full.groupby('Filename'):
-        group = group.sort_values('Timestamp')
-        if not group.empty:
-            # Cek apakah pesan terakhir dalam sebuah percakapan dikirim oleh penjual
-            if group.iloc[-1]['Sender'] == 'Nusa Restoria':
-                unreplied_chats.append(group)
-
-    if unreplied_chats:
-        drop_off_reasons = Counter()
-        
-        # Definisikan kategori dan kata kunci (urutan penting, dari spesifik ke umum)
-        categories = {
-            'Follow-up (Tidak Dibalas)': ['متابعة بسيطة'],
-            'Diskusi Harga': ['سعر', 'أسعار', 'price', 'كم جراما', 'ريال'],
-            'Ajakan Meeting/Call': ['اتصال', 'gmeet', 'meet.google.com', 'اجتماع', 'رابط'],
-            'Permintaan Alamat/Info Pengiriman': ['الاسم الكامل', 'الدولة والمدينة', 'عنوان', 'شحن', 'الرمز البريدي', 'بيانات'],
-            'Diskusi Sampel': ['عينة', 'sample'],
-            'Diskusi Detail Produk': ['محسن', 'طبيعي', 'صناعي', 'سومطرة', 'كاليمانتان', 'ميروكي', 'نوع', 'تفاصيل']
-        }
-
-        for chat in unreplied_chats:
-            # Konteks adalah 5 pesan terakhir dalam percakapan
-            context_messages = " ".join(chat.tail(5)['Message']).lower()
-            
-            categorized = False
-            for category, keywords in categories.items():
-                if any(kw in context_messages for kw in keywords):
-                    drop_off_reasons[category] += 1
-                    categorized = True
-                    break # Pindah ke chat berikutnya setelah dikategorikan
-            
-            if not categorized:
-                drop_off_reasons['Lain-lain / Minat Awal Rendah'] += 1
-        
-        # Membuat visualisasi
-        if drop_off_reasons:
-            reasons_series = pd.Series(drop_off_reasons).sort_values(ascending=True)
-            
-            plt.figure(figsize=(12, 8))
-            
-            reshaped_labels = [get_display(arabic_reshaper.reshape(label)) for label in reasons_series.index]
-            
-            sns.barplot(x=reasons_series.values, y=reshaped_labels, palette='mako')
-            plt.title('Analisis Potensi Penyebab Pembeli Tidak Membalas', fontsize=16)
-            plt.xlabel('Jumlah Chat', fontsize=12)
-            plt.ylabel('Kategori Konteks Terakhir', fontsize=12)
-            for index, value in enumerate(reasons_series.values):
-                plt.text(value, index, f' {value}', va='center', ha='left')
-            plt.tight_layout()
-    else:
-        print("-> Tidak ditemukan chat yang tidak dibalas oleh pembeli.")
-
-    # --- Grafik 8: Analisis Waktu Respons Penjual ---
-    print("\nMembuat grafik analisis waktu respons...")
-
-    response_times_minutes = []
-    # Group by conversation file, menggunakan df_full yang berisi semua chat
-    for filename, group in df_full.groupby('Filename'):
-        group = group.sort_values('Timestamp')
-        
-        # Cari pesan dari pelanggan yang diikuti oleh balasan dari 'Nusa Restoria'
-        for i in range(len(group) - 1):
-            current_sender = group.iloc[i]['Sender']
-            next_sender = group.iloc[i+1]['Sender']
-            
-            # Cek jika pengirim saat ini BUKAN 'Nusa Restoria' dan pengirim berikutnya ADALAH 'Nusa Restoria'
-            if current_sender != 'Nusa Restoria' and next_sender == 'Nusa Restoria':
-                time_diff = group.iloc[i+1]['Timestamp'] - group.iloc[i]['Timestamp']
-                if time_diff.total_seconds() > 0:
-                    response_times_minutes.append(time_diff.total_seconds() / 60) # dalam menit
-                    # Hanya ambil respons pertama yang valid per pelanggan dalam satu sesi
-                    break 
-
-    if response_times_minutes:
-        # Hapus outlier untuk visualisasi yang lebih baik (misal, respons lebih dari 6 jam)
-        response_times_filtered = [t for t in response_times_minutes if t < 360] 
-        
-        plt.figure(figsize=(12, 7))
-        sns.histplot(response_times_filtered, bins=50, kde=True, color='skyblue')
-        plt.title('Distribusi Waktu Respons Penjual (dalam Menit)', fontsize=16)
-        plt.xlabel('Waktu Respons (Menit)', fontsize=12)
-        plt.ylabel('Jumlah Kejadian', fontsize=12)
-        avg_response_time = pd.Series(response_times_filtered).mean()
-        plt.axvline(avg_response_time, color='red', linestyle='--', label=f'Rata-rata: {avg_response_time:.2f} menit')
-        plt.legend()
-        plt.tight_layout()
-    else:
-        print("-> Tidak cukup data untuk menganalisis waktu respons.")
-
-    # --- Grafik 9: Corong Konversi Pelanggan ---
-    print("\nMembuat grafik corong konversi pelanggan...")
-
-    # Tahapan funnel dan kata kunci (dalam huruf kecil)
-    funnel_stages = {
-        '1. Kontak Awal': {'count': 0},
-        '2. Diskusi Lanjut (Harga/Jenis)': {'count': 0, 'keywords': ['سعر', 'كم', 'نوع', 'تفاصيل', 'محسن', 'طبيعي', 'صناعي', 'price', 'عينة', 'sample', 'شحن', 'ارسال', 'أسعار']},
-        '3. Potensi Konversi (Kirim Alamat)': {'count': 0, 'keywords': ['لتجهيز طلبك', 'الاسم الكامل', 'الدولة والمدينة', 'عنوان', 'بيانات']}
-    }
-
-    conversations = df_full.groupby('Filename')
-
-    # Stage 1: Semua percakapan unik dihitung
-    funnel_stages['1. Kontak Awal']['count'] = len(conversations)
-
-    for filename, group in conversations:
-        seller_messages_text = " ".join(group[group['Sender'] == 'Nusa Restoria']['Message'].astype(str)).lower()
-        full_chat_text = " ".join(group['Message'].astype(str)).lower()
-
-        # Stage 2: Ada diskusi lanjut
-        if any(kw in full_chat_text for kw in funnel_stages['2. Diskusi Lanjut (Harga/Jenis)']['keywords']):
-            funnel_stages['2. Diskusi Lanjut (Harga/Jenis)']['count'] += 1
-        
-        # Stage 3: Penjual mengirimkan form pemesanan
-        if any(kw in seller_messages_text for kw in funnel_stages['3. Potensi Konversi (Kirim Alamat)']['keywords']):
-            funnel_stages['3. Potensi Konversi (Kirim Alamat)']['count'] += 1
-
-    # Membuat Series untuk plot
-    funnel_counts = {stage: data['count'] for stage, data in funnel_stages.items()}
-    funnel_series = pd.Series(funnel_counts)
-
-    if not funnel_series.empty:
-        plt.figure(figsize=(12, 8))
-        ax = sns.barplot(x=funnel_series.values, y=funnel_series.index, palette='magma')
-        plt.title('Corong Konversi Pelanggan (Customer Funnel)', fontsize=16)
-        plt.xlabel('Jumlah Percakapan', fontsize=12)
-        plt.ylabel('Tahapan Funnel', fontsize=12)
-
-        # Tambahkan label persentase dan angka absolut
-        total_conversations = funnel_series.iloc[0]
-        for i, count in enumerate(funnel_series.values):
-            if total_conversations > 0:
-                percentage_of_total = (count / total_conversations) * 100
-                ax.text(count, i, f' {count} ({percentage_of_total:.1f}%)', va='center', ha='left', fontsize=12)
-        
-        plt.tight_layout()
-    else:
-        print("-> Tidak ada data percakapan untuk membuat funnel.")
-
-    # --- Grafik 10: Distribusi Geografis Pelanggan ---
-    print("\nMembuat grafik distribusi geografis pelanggan...")
-
-    # Daftar kota utama di Saudi dan negara lain yang mungkin disebutkan
-    locations = {
-        'Riyadh (رياض)': ['رياض'],
-        'Jeddah (جدة)': ['جدة', 'جده'],
-        'Makkah (مكة)': ['مكة'],
-        'Tabuk (تبوك)': ['تبوك'],
-        'Kuwait (الكويت)': ['الكويت', 'kuwait'],
-    }
-    location_counts = {loc: 0 for loc in locations.keys()}
-
-    # Cari penyebutan kota dalam pesan pelanggan (df)
-    for message in df['Message']:
-        if isinstance(message, str):
-            msg_lower = message.lower()
-            for location, keywords in locations.items():
-                if any(keyword in msg_lower for keyword in keywords):
-                    location_counts[location] += 1
-                    break 
-
-    location_counts = {k: v for k, v in location_counts.items() if v > 0}
-
-    if location_counts:
-        location_series = pd.Series(location_counts).sort_values(ascending=True)
-        
-        plt.figure(figsize=(12, 7))
-        reshaped_labels = [get_display(arabic_reshaper.reshape(label)) for label in location_series.index]
-        sns.barplot(x=location_series.values, y=reshaped_labels, palette='cubehelix')
-        plt.title('Distribusi Geografis Pelanggan Berdasarkan Penyebutan Lokasi', fontsize=16)
-        plt.xlabel('Jumlah Penyebutan', fontsize=12)
-        plt.ylabel('Lokasi', fontsize=12)
-        for index, value in enumerate(location_series.values):
-            plt.text(value, index, f' {value}', va='center', ha='left')
-        plt.tight_layout()
-    else:
-        print("-> Tidak ditemukan penyebutan lokasi spesifik oleh pelanggan.")
+        tenants = parse_tenants(
+            config['tenants'], cache_root=config['cache'], session_gap_minutes=config['session_gap_minutes'],
+        )
+    except ValueError as error:
+        raise SystemExit(str(error))
+    if not tenants:
+        raise SystemExit("Tidak ada tenant: isi 'tenants' di file konfigurasi atau gunakan --tenant PENJUAL=FOLDER.")
+
+    print(f"Menganalisis {len(tenants)} tenant ke folder '{config['output']}'...")
+    _, errors = run_batch(
+        tenants, config['output'], formats=config['export_formats'],
+        workers=config['workers'], memory_mb=config['tenant_memory_mb'],
+    )
+    if errors:
+        raise SystemExit(f"{len(errors)} tenant gagal dianalisis.")
+
+
+def command_query(config):
+    """Mencari pesan (kata kunci, rentang waktu, lokasi, percakapan) dari store terindeks."""
+    import time
+    import pandas as pd
+    from message_store import open_store
+
+    store = open_store(config['store'], config['folder'], config['seller'], lambda: open_analysis(config))
+    if store is None:
+        return
+
+    start, end = config['since'], config['until']
+    if config['last_days'] is not None:
+        # Relatif terhadap pesan terbaru di arsip, bukan jam sekarang
+        latest = store.last_timestamp()
+        if latest is not None:
+            start = latest - pd.Timedelta(days=config['last_days'])
+
+    started = time.perf_counter()
+    with store:
+        try:
+            result = store.search(
+                keyword=config['keyword'], start=start, end=end, role=config['role'],
+                location=config['location'], conversation=config['conversation'],
+            )
+        except ValueError as error:
+            raise SystemExit(str(error))
+    elapsed_ms = (time.perf_counter() - started) * 1e3
+
+    print(f"\n{len(result)} pesan dari {result['Conversation'].nunique()} percakapan ({elapsed_ms:.1f} ms).")
+    if config['query_output'] is not None:
+        result.to_csv(config['query_output'], index=False, encoding='utf-8-sig')
+        print(f"- Hasil disimpan ke '{config['query_output']}'.")
+    shown = result.head(config['limit'])
+    with pd.option_context('display.max_colwidth', 80, 'display.width', 200):
+        print(shown.drop(columns='Is_seller').to_string(index=False) if len(shown) else '')
+
+
+def command_all(config):
+    """Tanpa perintah: statistik, ekspor CSV lalu grafik, seperti sebelumnya."""
+    analysis = open_analysis(config)
+    if analysis is None:
+        return
+
+    print("\nMemulai analisis data...")
+    with span('print_stats'):
+        analysis.print_stats()
+    with span('export'):
+        analysis.export_tables(config['output'], formats=config['export_formats'])
+    show_or_render(analysis, config)
+
+
+COMMANDS = {
+    'ingest': command_ingest,
+    'stats': command_stats,
+    'export': command_export,
+    'report': command_report,
+    'watch': command_watch,
+    'batch': command_batch,
+    'query': command_query,
+    None: command_all,
+}
+
+
+def export_formats(value):
+    """Tipe argparse untuk daftar format ekspor dipisah koma, misal 'csv,parquet'."""
+    formats = [fmt.strip() for fmt in value.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if not formats or unknown:
+        raise argparse.ArgumentTypeError(
+            f"format ekspor tidak dikenal: {value} (pilihan: {', '.join(EXPORT_FORMATS)})"
+        )
+    return formats
 
-    # --- Grafik 11: Distribusi Jumlah Pesan per Percakapan ---
-    print("\nMembuat grafik distribusi jumlah pesan per percakapan...")
 
-    message_counts_per_convo = df_full.groupby('Filename').size()
+def tenant_option(value):
+    """Tipe argparse untuk --tenant 'PENJUAL=FOLDER'."""
+    seller, separator, folder = value.partition('=')
+    if not separator or not seller.strip() or not folder.strip():
+        raise argparse.ArgumentTypeError(f"format tenant harus PENJUAL=FOLDER: {value}")
+    return {'seller': seller.strip(), 'folder': folder.strip()}
 
-    if not message_counts_per_convo.empty:
-        plt.figure(figsize=(12, 7))
-        # Filter untuk visualisasi yang lebih baik, misal percakapan < 50 pesan
-        sns.histplot(message_counts_per_convo[message_counts_per_convo < 50], bins=25, kde=False, color='teal')
-        plt.title('Distribusi Jumlah Pesan per Percakapan', fontsize=16)
-        plt.xlabel('Jumlah Pesan dalam Satu Percakapan', fontsize=12)
-        plt.ylabel('Jumlah Percakapan', fontsize=12)
-        plt.tight_layout()
+
+def stage_names(value):
+    """Tipe argparse untuk daftar nama tahap dipisah koma, misal 'load,tag'."""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def date_option(value):
+    """Tipe argparse untuk tanggal/waktu, misal '2025-08-20' atau '2025-08-20 13:00'."""
+    import pandas as pd
+
+    try:
+        return pd.Timestamp(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tanggal tidak dikenal: {value}")
+
+
+def build_parser():
+    # Semua opsi memakai default SUPPRESS agar hanya opsi yang benar-benar
+    # diberikan yang menimpa file konfigurasi.
+    common = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    common.add_argument('--config', metavar='FILE', help='file konfigurasi JSON (kunci sama dengan DEFAULT_CONFIG)')
+    common.add_argument('--folder', metavar='DIR', help='folder file ekspor chat (.txt)')
+    common.add_argument('--cache', metavar='DIR', help='folder cache ingest')
+    common.add_argument('--no-cache', dest='cache', action='store_const', const=None,
+                        help='parsing ulang semua file tanpa cache ingest')
+    common.add_argument('--seller', metavar='NAMA', help='nama akun penjual')
+    common.add_argument('--session-gap', dest='session_gap_minutes', type=float, metavar='MENIT',
+                        help='jeda tanpa pesan yang memulai sesi baru (default: 1440)')
+    common.add_argument('--workers', type=int, metavar='N', help='jumlah proses worker (default: jumlah core)')
+    common.add_argument('--trace', metavar='FILE',
+                        help='tulis waktu, CPU, baris dan memori per tahap ke FILE (format Chrome trace JSON)')
+    common.add_argument('--profile', type=stage_names, metavar='TAHAP[,TAHAP]',
+                        help="profil tahap ini dengan cProfile, misal 'load,tag' atau 'all'")
+    common.add_argument('--profile-dir', dest='profile_dir', metavar='DIR', help='folder hasil profil (default: profil)')
+
+    export_options = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    export_options.add_argument('--output', metavar='DIR', help='folder hasil ekspor')
+    export_options.add_argument('--export-format', dest='export_formats', type=export_formats, metavar='FORMAT[,FORMAT]',
+                                help=f"format ekspor dipisah koma: {', '.join(EXPORT_FORMATS)} (default: csv)")
+
+    report_options = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    report_options.add_argument('--laporan', dest='report_dir', metavar='DIR',
+                                help='render semua grafik ke folder ini tanpa membuka jendela (untuk server headless)')
+    report_options.add_argument('--format', dest='report_format', choices=REPORT_FORMATS,
+                                help='format laporan untuk --laporan (default: png)')
+    report_options.add_argument('--font', metavar='NAMA', help='font grafik yang mendukung huruf Arab')
+    report_options.add_argument('--font-path', dest='font_path_arabic', metavar='FILE',
+                                help='file font .ttf dengan huruf Arab untuk Word Cloud')
+
+    watch_options = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    watch_options.add_argument('--debounce', dest='watch_debounce', type=float, metavar='DETIK',
+                               help='jeda minimum antar penerbitan ulang hasil (default: 2)')
+    watch_options.add_argument('--poll', dest='watch_poll', type=float, metavar='DETIK',
+                               help='interval polling folder tanpa watchdog (default: 0.5)')
+
+    batch_options = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    batch_options.add_argument('--tenant', dest='tenants', type=tenant_option, action='append', metavar='PENJUAL=FOLDER',
+                               help="satu tenant (bisa diulang); menggantikan 'tenants' di file konfigurasi")
+    batch_options.add_argument('--memory-limit', dest='tenant_memory_mb', type=int, metavar='MB',
+                               help='batas memori per proses tenant (Linux/macOS)')
+
+    query_options = argparse.ArgumentParser(add_help=False)
+    query_options.add_argument('keyword', nargs='?', default=None, metavar='KATA_KUNCI',
+                               help="frasa yang dicari di teks pesan, misal 'كم سعر' (akhiran * = awalan kata)")
+    query_options.add_argument('--store', metavar='FILE', default=argparse.SUPPRESS,
+                               help='file store pesan terindeks (default: indeks_pesan.sqlite)')
+    query_options.add_argument('--since', type=date_option, default=None, metavar='TANGGAL',
+                               help='hanya pesan sejak waktu ini, misal 2025-08-20')
+    query_options.add_argument('--until', type=date_option, default=None, metavar='TANGGAL',
+                               help='hanya pesan sebelum waktu ini (tidak termasuk)')
+    query_options.add_argument('--last-days', dest='last_days', type=int, default=None, metavar='N',
+                               help='hanya N hari terakhir sebelum pesan terbaru di arsip')
+    query_options.add_argument('--role', choices=('buyer', 'seller'), default=None, help='hanya pesan pembeli atau penjual')
+    query_options.add_argument('--location', default=None, metavar='LOKASI',
+                               help="percakapan yang pembelinya menyebut lokasi ini, misal 'riyadh'")
+    query_options.add_argument('--conversation', default=None, metavar='NAMA', help='hanya satu percakapan')
+    query_options.add_argument('--limit', type=int, default=50, metavar='N', help='jumlah pesan yang ditampilkan (default: 50)')
+    query_options.add_argument('--csv', dest='query_output', default=None, metavar='FILE', help='simpan semua hasil ke file CSV')
+
+    parser = argparse.ArgumentParser(
+        description='Analisis chat WhatsApp penjualan gaharu. Tanpa PERINTAH, '
+                    'menjalankan statistik, ekspor CSV dan grafik sekaligus.',
+        parents=[common, export_options, report_options],
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='PERINTAH')
+    subparsers.add_parser('ingest', parents=[common], help=command_ingest.__doc__)
+    subparsers.add_parser('stats', parents=[common], help=command_stats.__doc__)
+    subparsers.add_parser('export', parents=[common, export_options], help=command_export.__doc__)
+    subparsers.add_parser('report', parents=[common, report_options], help=command_report.__doc__)
+    subparsers.add_parser('batch', parents=[common, export_options, batch_options], help=command_batch.__doc__)
+    subparsers.add_parser('query', parents=[common, query_options], help=command_query.__doc__)
+    subparsers.add_parser('watch', parents=[common, export_options, watch_options], help=command_watch.__doc__)
+    return parser
+
+
+def run_traced(command, config):
+    """Menjalankan perintah dengan instrumentasi per tahap aktif."""
+    tracer = Tracer(profile=config['profile'] or (), profile_dir=config['profile_dir'])
+    activate(tracer)
+    try:
+        command(config)
+    finally:
+        activate(None)
+        tracer.print_summary()
+        if config['trace'] is not None:
+            tracer.write_trace(config['trace'])
+            print(f"- Trace disimpan ke '{config['trace']}' (buka di chrome://tracing atau ui.perfetto.dev).")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config = load_config(args)
+    command = COMMANDS[getattr(args, 'command', None)]
+    if config['trace'] is not None or config['profile']:
+        run_traced(command, config)
     else:
-        print("-> Tidak ada data untuk menganalisis jumlah pesan per percakapan.")
+        command(config)
 
 
-    # Menampilkan semua grafik
-    print("\nMenampilkan grafik... Tutup semua jendela grafik untuk mengakhiri program.")
-    plt.show()
\ No newline at end of file
+# Dijalankan hanya sebagai skrip, agar proses worker parser (yang mengimpor
+# ulang modul utama pada Windows/macOS) tidak ikut menjalankan seluruh analisis.
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,517 @@
+import os
+import importlib.util
+from collections import Counter
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from conversation_turns import build_turns, seller_mask
+from exporters import CHUNK_ROWS, export_table
+from instrumentation import span
+from keyword_matcher import KeywordTagger, tag_frame
+from keywords import KEYWORD_DICTIONARIES
+from report_renderer import Chart
+from sessionizer import DEFAULT_SESSION_GAP_MINUTES, build_sessions
+from time_series import DAY_NAMES, build_cube, date_labels
+from word_frequency import count_terms
+
+# Histogram waktu respons pertama (menit) untuk ringkasan yang bisa dijumlahkan
+# (mode pantau, batch): < 6 jam dalam 50 bin, seperti Grafik 8
+RESPONSE_BIN_EDGES = np.linspace(0, 360, 51)
+TOP_SENDERS = 10
+
+
+def most_common_senders(counts, n=TOP_SENDERS):
+    """
+    n pengirim dengan pesan terbanyak dari counts (Series, dict atau Counter
+    pengirim -> jumlah) sebagai [(pengirim, jumlah)], tanpa jumlah 0. Jumlah
+    yang sama diurutkan menurut nama pengirim, agar hasilnya tidak bergantung
+    pada urutan kategori atau urutan file.
+    """
+    items = [(str(sender), int(count)) for sender, count in counts.items() if count > 0]
+    return sorted(items, key=lambda item: (-item[1], item[0]))[:n]
+
+
+def calendar_fields(timestamps):
+    """
+    Kolom kalender ringkas per pesan dari Timestamp (hanya untuk ekspor per
+    pesan): Hour dan Weekday (0 = Monday) sebagai uint8, Date sebagai datetime64
+    tengah malam. Nama hari hanya dibentuk saat diekspor (DAY_NAMES). Statistik
+    waktu memakai cube, bukan kolom ini.
+    """
+    return pd.DataFrame({
+        'Hour': timestamps.dt.hour.astype(np.uint8),
+        'Weekday': timestamps.dt.dayofweek.astype(np.uint8),
+        'Date': timestamps.dt.normalize(),
+    }, index=timestamps.index)
+
+
+class Analysis:
+    """
+    Semua analisis untuk satu kumpulan pesan (df_full) dan satu identitas penjual.
+
+    Tahap yang mahal (penandaan kata kunci, giliran bicara) dihitung sekali saat
+    pertama kali dibutuhkan, sehingga perintah 'stats' atau 'export' tidak ikut
+    membayar biaya analisis yang hanya dipakai oleh grafik.
+    """
+
+    def __init__(self, df_full, seller, session_gap_minutes=DEFAULT_SESSION_GAP_MINUTES):
+        # Penanda penjual dihitung sekali sebagai kolom boolean, bukan
+        # perbandingan string berulang di setiap analisis
+        self.df_full = df_full.assign(Is_seller=seller_mask(df_full['Sender'], seller))
+        self.seller = seller
+        self.session_gap_minutes = session_gap_minutes
+
+    @cached_property
+    def buyers(self):
+        """Pesan pembeli saja (tanpa penjual)."""
+        return self.df_full[~self.df_full['Is_seller']]
+
+    @cached_property
+    def calendar(self):
+        """Kolom kalender pesan pembeli (lihat calendar_fields), dihitung saat dibutuhkan."""
+        with span('calendar', rows_in=len(self.buyers)):
+            return calendar_fields(self.buyers['Timestamp'])
+
+    @cached_property
+    def cube(self):
+        """
+        Jumlah pesan per (tanggal, jam, pembeli/penjual) dalam satu bincount;
+        aktivitas per hari, tanggal, jam, minggu dan rolling adalah irisannya.
+        """
+        with span('cube', rows_in=len(self.df_full)):
+            return build_cube(self.df_full['Timestamp'], self.df_full['Is_seller'])
+
+    @cached_property
+    def tagger(self):
+        # Semua kamus kata kunci dikompilasi sekali menjadi satu automaton
+        with span('compile_keywords'):
+            return KeywordTagger(KEYWORD_DICTIONARIES)
+
+    @cached_property
+    def tagged(self):
+        """
+        df_full dengan kolom 'Tags': setiap pesan ditandai dengan semua kategori
+        kata kunci yang cocok dalam satu lintasan. Grafik-grafik berbasis kata
+        kunci cukup menjumlahkan tag ini.
+        """
+        tagger = self.tagger
+        with span('tag', rows_in=len(self.df_full)) as s:
+            tagged = tag_frame(self.df_full, tagger)
+            s.rows_out = len(tagged)
+        return tagged
+
+    @cached_property
+    def tagged_buyers(self):
+        return self.tagged[~self.tagged['Is_seller']]
+
+    @cached_property
+    def turns(self):
+        # Giliran bicara (pembicara terakhir, waktu respons, konteks akhir) untuk
+        # semua percakapan dihitung sekali dan dipakai ulang oleh Grafik 7 dan 8
+        tagged = self.tagged
+        with span('turns', rows_in=len(tagged)) as s:
+            turns = build_turns(tagged, seller=self.seller)
+            s.rows_out = len(turns.responses)
+        return turns
+
+    @cached_property
+    def sessions(self):
+        # Percakapan dipecah menjadi sesi pada jeda > session_gap_minutes, agar
+        # thread yang berjalan berminggu-minggu tidak dihitung sebagai satu sesi
+        turns = self.turns
+        with span('sessions', rows_in=len(turns.messages)) as s:
+            sessions = build_sessions(turns.messages, self.tagger, gap_minutes=self.session_gap_minutes)
+            s.rows_out = len(sessions.table)
+        return sessions
+
+    @cached_property
+    def term_counts(self):
+        """Frekuensi kata dan pasangan kata (jumlah entri terbatas) pesan pembeli dan penjual."""
+        with span('term_counts', rows_in=len(self.df_full)):
+            return {
+                'buyer': count_terms(self.buyers['Message_norm']),
+                'seller': count_terms(self.df_full.loc[self.df_full['Is_seller'], 'Message_norm']),
+            }
+
+    def term_table(self, n=100):
+        """n kata dan n pasangan kata terbanyak untuk pembeli dan penjual sebagai satu tabel."""
+        rows = []
+        for role, role_name in (('buyer', 'Pembeli'), ('seller', 'Penjual')):
+            counts = self.term_counts[role]
+            for kind, counter in (('Kata', counts.unigrams), ('Pasangan Kata', counts.bigrams)):
+                rows += [(role_name, kind, term, n_terms) for term, n_terms in counter.most_common(n)]
+        return pd.DataFrame(rows, columns=['Peran', 'Jenis', 'Kata', 'Jumlah'])
+
+    @cached_property
+    def stats(self):
+        cube = self.cube
+        with span('stats', rows_in=len(self.buyers)):
+            # Sender categorical: kategori penjual tetap ada dengan jumlah 0
+            # (dibuang most_common_senders)
+            top_senders = dict(most_common_senders(self.buyers['Sender'].value_counts()))
+            date_activity = cube.daily('buyer')
+            return {
+                'top_10_senders': pd.Series(top_senders, dtype='int64', name='count').rename_axis('Sender'),
+                'daily_activity': cube.weekday('buyer'),
+                # Hanya tanggal yang ada pesan pembelinya, seperti sebelumnya
+                'date_activity': date_activity[date_activity > 0],
+            }
+
+    @cached_property
+    def funnel_counts(self):
+        """Jumlah percakapan di setiap tahap corong konversi pelanggan (Grafik 9)."""
+        df_full = self.tagged
+        tagger = self.tagger
+        conversation_key = df_full['Conversation'].cat.codes
+        is_seller = df_full['Is_seller'].to_numpy()
+        discussion = tagger.matches(df_full['Tags'], 'funnel', '2. Diskusi Lanjut (Harga/Jenis)')
+        order_form = tagger.matches(df_full['Tags'], 'funnel', '3. Potensi Konversi (Kirim Alamat)')
+
+        return {
+            # Stage 1: Semua percakapan unik dihitung
+            '1. Kontak Awal': conversation_key.nunique(),
+            # Stage 2: Ada diskusi lanjut
+            '2. Diskusi Lanjut (Harga/Jenis)': int(pd.Series(discussion).groupby(conversation_key.to_numpy()).any().sum()),
+            # Stage 3: Penjual mengirimkan form pemesanan
+            '3. Potensi Konversi (Kirim Alamat)': int(pd.Series(order_form & is_seller).groupby(conversation_key.to_numpy()).any().sum()),
+        }
+
+    def print_stats(self):
+        print("\n" + "="*30)
+        print("     TOP 10 PENGIRIM PESAN TERBANYAK")
+        print("="*30)
+        print(self.stats['top_10_senders'])
+
+        print("\n" + "="*30)
+        print("        AKTIVITAS PESAN PER HARI")
+        print("="*30)
+        print(self.stats['daily_activity'])
+
+        print("\n" + "="*30)
+        print("      AKTIVITAS PESAN PER TANGGAL")
+        print("="*30)
+        print(self.stats['date_activity'])
+
+    def iter_export_messages(self, chunk_rows=CHUNK_ROWS):
+        """
+        Semua pesan pembeli untuk diekspor (tanpa kolom internal 'Message_norm',
+        'Offset' dan 'Is_seller'), dengan kolom jam, nama hari dan tanggal. Dibentuk per
+        potongan agar tabel besar tidak perlu disalin utuh sebelum ditulis.
+        """
+        buyers = self.buyers.drop(columns=['Message_norm', 'Offset', 'Is_seller'])
+        calendar = self.calendar
+        # Minimal satu potongan, agar tanpa pesan pembeli pun tabelnya tetap
+        # ditulis (header/skema saja)
+        for start in range(0, max(len(buyers), 1), chunk_rows):
+            chunk_calendar = calendar.iloc[start:start + chunk_rows]
+            yield buyers.iloc[start:start + chunk_rows].assign(
+                Hour=chunk_calendar['Hour'],
+                Day=pd.Categorical.from_codes(chunk_calendar['Weekday'], DAY_NAMES),
+                Date=chunk_calendar['Date'],
+            )
+
+    def export_tables(self, output_folder, formats=('csv',), chunk_rows=CHUNK_ROWS):
+        """
+        Mengekspor hasil analisis ke output_folder dalam setiap format di formats
+        (lihat exporters.EXPORTERS). CSV tetap ditulis dengan utf-8-sig.
+        """
+        print(f"\n\nMengekspor hasil analisis ke folder '{output_folder}'...")
+
+        df_top_senders = self.stats['top_10_senders'].reset_index()
+        df_top_senders.columns = ['Pengirim', 'Jumlah Pesan']
+        df_daily_activity = self.stats['daily_activity'].reset_index()
+        df_daily_activity.columns = ['Hari', 'Jumlah Pesan']
+        df_date_activity = self.stats['date_activity'].reset_index()
+        df_date_activity.columns = ['Tanggal', 'Jumlah Pesan']
+        # 5. Tabel sesi percakapan (tanpa bitmask tag internal)
+        df_sessions = self.sessions.table.drop(columns='Tail_tags').reset_index()
+        # 6. Frekuensi kata pembeli dan penjual
+        df_terms = self.term_table()
+
+        for fmt in formats:
+            # 1. Semua data chat yang sudah di-parse, dipartisi per tanggal jika formatnya mendukung
+            # 2. Top 10 pengirim, 3. aktivitas harian, 4. aktivitas per tanggal
+            tables = [
+                ('semua_pesan', self.iter_export_messages(chunk_rows), 'Date'),
+                ('top_10_pengirim', df_top_senders, None),
+                ('aktivitas_harian', df_daily_activity, None),
+                ('aktivitas_per_tanggal', df_date_activity, None),
+                ('sesi_percakapan', df_sessions, None),
+                ('frekuensi_kata', df_terms, None),
+            ]
+            for name, table, partition_by in tables:
+                rows = len(self.buyers) if name == 'semua_pesan' else len(table)
+                with span(f'export.{name}.{fmt}', rows_in=rows) as s:
+                    path = export_table(table, output_folder, name, fmt=fmt, partition_by=partition_by)
+                    s.rows_out = rows
+                if path is not None:
+                    print(f"- Tabel '{name}' berhasil disimpan ke '{path}'.")
+
+    def build_charts(self, font_path_arabic=None):
+        """
+        Mendeskripsikan semua grafik sebagai Chart (data saja); penggambarannya
+        dilakukan oleh report_renderer, interaktif atau ke file. Word cloud
+        hanya dibuat jika font_path_arabic (font .ttf dengan huruf Arab) ada.
+        """
+        df_full = self.tagged
+        # Pesan dari pembeli saja, untuk analisis kata kunci pelanggan
+        df = self.tagged_buyers
+        tagger = self.tagger
+        turns = self.turns
+        top_10_senders = self.stats['top_10_senders']
+        date_activity = self.stats['date_activity']
+
+        print("\nMembuat visualisasi data...")
+        charts = []
+
+        with span('grafik_01_top_pengirim'):
+            # Grafik 1: Top 10 Pengirim
+            # Menggunakan bar chart horizontal agar nama yang panjang lebih mudah dibaca
+            charts.append(Chart(
+                'grafik_01_top_pengirim', 'barh', 'Top 10 Anggota Paling Aktif', 'Jumlah Pesan', 'Nama Pengirim',
+                values=top_10_senders.values.tolist(), labels=top_10_senders.index.tolist(),
+                palette='viridis', options={'reshape': True},
+            ))
+
+        with span('grafik_02_aktivitas_per_jam'):
+            # Grafik 2: Aktivitas Chat per Jam
+            # Jam tanpa pesan tetap tampil sebagai 0, tidak dilompati garisnya
+            hourly_activity = self.cube.hourly('buyer')
+            charts.append(Chart(
+                'grafik_02_aktivitas_per_jam', 'line', 'Distribusi Pesan Sepanjang Hari', 'Jam', 'Jumlah Pesan',
+                values=hourly_activity.values.tolist(), labels=hourly_activity.index.tolist(),
+                figsize=(12, 6), color='coral', options={'xticks': list(range(0, 24))},
+            ))
+
+        with span('grafik_03_aktivitas_per_tanggal'):
+            # Grafik 3: Aktivitas Pesan per Tanggal (dengan Nama Hari)
+            # Label "Hari, DD-MM-YY" dengan nama hari Bahasa Indonesia dari tabel lookup
+            timestamps = date_activity.index
+            new_labels = date_labels(timestamps)
+
+            charts.append(Chart(
+                'grafik_03_aktivitas_per_tanggal', 'line', 'Aktivitas Pesan per Tanggal', 'Tanggal', 'Jumlah Pesan',
+                values=date_activity.values.tolist(), labels=timestamps.tolist(),
+                figsize=(15, 7), color='purple', options={'xticks': timestamps.tolist(), 'xticklabels': new_labels},
+            ))
+
+        with span('grafik_04_awan_kata'):
+            # --- Grafik 4: Word Cloud Pembeli dan Penjual ---
+            print("\nMembuat word cloud kata yang paling sering dipakai...")
+
+            if font_path_arabic is None or not os.path.exists(font_path_arabic):
+                print(f"-> Font Arab '{font_path_arabic}' tidak ditemukan, Word Cloud tidak dibuat. Atur 'font_path_arabic' di konfigurasi.")
+            elif importlib.util.find_spec('wordcloud') is None:
+                print("-> Paket wordcloud tidak terpasang, Word Cloud tidak dibuat.")
+            else:
+                for role, role_name, name, palette in (
+                    ('buyer', 'Pembeli', 'grafik_04_awan_kata_pembeli', 'viridis'),
+                    ('seller', 'Penjual', 'grafik_04_awan_kata_penjual', 'magma'),
+                ):
+                    # Kata dan pasangan kata terbanyak, bukan gabungan seluruh teks pesan
+                    frequencies = self.term_counts[role].cloud_frequencies()
+                    if frequencies:
+                        charts.append(Chart(
+                            name, 'wordcloud', f'Kata yang Paling Sering Dipakai {role_name}', '', '',
+                            values=list(frequencies.values()), labels=list(frequencies),
+                            figsize=(14, 8), palette=palette, options={'reshape': True, 'font_path': font_path_arabic},
+                        ))
+
+        with span('grafik_05_jenis_gaharu'):
+            # --- Grafik 5: Analisis Jenis Gaharu yang Dicari ---
+            print("\nMembuat grafik analisis jenis gaharu yang dicari...")
+
+            # Menggunakan pesan dari pembeli saja (df sudah difilter)
+            # Satu pesan bisa menyebut beberapa jenis gaharu sekaligus
+            gaharu_counts = tagger.count(df['Tags'], 'gaharu')
+
+            # Filter jenis gaharu yang tidak pernah disebutkan
+            gaharu_counts = {k: v for k, v in gaharu_counts.items() if v > 0}
+
+            if gaharu_counts:
+                gaharu_series = pd.Series(gaharu_counts).sort_values(ascending=True)
+                charts.append(Chart(
+                    'grafik_05_jenis_gaharu', 'barh', 'Jenis Gaharu yang Paling Sering Disebutkan', 'Jumlah Penyebutan', 'Jenis Gaharu',
+                    values=gaharu_series.values.tolist(), labels=gaharu_series.index.tolist(),
+                    palette='plasma', options={'reshape': True, 'annotate': 'value'},
+                ))
+            else:
+                print("-> Tidak ditemukan penyebutan jenis gaharu spesifik dalam chat.")
+
+        with span('grafik_06_pertanyaan_umum'):
+            # --- Grafik 6: Analisis Pertanyaan Umum ---
+            print("\nMembuat grafik analisis pertanyaan umum dari pelanggan...")
+
+            # Hanya pesan dari pelanggan (df). Setiap pesan dihitung pada kategori
+            # pertama yang cocok, agar satu pesan tidak dihitung di beberapa kategori
+            question_counts = tagger.count_first(df['Tags'], 'question')
+
+            # Filter kategori yang tidak pernah ditanyakan
+            question_counts = {k: v for k, v in question_counts.items() if v > 0}
+
+            if question_counts:
+                question_series = pd.Series(question_counts).sort_values(ascending=True)
+                charts.append(Chart(
+                    'grafik_06_pertanyaan_umum', 'barh', 'Top 5 Kategori Pertanyaan Umum dari Pelanggan', 'Jumlah Pertanyaan', 'Kategori Pertanyaan',
+                    values=question_series.values.tolist(), labels=question_series.index.tolist(),
+                    palette='crest', options={'reshape': True, 'annotate': 'value'},
+                ))
+            else:
+                print("-> Tidak ditemukan pertanyaan umum yang cocok dengan kata kunci.")
+
+        with span('grafik_07_penyebab_tidak_dibalas'):
+            # --- Grafik 7: Analisis Penyebab Chat Tidak Dibalas ---
+            print("\nMembuat grafik analisis penyebab chat tidak dibalas...")
+
+            # Percakapan yang pesan terakhirnya dikirim oleh penjual
+            unreplied_chats = turns.last_speaker.index[turns.last_speaker['Is_seller']]
+
+            if len(unreplied_chats):
+                drop_off_reasons = Counter()
+
+                for context_tags in turns.tail_tags.loc[unreplied_chats]:
+                    # Konteks adalah 5 pesan terakhir dalam percakapan: gabungan tag-nya,
+                    # lalu diambil kategori pertama yang cocok (urutan dari spesifik ke umum)
+                    category = tagger.first_label(context_tags, 'drop_off')
+                    drop_off_reasons[category or 'Lain-lain / Minat Awal Rendah'] += 1
+
+                if drop_off_reasons:
+                    reasons_series = pd.Series(drop_off_reasons).sort_values(ascending=True)
+                    charts.append(Chart(
+                        'grafik_07_penyebab_tidak_dibalas', 'barh', 'Analisis Potensi Penyebab Pembeli Tidak Membalas', 'Jumlah Chat', 'Kategori Konteks Terakhir',
+                        values=reasons_series.values.tolist(), labels=reasons_series.index.tolist(),
+                        palette='mako', options={'reshape': True, 'annotate': 'value'},
+                    ))
+            else:
+                print("-> Tidak ditemukan chat yang tidak dibalas oleh pembeli.")
+
+        with span('grafik_08_waktu_respons'):
+            # --- Grafik 8: Analisis Waktu Respons Penjual ---
+            print("\nMembuat grafik analisis waktu respons...")
+
+            # Respons pertama yang valid (pesan pelanggan yang diikuti balasan penjual
+            # setelah > 0 menit) per percakapan, dalam menit
+            response_times_minutes = turns.first_response['Response_minutes'].tolist()
+
+            if response_times_minutes:
+                # Hapus outlier untuk visualisasi yang lebih baik (misal, respons lebih dari 6 jam)
+                response_times_filtered = [t for t in response_times_minutes if t < 360]
+                charts.append(Chart(
+                    'grafik_08_waktu_respons', 'hist', 'Distribusi Waktu Respons Penjual (dalam Menit)', 'Waktu Respons (Menit)', 'Jumlah Kejadian',
+                    values=response_times_filtered, figsize=(12, 7), color='skyblue',
+                    options={'bins': 50, 'kde': True, 'mean_line': 'menit'},
+                ))
+            else:
+                print("-> Tidak cukup data untuk menganalisis waktu respons.")
+
+        with span('grafik_09_corong_konversi'):
+            # --- Grafik 9: Corong Konversi Pelanggan ---
+            print("\nMembuat grafik corong konversi pelanggan...")
+
+            # Membuat Series untuk plot
+            funnel_series = pd.Series(self.funnel_counts)
+
+            if not funnel_series.empty:
+                # Label angka absolut dan persentase terhadap tahap 1
+                charts.append(Chart(
+                    'grafik_09_corong_konversi', 'barh', 'Corong Konversi Pelanggan (Customer Funnel)', 'Jumlah Percakapan', 'Tahapan Funnel',
+                    values=funnel_series.values.tolist(), labels=funnel_series.index.tolist(),
+                    palette='magma', options={'annotate': 'percent'},
+                ))
+            else:
+                print("-> Tidak ada data percakapan untuk membuat funnel.")
+
+        with span('grafik_10_lokasi_pelanggan'):
+            # --- Grafik 10: Distribusi Geografis Pelanggan ---
+            print("\nMembuat grafik distribusi geografis pelanggan...")
+
+            # Cari penyebutan kota utama di Saudi dan negara lain dalam pesan pelanggan (df)
+            location_counts = tagger.count_first(df['Tags'], 'location')
+
+            location_counts = {k: v for k, v in location_counts.items() if v > 0}
+
+            if location_counts:
+                location_series = pd.Series(location_counts).sort_values(ascending=True)
+                charts.append(Chart(
+                    'grafik_10_lokasi_pelanggan', 'barh', 'Distribusi Geografis Pelanggan Berdasarkan Penyebutan Lokasi', 'Jumlah Penyebutan', 'Lokasi',
+                    values=location_series.values.tolist(), labels=location_series.index.tolist(),
+                    figsize=(12, 7), palette='cubehelix', options={'reshape': True, 'annotate': 'value'},
+                ))
+            else:
+                print("-> Tidak ditemukan penyebutan lokasi spesifik oleh pelanggan.")
+
+        with span('grafik_11_pesan_per_percakapan'):
+            # --- Grafik 11: Distribusi Jumlah Pesan per Percakapan ---
+            print("\nMembuat grafik distribusi jumlah pesan per percakapan...")
+
+            message_counts_per_convo = df_full.groupby('Conversation', observed=True).size()
+
+            if not message_counts_per_convo.empty:
+                # Filter untuk visualisasi yang lebih baik, misal percakapan < 50 pesan
+                charts.append(Chart(
+                    'grafik_11_pesan_per_percakapan', 'hist', 'Distribusi Jumlah Pesan per Percakapan', 'Jumlah Pesan dalam Satu Percakapan', 'Jumlah Percakapan',
+                    values=message_counts_per_convo[message_counts_per_convo < 50].tolist(),
+                    figsize=(12, 7), color='teal', options={'bins': 25},
+                ))
+            else:
+                print("-> Tidak ada data untuk menganalisis jumlah pesan per percakapan.")
+
+        sessions = self.sessions.table
+        gap_hours = f"{self.session_gap_minutes / 60:g}"
+
+        with span('grafik_12_waktu_respons_per_sesi'):
+            # --- Grafik 12: Waktu Respons Pertama per Sesi ---
+            # Berbeda dengan Grafik 8, setiap sesi (bukan hanya awal percakapan)
+            # punya waktu respons pertamanya sendiri
+            print("\nMembuat grafik waktu respons pertama per sesi...")
+
+            session_response = sessions['First_response_minutes'].dropna()
+            if not session_response.empty:
+                charts.append(Chart(
+                    'grafik_12_waktu_respons_per_sesi', 'hist',
+                    f'Distribusi Waktu Respons Pertama per Sesi (jeda sesi {gap_hours} jam)', 'Waktu Respons (Menit)', 'Jumlah Sesi',
+                    values=session_response[session_response < 360].tolist(), figsize=(12, 7), color='steelblue',
+                    options={'bins': 50, 'mean_line': 'menit'},
+                ))
+            else:
+                print("-> Tidak ada sesi dengan balasan penjual.")
+
+        with span('grafik_13_penyebab_sesi_tidak_dibalas'):
+            # --- Grafik 13: Penyebab Sesi Tidak Dibalas ---
+            # Seperti Grafik 7, tetapi per sesi: konteks 5 pesan terakhir setiap
+            # sesi yang diakhiri pesan penjual
+            print("\nMembuat grafik penyebab sesi tidak dibalas...")
+
+            if 'Drop_off_reason' in sessions:
+                session_reasons = sessions['Drop_off_reason'].value_counts()
+                session_reasons = session_reasons[session_reasons > 0].sort_values(ascending=True)
+            else:
+                session_reasons = pd.Series(dtype=int)
+            if not session_reasons.empty:
+                charts.append(Chart(
+                    'grafik_13_penyebab_sesi_tidak_dibalas', 'barh',
+                    f'Potensi Penyebab Sesi Tidak Dibalas Pembeli (jeda sesi {gap_hours} jam)', 'Jumlah Sesi', 'Kategori Konteks Terakhir',
+                    values=session_reasons.values.tolist(), labels=session_reasons.index.tolist(),
+                    palette='rocket', options={'reshape': True, 'annotate': 'value'},
+                ))
+            else:
+                print("-> Tidak ditemukan sesi yang tidak dibalas oleh pembeli.")
+
+        with span('grafik_14_tren_aktivitas'):
+            # --- Grafik 14: Tren Aktivitas Harian ---
+            # Rata-rata bergulir 7 hari pesan pembeli dan penjual, langsung dari cube
+            print("\nMembuat grafik tren aktivitas harian...")
+
+            buyer_trend = self.cube.rolling(7, 'buyer')
+            if len(buyer_trend):
+                seller_trend = self.cube.rolling(7, 'seller')
+                charts.append(Chart(
+                    'grafik_14_tren_aktivitas', 'line', 'Tren Aktivitas Harian (Rata-rata Bergulir 7 Hari)', 'Tanggal', 'Pesan per Hari',
+                    values=buyer_trend.round(2).tolist(), labels=buyer_trend.index.tolist(),
+                    figsize=(15, 7), color='purple',
+                    options={'marker': None, 'label': 'Pembeli', 'series': {'Penjual': seller_trend.round(2).tolist()}},
+                ))
+
+        return charts
@@ -0,0 +1,233 @@
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from instrumentation import current_rss_mb
+
+try:
+    import resource
+except ImportError:
+    # Windows: peak RSS tidak tersedia tanpa psutil
+    resource = None
+
+# Benchmark setiap tahap pipeline analisis pada data sintetis
+# (synthetic_chats.py) dari 1 ribu sampai 10 juta pesan. Setiap ukuran
+# dijalankan di proses terpisah agar peak RSS-nya tidak tercampur ukuran lain.
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+# Tahap yang lebih lambat dari baseline dengan rasio di atas ini ditandai
+REGRESSION_RATIO = 1.2
+# Interval pengambilan sampel RSS selama satu tahap berjalan
+RSS_SAMPLE_SECONDS = 0.01
+
+
+def _peak_rss_mb(who):
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss dalam KB di Linux, dalam byte di macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+class _RssSampler(threading.Thread):
+    """
+    Mengambil sampel RSS proses ini setiap RSS_SAMPLE_SECONDS selama satu
+    tahap, karena ru_maxrss hanya mencatat puncak sejak proses dimulai.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak_mb = current_rss_mb()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(RSS_SAMPLE_SECONDS):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        return max(self.peak_mb, current_rss_mb())
+
+
+def _stage(results, name, func):
+    """
+    Menjalankan satu tahap dan mencatat waktu wall/CPU serta RSS proses utama:
+    sebelum tahap, puncak selama tahap (sampel) dan selisih setelah tahap.
+    Memori proses worker (parser, render) tidak termasuk.
+    """
+    rss_before = current_rss_mb()
+    sampler = _RssSampler() if rss_before is not None else None
+    if sampler is not None:
+        sampler.start()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    try:
+        with redirect_stdout(io.StringIO()):
+            value = func()
+    finally:
+        peak = sampler.stop() if sampler is not None else None
+    results[name] = {
+        'wall_seconds': time.perf_counter() - started,
+        'cpu_seconds': time.process_time() - cpu_started,
+        'rss_before_mb': rss_before,
+        'stage_peak_rss_mb': peak,
+        'rss_delta_mb': current_rss_mb() - rss_before if rss_before is not None else None,
+    }
+    return value
+
+
+def run_stages(folder_path, seller, workers=None):
+    """Menjalankan semua tahap pipeline sekali pada folder_path dan mengembalikan hasil ukurnya."""
+    from chat_parser import parse_whatsapp_chat
+    from analysis import Analysis
+    from report_renderer import render_report
+
+    stages = {}
+    work_dir = tempfile.mkdtemp(prefix='benchmark_')
+    try:
+        cache_dir = os.path.join(work_dir, 'cache')
+        df_full = _stage(stages, 'parse', lambda: parse_whatsapp_chat(folder_path, workers=workers))
+        _stage(stages, 'parse_cache_cold', lambda: parse_whatsapp_chat(folder_path, workers=workers, cache_dir=cache_dir))
+        _stage(stages, 'parse_cache_warm', lambda: parse_whatsapp_chat(folder_path, workers=workers, cache_dir=cache_dir))
+
+        analysis = _stage(stages, 'analysis', lambda: Analysis(df_full, seller))
+        _stage(stages, 'stats', lambda: analysis.stats)
+        _stage(stages, 'tag', lambda: analysis.tagged)
+        _stage(stages, 'turns', lambda: analysis.turns)
+        _stage(stages, 'sessions', lambda: analysis.sessions)
+        _stage(stages, 'terms', lambda: analysis.term_counts)
+        charts = _stage(stages, 'charts', analysis.build_charts)
+        _stage(stages, 'render', lambda: render_report(charts, os.path.join(work_dir, 'laporan'), workers=workers))
+        _stage(stages, 'export_csv', lambda: analysis.export_tables(os.path.join(work_dir, 'export')))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'rows': len(df_full),
+        'conversations': int(df_full['Conversation'].nunique()) if len(df_full) else 0,
+        'stages': stages,
+        # Puncak kumulatif seluruh run (ru_maxrss), bukan per tahap
+        'peak_rss_mb': _peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+        # Proses worker parser (ProcessPoolExecutor) yang sudah selesai
+        'peak_rss_children_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+    }
+
+
+def prepare_corpus(data_dir, n_messages, seed):
+    """Membuat (sekali) korpus sintetis untuk n_messages dan seed, lalu mengembalikan foldernya."""
+    from synthetic_chats import generate_exports
+
+    folder_path = os.path.join(data_dir, f'{n_messages}_{seed}')
+    done_marker = os.path.join(folder_path, '.selesai')
+    if not os.path.exists(done_marker):
+        shutil.rmtree(folder_path, ignore_errors=True)
+        generate_exports(folder_path, n_messages, seed=seed)
+        open(done_marker, 'w').close()
+    return folder_path
+
+
+def run_size(n_messages, args):
+    """Menjalankan satu ukuran di proses anak dan mengembalikan hasilnya (atau pesan error)."""
+    folder_path = prepare_corpus(args.data_dir, n_messages, args.seed)
+    command = [sys.executable, os.path.abspath(__file__), '--run-one', folder_path, '--seller', args.seller]
+    if args.workers is not None:
+        command += ['--workers', str(args.workers)]
+    started = time.perf_counter()
+    completed = subprocess.run(command, capture_output=True, text=True)
+    result = {'messages': n_messages, 'seed': args.seed}
+    if completed.returncode != 0:
+        result['error'] = completed.stderr.strip().splitlines()[-1:] or [f'exit code {completed.returncode}']
+    else:
+        result.update(json.loads(completed.stdout.strip().splitlines()[-1]))
+    result['total_seconds'] = time.perf_counter() - started
+    return result
+
+
+def compare(results, baseline):
+    """Mencetak rasio waktu setiap tahap terhadap hasil benchmark sebelumnya."""
+    previous = {run['messages']: run for run in baseline['runs'] if 'stages' in run}
+    print(f"\nPerbandingan dengan baseline ({baseline['meta'].get('created')}):")
+    for run in results['runs']:
+        old = previous.get(run['messages'])
+        if old is None or 'stages' not in run:
+            continue
+        for stage, measured in run['stages'].items():
+            if stage not in old['stages']:
+                continue
+            ratio = measured['wall_seconds'] / max(old['stages'][stage]['wall_seconds'], 1e-9)
+            flag = '  <-- lebih lambat' if ratio > REGRESSION_RATIO else ''
+            print(f"  {run['messages']:>10} {stage:<18} {ratio:6.2f}x{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark tahap pipeline analisis pada data chat sintetis.')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='jumlah pesan dipisah koma (default: 1000 sampai 10000000)')
+    parser.add_argument('--seed', type=int, default=0, help='seed generator data sintetis')
+    parser.add_argument('--seller', default='Nusa Restoria', help='nama akun penjual')
+    parser.add_argument('--workers', type=int, default=None, help='jumlah proses worker parser')
+    parser.add_argument('--data-dir', default='bench_data', help='folder korpus sintetis (dipakai ulang antar run)')
+    parser.add_argument('--output', default='hasil_benchmark.json', help='file JSON hasil benchmark')
+    parser.add_argument('--baseline', metavar='FILE', help='hasil benchmark sebelumnya untuk dibandingkan')
+    parser.add_argument('--run-one', metavar='DIR', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_one:
+        # Proses anak: satu ukuran, hasil dicetak sebagai JSON di baris terakhir
+        print(json.dumps(run_stages(args.run_one, args.seller, args.workers)))
+        return
+
+    import pandas as pd
+    import numpy as np
+
+    results = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'workers': args.workers,
+            'seed': args.seed,
+        },
+        'runs': [],
+    }
+    for n_messages in (int(size) for size in args.sizes.split(',')):
+        print(f"Benchmark {n_messages} pesan...", flush=True)
+        run = run_size(n_messages, args)
+        results['runs'].append(run)
+        if 'error' in run:
+            print(f"  gagal: {run['error']}")
+            continue
+        for stage, measured in run['stages'].items():
+            memory = ''
+            if measured['stage_peak_rss_mb'] is not None:
+                memory = f"  puncak {measured['stage_peak_rss_mb']:7.0f} MB  selisih {measured['rss_delta_mb']:+7.0f} MB"
+            print(f"  {stage:<18} {measured['wall_seconds']:8.3f} detik{memory}")
+        if run['peak_rss_mb'] is not None:
+            print(f"  peak RSS kumulatif {run['peak_rss_mb']:.0f} MB (worker: {run['peak_rss_children_mb']:.0f} MB)")
+
+        # Ditulis ulang setelah setiap ukuran agar hasil tidak hilang jika run besar dihentikan
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+
+    print(f"\nHasil benchmark disimpan ke '{args.output}'.")
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
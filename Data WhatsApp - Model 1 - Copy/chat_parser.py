@@ -0,0 +1,360 @@
+import os
+import re
+import mmap
+import heapq
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from dedup import unique_chat_files, merge_conversations
+from instrumentation import span
+from text_normalizer import normalize_series
+
+# Pola header WhatsApp: DD/MM/YY HH.MM - Sender: Message
+# Dicocokkan per baris (re.M) pada byte seluruh file sekaligus (lewat mmap),
+# sebelum apa pun di-decode. Baris yang tidak diawali header adalah lanjutan
+# dari pesan sebelumnya (pesan multi-baris).
+HEADER_PATTERN = re.compile(rb"^(\d{1,2})/(\d{1,2})/(\d{2}) (\d{1,2})\.(\d{2}) - ", re.M)
+
+COLUMNS = ['Timestamp', 'Sender', 'Message', 'Filename', 'Offset', 'Message_norm']
+# Kolom mentah hasil parse_chat_bytes (list per kolom)
+RAW_COLUMNS = ('day', 'month', 'year', 'hour', 'minute', 'sender', 'message', 'offset')
+
+# Kolom yang nilainya berulang di banyak baris disimpan sebagai categorical
+# (kode integer + tabel nilai unik), bukan string Python per baris.
+CATEGORICAL_COLUMNS = ['Sender', 'Filename', 'Conversation']
+
+# Di bawah ukuran ini per worker, biaya menyalakan proses lebih mahal
+# daripada mem-parsing file-nya langsung.
+MIN_BYTES_PER_WORKER = 4 * 1024 * 1024
+
+
+def list_chat_files(folder_path):
+    """Mengembalikan path semua file .txt di folder, diurutkan berdasarkan nama."""
+    return [
+        os.path.join(folder_path, filename)
+        for filename in sorted(os.listdir(folder_path))
+        if filename.endswith(".txt")
+    ]
+
+
+@contextmanager
+def map_file(file_path):
+    """
+    Isi file sebagai buffer byte read-only lewat mmap: halaman file dibaca
+    oleh OS saat disentuh, tanpa salinan ke memori proses. File kosong (tidak
+    bisa di-mmap) menjadi b''.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if hasattr(buffer, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                # Dibaca sekali dari depan ke belakang: readahead lebih agresif
+                buffer.madvise(mmap.MADV_SEQUENTIAL)
+            yield buffer
+
+
+def iter_records(buffer, start=0):
+    """
+    Posisi byte setiap header di buffer (bytes atau mmap) mulai dari start:
+    (header, separator, end). header adalah match HEADER_PATTERN, nama
+    pengirim ada di buffer[header.end():separator] dan isi pesan (beserta
+    baris lanjutannya) di buffer[separator + 2:end]. separator -1 berarti
+    baris sistem tanpa "Pengirim: ". Tidak ada yang di-decode di sini.
+
+    start harus berada di awal baris (misal header terakhir yang tersimpan).
+    """
+    previous = None
+    for match in HEADER_PATTERN.finditer(buffer, start):
+        if previous is not None:
+            yield _record(buffer, previous, match.start())
+        previous = match
+    if previous is not None:
+        yield _record(buffer, previous, len(buffer))
+
+
+def _record(buffer, header, end):
+    line_end = buffer.find(b'\n', header.end(), end)
+    separator = buffer.find(b': ', header.end(), end if line_end == -1 else line_end)
+    return header, separator, end
+
+
+def decode_message(raw):
+    """Isi pesan dari potongan byte buffer[separator + 2:end]."""
+    message = raw.decode('utf-8').strip()
+    if '\r' in message:
+        message = message.replace('\r\n', '\n')
+    return message
+
+
+def parse_chat_bytes(buffer, start=0):
+    """
+    Mengurai isi satu file ekspor (bytes atau mmap, mulai dari start) menjadi
+    kolom-kolom mentah (list per kolom). Hanya nama pengirim dan isi pesan
+    yang disimpan yang di-decode; baris sistem (header tanpa "Pengirim: ")
+    diabaikan beserta baris lanjutannya tanpa pernah di-decode.
+
+    'offset' adalah posisi byte header setiap pesan di buffer: teks lengkapnya
+    bisa diambil ulang kapan saja dengan read_messages tanpa menyimpannya.
+
+    'tail_start' adalah posisi byte header terakhir dan 'tail_rows' jumlah
+    pesan (0 atau 1) yang berasal darinya. Pesan terakhir bisa masih bertambah
+    baris lanjutannya, jadi parsing inkremental dilanjutkan dari posisi ini.
+    """
+    columns = {key: [] for key in RAW_COLUMNS}
+    columns['tail_start'] = len(buffer)
+    columns['tail_rows'] = 0
+    # Nama pengirim sangat berulang: dibersihkan sekali per nama mentah
+    senders = {}
+
+    for header, separator, end in iter_records(buffer, start):
+        columns['tail_start'] = header.start()
+        columns['tail_rows'] = 0
+        if separator == -1:
+            continue
+
+        raw_sender = buffer[header.end():separator]
+        sender = senders.get(raw_sender)
+        if sender is None:
+            # Membersihkan karakter kontrol tak terlihat (seperti LTR/RTL marks) dari nama pengirim
+            sender = senders[raw_sender] = ''.join(c for c in raw_sender.decode('utf-8') if c.isprintable()).strip()
+
+        day, month, year, hour, minute = header.groups()
+        columns['day'].append(int(day))
+        columns['month'].append(int(month))
+        columns['year'].append(int(year))
+        columns['hour'].append(int(hour))
+        columns['minute'].append(int(minute))
+        columns['sender'].append(sender)
+        columns['message'].append(decode_message(buffer[separator + 2:end]))
+        columns['offset'].append(header.start())
+        columns['tail_rows'] = 1
+
+    return columns
+
+
+def parse_bytes(buffer, filename, start=0):
+    """
+    Mem-parsing byte sebuah ekspor (bytes atau mmap) mulai dari start menjadi
+    DataFrame (lihat build_frame, index direset). Mengembalikan juga offset
+    byte header terakhir (dalam buffer) dan jumlah baris dari header itu,
+    untuk melanjutkan parsing saat file ditambah.
+    """
+    columns = parse_chat_bytes(buffer, start)
+    df = build_frame(columns, filename)
+    # Pesan terakhir bisa saja dibuang build_frame karena timestamp-nya tidak valid
+    tail_rows = int(columns['tail_rows'] and len(df) > 0 and df.index[-1] == len(columns['message']) - 1)
+    return df.reset_index(drop=True), columns['tail_start'], tail_rows
+
+
+def read_chat_file(file_path):
+    """Kolom mentah (lihat parse_chat_bytes) satu file ekspor, dibaca lewat mmap."""
+    with map_file(file_path) as buffer:
+        return parse_chat_bytes(buffer)
+
+
+def read_messages(file_path, offsets):
+    """
+    Mengambil teks pesan dari file ekspor berdasarkan kolom Offset (posisi
+    byte header, lihat parse_chat_bytes), dengan satu mmap untuk semua offset.
+    Hanya pesan yang diminta yang di-decode.
+    """
+    with map_file(file_path) as buffer:
+        messages = []
+        for offset in offsets:
+            header = HEADER_PATTERN.match(buffer, offset)
+            if header is None:
+                raise ValueError(f"Tidak ada header pesan di byte {offset} file '{file_path}'.")
+            following = HEADER_PATTERN.search(buffer, header.end())
+            _, separator, end = _record(buffer, header, len(buffer) if following is None else following.start())
+            messages.append(decode_message(buffer[separator + 2:end]))
+        return messages
+
+
+def build_frame(columns, filename):
+    """
+    Mengubah kolom mentah dari parse_chat_bytes menjadi DataFrame berskema
+    Timestamp, Sender, Message, Filename, Offset, ditambah Message_norm (teks yang
+    sudah dinormalisasi untuk pencocokan kata kunci, lihat text_normalizer.py).
+    filename berupa satu nama, atau array nama per baris (lihat parse_chat_shard).
+    Index adalah posisi baris di kolom mentah; baris bertimestamp tidak valid dibuang.
+
+    Timestamp dibangun langsung dari komponen angka secara vektor, tanpa
+    format ulang ke string lalu di-parse kembali.
+    """
+    if not columns['message']:
+        return pd.DataFrame(columns=COLUMNS)
+
+    # Tahun 2 digit mengikuti aturan %y: 00-68 -> 20xx, 69-99 -> 19xx
+    year = np.asarray(columns['year'], dtype=np.int64)
+    year = np.where(year < 69, year + 2000, year + 1900)
+    timestamps = pd.to_datetime(pd.DataFrame({
+        'year': year,
+        'month': columns['month'],
+        'day': columns['day'],
+        'hour': columns['hour'],
+        'minute': columns['minute'],
+    }), errors='coerce')
+
+    df = pd.DataFrame({
+        'Timestamp': timestamps,
+        'Sender': columns['sender'],
+        'Message': columns['message'],
+        'Filename': filename,
+        'Offset': np.asarray(columns['offset'], dtype=np.int64),
+    })
+    df['Message_norm'] = normalize_series(df['Message'])
+    df.dropna(subset=['Timestamp'], inplace=True)
+    return df
+
+
+def parse_chat_file(file_path):
+    """Membaca dan mem-parsing satu file ekspor WhatsApp menjadi DataFrame."""
+    return build_frame(read_chat_file(file_path), os.path.basename(file_path))
+
+
+def build_shard_frame(file_columns, filenames):
+    """
+    Satu kali build_frame untuk kolom mentah beberapa file sekaligus (iterable
+    dict dari parse_chat_bytes, sejajar dengan filenames), agar biaya tetap
+    pandas per DataFrame tidak dibayar per file (ekspor WhatsApp umumnya
+    banyak file kecil). Mengembalikan DataFrame dan bounds: baris file ke-i
+    ada di df.iloc[bounds[i]:bounds[i + 1]]. Index tetap posisi baris mentah
+    gabungan (lihat build_frame).
+    """
+    columns = {key: [] for key in RAW_COLUMNS}
+    counts = []
+    for file_column in file_columns:
+        for key in columns:
+            columns[key] += file_column[key]
+        counts.append(len(file_column['message']))
+
+    df = build_frame(columns, np.repeat(np.array(filenames, dtype=object), counts))
+    # Index build_frame adalah posisi baris mentah, jadi batas tiap file tetap
+    # bisa dicari walaupun ada baris yang dibuang
+    return df, np.searchsorted(df.index.to_numpy(), np.cumsum([0] + counts))
+
+
+def parse_chat_shard(file_paths):
+    """
+    Mem-parsing sekelompok file dengan satu kali build_frame untuk semuanya
+    (lihat build_shard_frame). Mengembalikan [(path, DataFrame)] per file.
+    """
+    df, bounds = build_shard_frame(
+        (read_chat_file(file_path) for file_path in file_paths),
+        [os.path.basename(path) for path in file_paths],
+    )
+    return [
+        (file_path, df.iloc[bounds[i]:bounds[i + 1]])
+        for i, file_path in enumerate(file_paths)
+    ]
+
+
+def _shard_by_size(file_paths, n_shards):
+    """
+    Membagi file ke n_shards kelompok dengan total byte yang seimbang
+    (file terbesar lebih dulu ke kelompok yang paling ringan).
+    """
+    sizes = {path: os.path.getsize(path) for path in file_paths}
+    heap = [(0, i, []) for i in range(n_shards)]
+    for path in sorted(file_paths, key=sizes.get, reverse=True):
+        total, i, shard = heapq.heappop(heap)
+        shard.append(path)
+        heapq.heappush(heap, (total + sizes[path], i, shard))
+    return [shard for _, _, shard in heap if shard]
+
+
+def _plan_workers(file_paths, workers):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    total_bytes = sum(os.path.getsize(path) for path in file_paths)
+    by_bytes = -(-total_bytes // MIN_BYTES_PER_WORKER)
+    return max(1, min(workers, len(file_paths), by_bytes))
+
+
+def map_chat_shards(shard_func, file_paths, workers=None):
+    """
+    Menjalankan shard_func(daftar path) -> [(path, hasil)] untuk kelompok-kelompok
+    file dan menghasilkan (path, hasil) segera setelah kelompoknya selesai,
+    tanpa menunggu semua file.
+
+    File dibagi ke sebuah process pool berdasarkan ukuran byte-nya, sehingga
+    waktu total sebanding dengan total byte dibagi jumlah core. Tanpa pool
+    (satu worker), semua file menjadi satu kelompok. shard_func harus berupa
+    fungsi level modul (atau functools.partial darinya) agar bisa dikirim ke
+    proses worker.
+    """
+    file_paths = list(file_paths)
+    if not file_paths:
+        return
+
+    n_workers = _plan_workers(file_paths, workers)
+    if n_workers == 1:
+        yield from shard_func(file_paths)
+        return
+
+    # Beberapa kelompok per worker agar pembagian kerja tetap seimbang
+    shards = _shard_by_size(file_paths, n_workers * 4)
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [executor.submit(shard_func, shard) for shard in shards]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def iter_chat_batches(file_paths, workers=None):
+    """Mem-parsing file-file chat dan menghasilkan (path, DataFrame) per file."""
+    return map_chat_shards(parse_chat_shard, file_paths, workers)
+
+
+def compact_frame(df):
+    """Mengubah kolom berulang (pengirim, file, percakapan) menjadi categorical."""
+    for column in CATEGORICAL_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def parse_chat_files(file_paths, workers=None):
+    """Mem-parsing daftar file chat dan menggabungkannya sesuai urutan file."""
+    batches = dict(iter_chat_batches(file_paths, workers))
+
+    frames = [batches[path] for path in file_paths if not batches[path].empty]
+    if not frames:
+        return pd.DataFrame()
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def parse_whatsapp_chat(folder_path, workers=None, cache_dir=None):
+    """
+    Membaca semua file .txt di sebuah folder, mem-parsingnya,
+    dan mengubahnya menjadi DataFrame Pandas.
+
+    Pesan multi-baris dipertahankan utuh. workers membatasi jumlah proses
+    parser (default: jumlah core). Jika cache_dir diberikan, hanya file yang
+    baru atau berubah yang di-parsing (lihat ingest_cache.py).
+
+    File yang isinya identik dilewati, dan ekspor ganda dari kontak yang sama
+    digabung menjadi satu percakapan pada kolom 'Conversation' (lihat dedup.py).
+    Sender, Filename dan Conversation dikembalikan sebagai categorical.
+    """
+    with span('parse.list_files') as s:
+        file_paths = unique_chat_files(list_chat_files(folder_path))
+        s.rows_out = len(file_paths)
+
+    with span('parse.read', rows_in=len(file_paths)) as s:
+        if cache_dir is not None:
+            from ingest_cache import load_files
+            df = load_files(file_paths, folder_path, cache_dir, workers)
+        else:
+            df = parse_chat_files(file_paths, workers)
+        s.rows_out = len(df)
+
+    with span('parse.merge', rows_in=len(df)) as s:
+        df = compact_frame(merge_conversations(df))
+        s.rows_out = len(df)
+    return df
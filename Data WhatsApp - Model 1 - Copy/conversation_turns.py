@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class ConversationTurns:
+    """
+    Tabel giliran bicara yang dihitung sekali untuk seluruh percakapan.
+
+    messages        : semua pesan, diurutkan per (Conversation, Timestamp), dengan
+                      kolom Is_seller, Turn_start, Turn dan Latency_seconds
+    responses       : setiap balasan penjual atas pesan pembeli (Response_minutes)
+    first_response  : balasan pertama dengan waktu respons > 0 per percakapan
+    last_speaker    : pesan terakhir per percakapan (Sender, Is_seller, Timestamp)
+    tail_tags       : gabungan (OR) kolom Tags dari tail_size pesan terakhir per percakapan
+    """
+    messages: pd.DataFrame
+    responses: pd.DataFrame
+    first_response: pd.DataFrame
+    last_speaker: pd.DataFrame
+    tail_tags: pd.Series
+
+
+def seller_mask(senders, seller):
+    """
+    Array boolean pesan penjual. seller berupa satu nama akun, atau daftar
+    nama jika satu toko dilayani beberapa akun/admin.
+    """
+    if isinstance(seller, str):
+        return (senders == seller).to_numpy()
+    return senders.isin(list(seller)).to_numpy()
+
+
+def _codes(column):
+    """Kode integer untuk kolom categorical (perbandingan jauh lebih murah dari string)."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy()
+    return column.to_numpy()
+
+
+def _group_starts(keys):
+    """Mask baris pertama dari setiap blok nilai yang sama pada array terurut."""
+    change = np.ones(len(keys), dtype=bool)
+    change[1:] = keys[1:] != keys[:-1]
+    return change
+
+
+def build_turns(df_full, seller, tail_size=5):
+    """
+    Menghitung giliran bicara semua percakapan sekaligus dengan operasi
+    vektor: satu kali pengurutan (stabil) per (Conversation, Timestamp), lalu
+    batas pergantian pembicara, nomor giliran dan jeda antar pesan diambil dari
+    perbandingan dengan baris sebelumnya, tanpa iterasi per baris.
+
+    Jika df_full sudah punya kolom boolean Is_seller, kolom itu yang dipakai.
+    """
+    messages = df_full.sort_values(['Conversation', 'Timestamp'], kind='stable').reset_index(drop=True)
+
+    conversation = _codes(messages['Conversation'])
+    if 'Is_seller' in messages:
+        is_seller = messages['Is_seller'].to_numpy()
+    else:
+        is_seller = seller_mask(messages['Sender'], seller)
+    timestamps = messages['Timestamp'].to_numpy()
+
+    conversation_start = _group_starts(conversation)
+    speaker_change = np.ones(len(messages), dtype=bool)
+    speaker_change[1:] = is_seller[1:] != is_seller[:-1]
+    turn_start = conversation_start | speaker_change
+
+    latency = np.full(len(messages), np.nan)
+    if len(messages) > 1:
+        latency[1:] = (timestamps[1:] - timestamps[:-1]) / np.timedelta64(1, 's')
+    latency[conversation_start] = np.nan
+
+    messages['Is_seller'] = is_seller
+    messages['Turn_start'] = turn_start
+    messages['Turn'] = np.cumsum(turn_start) - 1
+    messages['Latency_seconds'] = latency
+
+    # Balasan penjual: pesan penjual yang tepat didahului pesan pembeli
+    # dalam percakapan yang sama
+    is_response = turn_start & ~conversation_start & is_seller
+    responses = messages.loc[is_response, ['Conversation', 'Timestamp', 'Latency_seconds']]
+    responses = responses.assign(Response_minutes=responses['Latency_seconds'] / 60)
+
+    # Hanya ambil respons pertama yang valid (waktu respons > 0) per percakapan
+    positive = responses[responses['Latency_seconds'] > 0]
+    first_response = positive.drop_duplicates('Conversation').set_index('Conversation')
+
+    conversation_end = np.zeros(len(messages), dtype=bool)
+    conversation_end[np.flatnonzero(conversation_start)[1:] - 1] = True
+    if len(messages):
+        conversation_end[-1] = True
+    last_speaker = messages.loc[conversation_end, ['Conversation', 'Sender', 'Is_seller', 'Timestamp']]
+    last_speaker = last_speaker.set_index('Conversation')
+
+    tail_tags = pd.Series(dtype=np.uint64)
+    if 'Tags' in messages and len(messages):
+        position_from_end = messages.groupby('Conversation', sort=False, observed=True).cumcount(ascending=False).to_numpy()
+        tail = messages[position_from_end < tail_size]
+        tail_start = np.flatnonzero(_group_starts(_codes(tail['Conversation'])))
+        tail_tags = pd.Series(
+            np.bitwise_or.reduceat(tail['Tags'].to_numpy(dtype=np.uint64), tail_start),
+            index=tail['Conversation'].to_numpy()[tail_start],
+        )
+
+    return ConversationTurns(messages, responses, first_response, last_speaker, tail_tags)
@@ -0,0 +1,96 @@
+import os
+import re
+import hashlib
+from collections import defaultdict
+
+import pandas as pd
+
+EXPORT_PREFIX = 'Chat WhatsApp dengan '
+_PHONE_PATTERN = re.compile(r"^\+?[\d\s\-()]+$")
+
+
+def contact_identity(filename):
+    """
+    Menormalkan nama file ekspor menjadi identitas kontak, misalnya
+    'Chat WhatsApp dengan +966 53 490 8315__Chat WhatsApp dengan +966 53 490 8315.txt'
+    dan 'Chat WhatsApp dengan +966 53 490 8315.txt' sama-sama menjadi '+966534908315'.
+    """
+    name = filename[:-4] if filename.endswith('.txt') else filename
+    # Ekspor ganda diberi nama 'X__X'; bagian pertama sudah cukup
+    name = name.split('__')[0]
+    if name.startswith(EXPORT_PREFIX):
+        name = name[len(EXPORT_PREFIX):]
+    # Membuang karakter kontrol tak terlihat (LTR/RTL marks) dan merapikan spasi
+    name = ' '.join(''.join(c for c in name if c.isprintable()).split())
+    if _PHONE_PATTERN.match(name):
+        name = re.sub(r"[\s\-()]", '', name)
+    return name
+
+
+def _file_hash(file_path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def duplicate_chat_files(file_paths):
+    """
+    Mencari file yang isinya identik dengan file lain: {path duplikat: path
+    yang dipertahankan}.
+
+    Hanya file dengan ukuran yang sama yang di-hash, jadi folder tanpa
+    duplikat hampir tidak menambah biaya baca. Dari setiap kelompok duplikat,
+    file dengan nama terpendek (nama polos, bukan 'X__X') yang dipertahankan.
+    """
+    by_size = defaultdict(list)
+    for file_path in file_paths:
+        by_size[os.path.getsize(file_path)].append(file_path)
+
+    duplicates = {}
+    for candidates in by_size.values():
+        if len(candidates) < 2:
+            continue
+        by_hash = defaultdict(list)
+        for file_path in candidates:
+            by_hash[_file_hash(file_path)].append(file_path)
+        for same in by_hash.values():
+            keep = min(same, key=lambda path: (len(os.path.basename(path)), path))
+            duplicates.update((path, keep) for path in same if path != keep)
+    return duplicates
+
+
+def unique_chat_files(file_paths):
+    """Membuang file yang isinya identik dengan file lain sebelum di-parsing (lihat duplicate_chat_files)."""
+    duplicates = duplicate_chat_files(file_paths)
+    return [path for path in file_paths if path not in duplicates]
+
+
+def merge_conversations(df):
+    """
+    Menambahkan kolom 'Conversation' (identitas kontak) dan menggabungkan
+    ekspor yang tumpang tindih dari chat yang sama menjadi satu percakapan.
+
+    Pesan dianggap sama jika hash (Timestamp, Sender, Message)-nya sama.
+    Pesan yang memang dikirim berulang dalam satu file tetap dipertahankan:
+    yang dibuang hanya salinan yang melebihi jumlah kemunculan terbanyak
+    di salah satu file.
+    """
+    if df.empty:
+        return df
+
+    filenames = df['Filename'].unique()
+    identities = {filename: contact_identity(filename) for filename in filenames}
+    df = df.assign(Conversation=df['Filename'].map(identities))
+
+    files_per_conversation = pd.Series(identities).value_counts()
+    if (files_per_conversation < 2).all():
+        return df
+
+    row_hash = pd.util.hash_pandas_object(df[['Timestamp', 'Sender', 'Message']], index=False)
+    occurrence = row_hash.groupby([df['Filename'], row_hash]).cumcount()
+    keys = pd.DataFrame({'Conversation': df['Conversation'], 'hash': row_hash, 'n': occurrence})
+    df = df[~keys.duplicated()]
+
+    return df.sort_values(['Conversation', 'Timestamp'], kind='stable').reset_index(drop=True)
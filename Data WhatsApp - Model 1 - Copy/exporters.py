@@ -0,0 +1,166 @@
+import os
+import shutil
+import sqlite3
+from contextlib import closing
+
+# pandas dan pyarrow diimpor di dalam fungsi, agar daftar format bisa dibaca
+# baris perintah tanpa ikut memuat pustaka data yang berat.
+
+# Jumlah baris per potongan saat menulis tabel besar
+CHUNK_ROWS = 100_000
+
+SQLITE_NAME = 'hasil_analisis.sqlite'
+# Kolom yang diberi index di SQLite jika ada di tabel
+SQLITE_INDEX_COLUMNS = ['Sender', 'Conversation', 'Date']
+
+# Semua fungsi ekspor mengembalikan path hasilnya, atau None jika chunks tidak
+# berisi satu potongan pun (tidak ada file yang ditulis). Potongan kosong
+# (0 baris) tetap ditulis: CSV berisi header saja, Parquet/Feather skema saja.
+
+
+def iter_chunks(df, chunk_rows=CHUNK_ROWS):
+    """Memotong DataFrame menjadi potongan berurutan tanpa menyalin seluruh tabel."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _require_pyarrow(fmt):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(f"Ekspor format '{fmt}' membutuhkan paket pyarrow (pip install pyarrow).")
+
+
+def export_csv(chunks, output_folder, name, partition_by=None):
+    """CSV UTF-8 dengan BOM (utf-8-sig) agar terbaca benar di Excel, ditulis per potongan."""
+    path = os.path.join(output_folder, f'{name}.csv')
+    first = True
+    for chunk in chunks:
+        chunk.to_csv(
+            path, index=False, header=first,
+            mode='w' if first else 'a',
+            encoding='utf-8-sig' if first else 'utf-8',
+        )
+        first = False
+    return None if first else path
+
+
+def export_parquet(chunks, output_folder, name, partition_by=None):
+    """
+    Parquet. Jika partition_by diberikan (mis. 'Date'), ditulis sebagai dataset
+    berupa folder dengan satu subfolder per tanggal (Date=YYYY-MM-DD), sehingga
+    dashboard bisa membaca rentang tanggal tertentu saja.
+    """
+    _require_pyarrow('parquet')
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = os.path.join(output_folder, f'{name}.parquet')
+    if partition_by is None:
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return None if writer is None else path
+
+    import pandas as pd
+
+    # Dataset lama dihapus dulu agar partisi tanggal yang sudah tidak ada tidak tertinggal
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    empty_table = None
+    for index, chunk in enumerate(chunks):
+        if pd.api.types.is_datetime64_any_dtype(chunk[partition_by]):
+            chunk = chunk.assign(**{partition_by: chunk[partition_by].dt.strftime('%Y-%m-%d')})
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if not len(table):
+            empty_table = table
+            continue
+        pq.write_to_dataset(
+            table, path, partition_cols=[partition_by], basename_template=f'part-{index}-{{i}}.parquet',
+        )
+    if not os.path.isdir(path) and empty_table is not None:
+        # write_to_dataset tidak menulis apa pun untuk tabel kosong: skema
+        # disimpan sebagai satu file tanpa partisi agar dataset tetap terbaca
+        os.makedirs(path)
+        pq.write_table(empty_table, os.path.join(path, 'part-0-0.parquet'))
+    return path if os.path.isdir(path) else None
+
+
+def export_feather(chunks, output_folder, name, partition_by=None):
+    """Arrow IPC / Feather v2, ditulis sebagai record batch per potongan."""
+    _require_pyarrow('feather')
+    import pyarrow as pa
+
+    path = os.path.join(output_folder, f'{name}.feather')
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pa.ipc.new_file(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return None if writer is None else path
+
+
+def export_sqlite(chunks, output_folder, name, partition_by=None):
+    """
+    Satu tabel di database SQLite bersama (hasil_analisis.sqlite), dengan index
+    pada kolom pengirim, percakapan dan tanggal jika ada.
+    """
+    import pandas as pd
+
+    path = os.path.join(output_folder, SQLITE_NAME)
+    # closing() menutup koneksi; 'with connection' sendiri hanya melakukan commit
+    with closing(sqlite3.connect(path)) as connection, connection:
+        columns = []
+        first = True
+        for chunk in chunks:
+            chunk = chunk.assign(**{
+                column: chunk[column].astype(str)
+                for column in chunk.columns
+                if isinstance(chunk[column].dtype, pd.CategoricalDtype)
+            })
+            chunk.to_sql(name, connection, index=False, if_exists='replace' if first else 'append')
+            columns = chunk.columns
+            first = False
+        for column in SQLITE_INDEX_COLUMNS:
+            if column in columns:
+                connection.execute(f'CREATE INDEX IF NOT EXISTS "idx_{name}_{column}" ON "{name}" ("{column}")')
+    return None if first else path
+
+
+# Format ekspor yang tersedia. Format baru cukup ditambahkan ke sini dengan
+# fungsi ber-signature (chunks, output_folder, name, partition_by) -> path atau None.
+EXPORTERS = {
+    'csv': export_csv,
+    'parquet': export_parquet,
+    'feather': export_feather,
+    'sqlite': export_sqlite,
+}
+EXPORT_FORMATS = tuple(EXPORTERS)
+
+
+def export_table(chunks, output_folder, name, fmt='csv', partition_by=None):
+    """
+    Menulis satu tabel (iterable potongan DataFrame) ke output_folder dengan
+    format fmt dan mengembalikan path hasilnya, atau None jika chunks kosong.
+    partition_by hanya dipakai oleh format yang mendukung partisi (parquet).
+    """
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Format ekspor tidak dikenal: {fmt} (pilihan: {', '.join(EXPORTERS)})")
+    import pandas as pd
+
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    os.makedirs(output_folder, exist_ok=True)
+    return EXPORTERS[fmt](chunks, output_folder, name, partition_by=partition_by)
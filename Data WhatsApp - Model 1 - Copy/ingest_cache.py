@@ -0,0 +1,298 @@
+import os
+import json
+import uuid
+import hashlib
+from collections import Counter
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from chat_parser import COLUMNS, build_shard_frame, map_chat_shards, map_file, parse_chat_bytes
+
+# Manifest ingest: satu entri per file ekspor, berkunci path relatif terhadap
+# folder chat (lihat _manifest_key): size, mtime, hash isi, posisi
+# lanjut parsing, letak barisnya di store) dan jumlah baris per store.
+# Setiap kelompok file yang di-parsing worker ditulis sebagai satu store
+# kolumnar (segmen); entri file menunjuk ke rentang baris [offset, offset + rows)
+# di segmennya. Naikkan versi ini jika skema hasil parser atau tata letak
+# store berubah agar cache lama dibuang.
+MANIFEST_VERSION = 4
+MANIFEST_NAME = 'manifest.json'
+STORE_EXTENSIONS = ('.parquet', '.pkl')
+
+
+def _content_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _prefix_hash(data, size):
+    # Lewat memoryview agar awalan file tidak disalin
+    with memoryview(data) as view, view[:size] as prefix:
+        return _content_hash(prefix)
+
+
+def _store_format():
+    """Parquet jika pyarrow tersedia; jika tidak, pickle pandas."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return 'pickle'
+    return 'parquet'
+
+
+def _new_store_name(store_format):
+    return f"{uuid.uuid4().hex}.{'parquet' if store_format == 'parquet' else 'pkl'}"
+
+
+def _write_store(df, store_path):
+    tmp_path = store_path + '.tmp'
+    if store_path.endswith('.parquet'):
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, store_path)
+
+
+def _read_store(store_path):
+    if store_path.endswith('.parquet'):
+        return pd.read_parquet(store_path)
+    return pd.read_pickle(store_path)
+
+
+def load_manifest(cache_dir):
+    """
+    Membaca manifest dari cache_dir: (entri per file, jumlah baris per store).
+    Manifest versi lain dianggap kosong.
+    """
+    manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}, {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}, {}
+    return manifest['files'], manifest['stores']
+
+
+def save_manifest(cache_dir, files, stores):
+    manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': files, 'stores': stores}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, manifest_path)
+
+
+def _manifest_key(file_path, root):
+    """Kunci manifest: path file relatif terhadap folder chat, dengan pemisah '/'."""
+    return os.path.relpath(file_path, root).replace(os.sep, '/')
+
+
+def _is_fresh(entry, stat, cache_dir):
+    return (
+        entry is not None
+        and entry['size'] == stat.st_size
+        and entry['mtime_ns'] == stat.st_mtime_ns
+        and (entry['store'] is None or os.path.exists(os.path.join(cache_dir, entry['store'])))
+    )
+
+
+def _ingest_shard(file_paths, root, manifest, retired, cache_dir, store_format):
+    """
+    Dijalankan di proses worker untuk sekelompok file yang size/mtime-nya
+    berubah (atau yang store-nya sedang dipadatkan). Semua baris yang perlu
+    ditulis ulang dijadikan satu store baru; mengembalikan [(path, entri manifest)].
+
+    - Isi sama (hanya mtime berubah): baris di store lama dipakai apa adanya,
+      atau disalin ke store baru jika store lamanya ada di retired.
+    - Isi lama adalah awalan isi baru (chat ditambah): baris lama disalin dan
+      parsing dilanjutkan dari header terakhir yang tersimpan.
+    - Selain itu: file di-parsing ulang penuh.
+
+    Semua file yang di-parsing dibangun dengan satu build_shard_frame.
+    """
+    results = []
+    # Per file yang ditulis ke store baru: (path, stat, hash, baris lama, status)
+    # dengan baris lama = (store, offset, jumlah) atau None
+    pending = []
+    parsed = []
+    parsed_names = []
+    for file_path in file_paths:
+        entry = manifest.get(_manifest_key(file_path, root))
+        stat = os.stat(file_path)
+        has_store = entry is not None and entry['store'] is not None and os.path.exists(
+            os.path.join(cache_dir, entry['store']))
+        # File dibaca lewat mmap: hash dan parsing langsung dari halaman file,
+        # tanpa menyalin seluruh isi file ke memori proses
+        with map_file(file_path) as data:
+            content_hash = _content_hash(data)
+            if entry is not None and entry['hash'] == content_hash and (has_store or entry['rows'] == 0):
+                if not has_store or entry['store'] not in retired:
+                    results.append((file_path, dict(entry, mtime_ns=stat.st_mtime_ns, status='unchanged')))
+                    continue
+                pending.append((file_path, stat, content_hash, (entry['store'], entry['offset'], entry['rows']), None))
+                continue
+
+            if has_store and len(data) > entry['size'] and _prefix_hash(data, entry['size']) == entry['hash']:
+                old_rows = (entry['store'], entry['offset'], entry['rows'] - entry['tail_rows'])
+                columns = parse_chat_bytes(data, entry['resume_offset'])
+                status = 'appended'
+            else:
+                old_rows = None
+                columns = parse_chat_bytes(data)
+                status = 'parsed'
+        pending.append((file_path, stat, content_hash, old_rows, status))
+        parsed.append(columns)
+        parsed_names.append(os.path.basename(file_path))
+
+    if not pending:
+        return results
+
+    df, bounds = build_shard_frame(parsed, parsed_names)
+    raw_ends = np.cumsum([len(columns['message']) for columns in parsed])
+    kept_index = df.index.to_numpy()
+    df = df.reset_index(drop=True)
+
+    old_stores = {}
+    pieces = []
+    store_name = _new_store_name(store_format)
+    offset = 0
+    i = 0
+    for file_path, stat, content_hash, old_rows, status in pending:
+        entry = manifest.get(_manifest_key(file_path, root))
+        rows = 0
+        if old_rows is not None:
+            old_store, old_offset, n_old = old_rows
+            if old_store not in old_stores:
+                old_stores[old_store] = _read_store(os.path.join(cache_dir, old_store))
+            pieces.append(old_stores[old_store].iloc[old_offset:old_offset + n_old])
+            rows += n_old
+
+        if status is None:
+            # Hanya disalin dari store yang dipadatkan; posisi lanjut tetap
+            resume_offset, tail_rows = entry['resume_offset'], entry['tail_rows']
+            status = 'unchanged'
+        else:
+            columns = parsed[i]
+            start, end = bounds[i], bounds[i + 1]
+            pieces.append(df.iloc[start:end])
+            rows += end - start
+            resume_offset = columns['tail_start']
+            # Pesan terakhir bisa saja dibuang build_frame karena timestamp-nya tidak valid
+            tail_rows = int(columns['tail_rows'] and end > start and kept_index[end - 1] == raw_ends[i] - 1)
+            i += 1
+
+        results.append((file_path, {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': content_hash,
+            'resume_offset': int(resume_offset),
+            'tail_rows': tail_rows,
+            'rows': int(rows),
+            'store': store_name if rows else None,
+            'offset': offset,
+            'status': status,
+        }))
+        offset += int(rows)
+
+    if offset:
+        # Tanpa baris lama yang disalin, df sudah berurutan per file
+        store_df = df if not old_stores else pd.concat(pieces, ignore_index=True)
+        _write_store(store_df[COLUMNS], os.path.join(cache_dir, store_name))
+    return results
+
+
+def _retired_stores(files, stores, fresh):
+    """
+    Store yang lebih dari separuh barisnya milik file yang berubah atau sudah
+    dihapus. Baris file lain di store itu disalin ke store baru, agar cache
+    tidak terus membesar oleh baris yang tidak terpakai.
+    """
+    live = Counter()
+    for key in fresh:
+        entry = files[key]
+        if entry['store'] is not None:
+            live[entry['store']] += entry['rows']
+    return {store for store, rows in stores.items() if live[store] * 2 < rows}
+
+
+def _read_rows(cache_dir, stores, layout):
+    """
+    Membaca baris semua file sebagai satu DataFrame, berurutan sesuai layout
+    [(store, offset, rows)]. Parquet dibaca sebagai satu dataset Arrow (satu
+    pemanggilan untuk semua store) dan diubah ke pandas sekali saja.
+    """
+    names = list(dict.fromkeys(store for store, _, _ in layout))
+    if not names:
+        return pd.DataFrame()
+    starts = dict(zip(names, np.cumsum([0] + [stores[name] for name in names[:-1]])))
+    indices = np.concatenate([starts[store] + offset + np.arange(rows) for store, offset, rows in layout])
+    in_order = len(indices) == sum(stores[name] for name in names) and (np.diff(indices) == 1).all()
+    paths = [os.path.join(cache_dir, name) for name in names]
+
+    if paths[0].endswith('.parquet'):
+        import pyarrow.dataset as ds
+        table = ds.dataset(paths, format='parquet').to_table(columns=COLUMNS)
+        return (table if in_order else table.take(indices)).to_pandas()
+
+    df = pd.concat([pd.read_pickle(path) for path in paths], ignore_index=True)
+    return df if in_order else df.iloc[indices].reset_index(drop=True)
+
+
+def _remove_unused_stores(cache_dir, stores):
+    for name in os.listdir(cache_dir):
+        if name.endswith(STORE_EXTENSIONS) or name.endswith(tuple(ext + '.tmp' for ext in STORE_EXTENSIONS)):
+            if name not in stores:
+                os.remove(os.path.join(cache_dir, name))
+
+
+def load_files(file_paths, root, cache_dir, workers=None):
+    """
+    Seperti parse_chat_files, tetapi memakai cache ingest di cache_dir:
+    percakapan yang tidak berubah dibaca dari store kolumnar, dan hanya file
+    yang baru atau berubah yang di-parsing (secara paralel, satu store baru
+    per kelompok file). root adalah folder chat; file dicatat di manifest
+    dengan path relatif terhadapnya, sehingga nama file yang sama di subfolder
+    berbeda tidak saling menimpa.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    store_format = _store_format()
+    manifest, stores = load_manifest(cache_dir)
+
+    fresh = {}
+    stale_paths = []
+    for file_path in file_paths:
+        key = _manifest_key(file_path, root)
+        if _is_fresh(manifest.get(key), os.stat(file_path), cache_dir):
+            fresh[key] = file_path
+        else:
+            stale_paths.append(file_path)
+
+    retired = _retired_stores(manifest, stores, fresh)
+    files = {}
+    for key, file_path in fresh.items():
+        if manifest[key]['store'] in retired:
+            stale_paths.append(file_path)
+        else:
+            files[key] = dict(manifest[key], status='cached')
+
+    ingest = partial(_ingest_shard, root=root, manifest=manifest, retired=retired, cache_dir=cache_dir, store_format=store_format)
+    new_rows = Counter()
+    for file_path, entry in map_chat_shards(ingest, stale_paths, workers):
+        files[_manifest_key(file_path, root)] = entry
+        if entry['store'] is not None and entry['store'] not in stores:
+            new_rows[entry['store']] += entry['rows']
+
+    # Store lama tetap dihitung dengan seluruh barisnya (termasuk baris file
+    # yang sudah tidak dipakai); store yang tidak dirujuk lagi dihapus
+    used = {entry['store'] for entry in files.values() if entry['store'] is not None}
+    stores = {name: stores.get(name, new_rows[name]) for name in used}
+    save_manifest(cache_dir, files, stores)
+    _remove_unused_stores(cache_dir, stores)
+
+    layout = [
+        (entry['store'], entry['offset'], entry['rows'])
+        for entry in (files[_manifest_key(path, root)] for path in file_paths)
+        if entry['rows'] > 0
+    ]
+    return _read_rows(cache_dir, stores, layout)
@@ -0,0 +1,173 @@
+import os
+import sys
+import json
+import time
+import cProfile
+from contextlib import contextmanager
+
+# Span bernama di sekitar setiap tahap analisis. Selama tidak ada Tracer yang
+# aktif (lihat activate), span() tidak mengukur apa-apa, sehingga pemanggilan
+# span di modul lain hampir tanpa biaya pada run biasa.
+#
+# Catatan: parsing di proses worker (map_chat_shards) terukur sebagai satu span
+# di proses utama; isi worker tidak ikut dilacak.
+
+_active = None
+
+
+class Span:
+    """Hasil ukur satu tahap; rows_out bisa diisi oleh pemanggil di dalam blok with."""
+
+    __slots__ = ('name', 'start_us', 'wall_ms', 'cpu_ms', 'rows_in', 'rows_out', 'mem_delta_mb', 'depth')
+
+    def __init__(self, name, rows_in=None, depth=0):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.depth = depth
+        self.start_us = self.wall_ms = self.cpu_ms = self.mem_delta_mb = None
+
+
+class _NullSpan:
+    """
+    Span saat tidak ada tracer aktif. Atribut yang ditulis pemanggil (misal
+    rows_out) diabaikan, sehingga satu objek aman dipakai bersama oleh semua
+    pemanggil, termasuk antar thread.
+    """
+
+    __slots__ = ()
+    name = start_us = wall_ms = cpu_ms = rows_in = rows_out = mem_delta_mb = depth = None
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def current_rss_mb():
+    """Memori resident proses saat ini (MB), atau None jika tidak bisa dibaca."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, AttributeError, ValueError):
+        return None
+
+
+class Tracer:
+    """
+    Mengumpulkan span (waktu wall dan CPU, baris masuk/keluar, selisih memori)
+    dan, untuk tahap yang dipilih di profile, menyimpan hasil cProfile ke
+    profile_dir/<tahap>.prof (baca dengan pstats atau snakeviz).
+
+    profile: kumpulan nama span, atau {'all'} untuk semua span tingkat teratas
+    """
+
+    def __init__(self, profile=(), profile_dir='profil'):
+        self.spans = []
+        self.profile = set(profile)
+        self.profile_dir = profile_dir
+        self.profiled = []
+        self._origin = time.perf_counter()
+        self._depth = 0
+        self._profiling = False
+
+    def _should_profile(self, name):
+        # Hanya satu cProfile yang boleh aktif sekaligus
+        if self._profiling:
+            return False
+        return name in self.profile or ('all' in self.profile and self._depth == 0)
+
+    @contextmanager
+    def span(self, name, rows_in=None):
+        record = Span(name, rows_in, self._depth)
+        profiler = cProfile.Profile() if self._should_profile(name) else None
+        rss_before = current_rss_mb()
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        self._depth += 1
+        if profiler is not None:
+            self._profiling = True
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+                os.makedirs(self.profile_dir, exist_ok=True)
+                path = os.path.join(self.profile_dir, f'{name}.prof')
+                profiler.dump_stats(path)
+                self.profiled.append(path)
+            self._depth -= 1
+            record.start_us = (started - self._origin) * 1e6
+            record.wall_ms = (time.perf_counter() - started) * 1e3
+            record.cpu_ms = (time.process_time() - cpu_started) * 1e3
+            rss_after = current_rss_mb()
+            if rss_before is not None and rss_after is not None:
+                record.mem_delta_mb = rss_after - rss_before
+            self.spans.append(record)
+
+    def chrome_trace(self):
+        """Span sebagai Chrome trace (buka di chrome://tracing atau ui.perfetto.dev)."""
+        events = []
+        for record in sorted(self.spans, key=lambda s: (s.start_us, s.depth)):
+            args = {'cpu_ms': round(record.cpu_ms, 3)}
+            for key in ('rows_in', 'rows_out', 'mem_delta_mb'):
+                value = getattr(record, key)
+                if value is not None:
+                    args[key] = round(value, 3) if isinstance(value, float) else value
+            events.append({
+                'name': record.name, 'cat': 'tahap', 'ph': 'X',
+                'ts': round(record.start_us, 1), 'dur': round(record.wall_ms * 1e3, 1),
+                'pid': os.getpid(), 'tid': 0, 'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_trace(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False, indent=1)
+
+    def print_summary(self, file=sys.stdout):
+        print("\n" + "="*30, file=file)
+        print("       WAKTU PER TAHAP", file=file)
+        print("="*30, file=file)
+        print(f"{'Tahap':<40} {'Wall (ms)':>10} {'CPU (ms)':>10} {'Baris':>16} {'Memori (MB)':>12}", file=file)
+        for record in sorted(self.spans, key=lambda s: s.start_us):
+            rows = '' if record.rows_in is None and record.rows_out is None else \
+                f"{'' if record.rows_in is None else record.rows_in}->{'' if record.rows_out is None else record.rows_out}"
+            memory = '' if record.mem_delta_mb is None else f"{record.mem_delta_mb:+.1f}"
+            name = '  ' * record.depth + record.name
+            print(f"{name:<40} {record.wall_ms:>10.1f} {record.cpu_ms:>10.1f} {rows:>16} {memory:>12}", file=file)
+        for path in self.profiled:
+            print(f"- Profil cProfile disimpan ke '{path}'.", file=file)
+
+
+def activate(tracer):
+    """Menjadikan tracer sebagai tujuan semua span(); None untuk mematikan."""
+    global _active
+    _active = tracer
+
+
+@contextmanager
+def span(name, rows_in=None):
+    """
+    Mengukur satu tahap bernama pada tracer yang aktif:
+
+        with span('tag', rows_in=len(df)) as s:
+            ...
+            s.rows_out = len(hasil)
+    """
+    if _active is None:
+        yield _NULL_SPAN
+        return
+    with _active.span(name, rows_in) as record:
+        yield record
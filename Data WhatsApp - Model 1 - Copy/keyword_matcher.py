@@ -0,0 +1,165 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from text_normalizer import normalize_text
+
+try:
+    # Opsional: implementasi C dari paket pyahocorasick, jauh lebih cepat
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Satu bit per kategori pada kolom tag (uint64)
+MAX_CATEGORIES = 64
+
+
+class AhoCorasick:
+    """
+    Automaton Aho-Corasick murni Python. Setiap pola membawa bitmask;
+    match_mask(text) mengembalikan OR dari bitmask semua pola yang muncul
+    di text, dengan satu kali lintasan per karakter berapa pun jumlah polanya.
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [0]
+
+        for pattern, mask in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(0)
+                state = next_state
+            self.output[state] |= mask
+
+        # Link kegagalan dibangun secara BFS; output sebuah state mewarisi
+        # output dari state kegagalannya (pola yang merupakan akhiran).
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] |= self.output[self.fail[next_state]]
+
+    def match_mask(self, text):
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        mask = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            mask |= output[state]
+        return mask
+
+
+class _PyAhoCorasick:
+    """Pembungkus pyahocorasick dengan antarmuka yang sama seperti AhoCorasick."""
+
+    def __init__(self, patterns):
+        self.automaton = ahocorasick.Automaton()
+        for pattern, mask in patterns.items():
+            self.automaton.add_word(pattern, mask)
+        self.automaton.make_automaton()
+
+    def match_mask(self, text):
+        mask = 0
+        for _, pattern_mask in self.automaton.iter(text):
+            mask |= pattern_mask
+        return mask
+
+
+class KeywordTagger:
+    """
+    Mengompilasi semua kamus kata kunci ({grup: {kategori: [kata kunci]}})
+    menjadi satu automaton, lalu menandai setiap pesan dengan semua kategori
+    yang cocok sebagai bitmask uint64 dalam satu kali lintasan.
+
+    Kata kunci dinormalisasi dengan normalize_text saat dikompilasi, jadi
+    pesan yang ditandai juga harus sudah dinormalisasi (kolom 'Message_norm').
+
+    Urutan kategori di dalam grup dipertahankan sebagai urutan prioritas
+    (lihat count_first dan first_label).
+    """
+
+    def __init__(self, dictionaries):
+        self.groups = {}
+        patterns = {}
+        bit = 0
+        for group, categories in dictionaries.items():
+            self.groups[group] = []
+            for label, keywords in categories.items():
+                if bit >= MAX_CATEGORIES:
+                    raise ValueError(f"Jumlah kategori kata kunci melebihi {MAX_CATEGORIES}.")
+                self.groups[group].append((label, 1 << bit))
+                for keyword in keywords:
+                    keyword = normalize_text(keyword)
+                    patterns[keyword] = patterns.get(keyword, 0) | (1 << bit)
+                bit += 1
+
+        self.automaton = (_PyAhoCorasick if ahocorasick is not None else AhoCorasick)(patterns)
+
+    def tag(self, messages):
+        """Mengembalikan array uint64 berisi bitmask kategori untuk setiap pesan ternormalisasi."""
+        match_mask = self.automaton.match_mask
+        return np.fromiter(
+            (match_mask(message) if isinstance(message, str) else 0 for message in messages),
+            dtype=np.uint64,
+            count=len(messages),
+        )
+
+    def group_mask(self, group):
+        mask = 0
+        for _, bit in self.groups[group]:
+            mask |= bit
+        return mask
+
+    def matches(self, tags, group, label=None):
+        """Array boolean: pesan yang cocok dengan kategori label (atau grup mana pun)."""
+        if label is None:
+            mask = self.group_mask(group)
+        else:
+            mask = dict(self.groups[group])[label]
+        return (np.asarray(tags, dtype=np.uint64) & np.uint64(mask)) != 0
+
+    def count(self, tags, group):
+        """Jumlah pesan per kategori; satu pesan bisa terhitung di beberapa kategori."""
+        tags = np.asarray(tags, dtype=np.uint64)
+        return {label: int(((tags & np.uint64(bit)) != 0).sum()) for label, bit in self.groups[group]}
+
+    def count_first(self, tags, group):
+        """Jumlah pesan per kategori; setiap pesan hanya masuk kategori pertama yang cocok."""
+        tags = np.asarray(tags, dtype=np.uint64)
+        counts = {}
+        seen = np.zeros(len(tags), dtype=bool)
+        for label, bit in self.groups[group]:
+            hit = ((tags & np.uint64(bit)) != 0) & ~seen
+            counts[label] = int(hit.sum())
+            seen |= hit
+        return counts
+
+    def first_label(self, mask, group):
+        """Kategori pertama (berdasarkan prioritas) dalam grup yang ada di mask, atau None."""
+        mask = int(mask)
+        for label, bit in self.groups[group]:
+            if mask & bit:
+                return label
+        return None
+
+
+def tag_frame(df, tagger, column='Message_norm'):
+    """Menambahkan kolom 'Tags' berisi bitmask kategori kata kunci."""
+    return df.assign(Tags=pd.Series(tagger.tag(df[column]), index=df.index))
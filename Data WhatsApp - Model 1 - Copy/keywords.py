@@ -0,0 +1,60 @@
+# Kamus kata kunci untuk semua analisis berbasis kata kunci.
+# Semua kamus dikompilasi sekali menjadi satu automaton (keyword_matcher.py).
+# Kata kunci dan pesan sama-sama dinormalisasi (text_normalizer.py), jadi
+# varian hamza/taa marbuta/alef maqsura dan harakat tidak perlu ditulis ulang,
+# dan kata kunci yang mengandung kata kunci lain (mis. 'الطبيعي' dan 'طبيعي')
+# cukup ditulis yang terpendek. Urutan kategori di dalam setiap kamus adalah
+# urutan prioritas untuk analisis "satu kategori per pesan".
+
+# Grafik 5: Jenis gaharu yang dicari
+GAHARU_KEYWORDS = {
+    'Scented Bakhoor (بخور معطر)': ['بخور معطر'],
+    'Natural (طبيعي)': ['طبيعي'],
+    'Enhanced (محسن)': ['محسن'],
+    'Artificial (صناعي)': ['صناعي'],
+    'Sumatra (سومطرة)': ['سومطرة', 'sumatra'],
+    'Kalimantan (كاليمانتان)': ['كاليمانتان', 'kalimantan'],
+    'Merauke (ميروكي)': ['ميروكي', 'merauke']
+}
+
+# Grafik 6: Pertanyaan umum dari pelanggan
+QUESTION_KEYWORDS = {
+    'Tanya Harga (كم سعر)': ['كم سعر', 'كم السعر', 'الأسعار', 'كم عر'],
+    'Tanya Detail Produk (تفاصيل)': ['تفاصيل', 'ايش العروض', 'ماهي الاعواد', 'اي نوع', 'ما هو النوع'],
+    'Tanya Ketersediaan (هل متوفر)': ['هل يوجد', 'هل عندكم', 'متوفر'],
+    'Minta Gambar/Katalog (صور)': ['صور', 'العرض', 'كاتلوج'],
+    'Tanya Lokasi/Pengiriman (المكان فين)': ['المكان فين', 'كيف نوصل', 'كيف ترسل']
+}
+
+# Grafik 7: Konteks terakhir chat yang tidak dibalas (urutan penting, dari spesifik ke umum)
+DROP_OFF_KEYWORDS = {
+    'Follow-up (Tidak Dibalas)': ['متابعة بسيطة'],
+    'Diskusi Harga': ['سعر', 'أسعار', 'price', 'كم جراما', 'ريال'],
+    'Ajakan Meeting/Call': ['اتصال', 'gmeet', 'meet.google.com', 'اجتماع', 'رابط'],
+    'Permintaan Alamat/Info Pengiriman': ['الاسم الكامل', 'الدولة والمدينة', 'عنوان', 'شحن', 'الرمز البريدي', 'بيانات'],
+    'Diskusi Sampel': ['عينة', 'sample'],
+    'Diskusi Detail Produk': ['محسن', 'طبيعي', 'صناعي', 'سومطرة', 'كاليمانتان', 'ميروكي', 'نوع', 'تفاصيل']
+}
+
+# Grafik 9: Tahapan corong konversi (tahap 1 adalah semua percakapan)
+FUNNEL_KEYWORDS = {
+    '2. Diskusi Lanjut (Harga/Jenis)': ['سعر', 'كم', 'نوع', 'تفاصيل', 'محسن', 'طبيعي', 'صناعي', 'price', 'عينة', 'sample', 'شحن', 'ارسال', 'أسعار'],
+    '3. Potensi Konversi (Kirim Alamat)': ['لتجهيز طلبك', 'الاسم الكامل', 'الدولة والمدينة', 'عنوان', 'بيانات']
+}
+
+# Grafik 10: Lokasi pelanggan
+LOCATION_KEYWORDS = {
+    'Riyadh (رياض)': ['رياض'],
+    'Jeddah (جدة)': ['جدة'],
+    'Makkah (مكة)': ['مكة'],
+    'Tabuk (تبوك)': ['تبوك'],
+    'Kuwait (الكويت)': ['الكويت', 'kuwait'],
+}
+
+KEYWORD_DICTIONARIES = {
+    'gaharu': GAHARU_KEYWORDS,
+    'question': QUESTION_KEYWORDS,
+    'drop_off': DROP_OFF_KEYWORDS,
+    'funnel': FUNNEL_KEYWORDS,
+    'location': LOCATION_KEYWORDS,
+}
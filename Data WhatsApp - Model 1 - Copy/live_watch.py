@@ -0,0 +1,403 @@
+import os
+import json
+import time
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from analysis import RESPONSE_BIN_EDGES, most_common_senders
+from chat_parser import list_chat_files, parse_bytes
+from conversation_turns import seller_mask
+from dedup import contact_identity, duplicate_chat_files
+from exporters import export_table
+from keyword_matcher import KeywordTagger, tag_frame
+from keywords import KEYWORD_DICTIONARIES
+from time_series import DAY_NAMES
+
+try:
+    # Opsional: notifikasi perubahan folder dari sistem operasi (inotify di
+    # Linux), sehingga pesan baru diproses tanpa menunggu interval polling
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+
+# Jumlah pesan terakhir per percakapan untuk konteks penyebab tidak dibalas (Grafik 7)
+TAIL_SIZE = 5
+# Jumlah byte awal header terakhir yang disimpan untuk memastikan file hanya ditambah
+HEAD_CHECK_BYTES = 16
+SNAPSHOT_NAME = 'live_metrics.json'
+# Baris terakhir tanpa newline dianggap selesai ditulis setelah file diam selama ini
+SETTLE_NS = 1_000_000_000
+
+
+@dataclass
+class FileState:
+    """
+    Posisi baca satu file ekspor. Parsing dilanjutkan dari offset (header
+    pesan terakhir), karena pesan terakhir masih bisa bertambah baris lanjutan.
+    """
+    conversation: str
+    offset: int = 0
+    read_end: int = 0
+    size: int = 0
+    mtime_ns: int = 0
+    head: bytes = b''
+    tail_pending: bool = False
+    tail_hash: int = None
+    tail_counted: bool = False
+
+
+@dataclass
+class ConversationState:
+    # Jumlah kemunculan setiap pesan (hash) per file, untuk membuang salinan
+    # dari ekspor yang tumpang tindih seperti merge_conversations
+    files: dict = field(default_factory=dict)
+    last_is_seller: bool = None
+    last_timestamp: np.datetime64 = None
+    first_response: float = None
+    tail_tags: deque = field(default_factory=lambda: deque(maxlen=TAIL_SIZE))
+
+
+class LiveMetrics:
+    """
+    Agregat berjalan yang diperbarui per pesan baru, tanpa menghitung ulang
+    seluruh data: jumlah pesan per pengirim, jam, hari dan tanggal (pembeli
+    saja), histogram waktu respons pertama, tahapan funnel dan percakapan
+    yang belum dibalas pembeli.
+
+    Pesan diasumsikan tiba berurutan waktu per percakapan (ekspor yang
+    ditambah di akhir); pesan yang lebih lama dari pesan terakhir yang sudah
+    diproses tetap dihitung, tetapi tidak mengubah giliran bicara.
+    """
+
+    def __init__(self, seller, tagger):
+        self.seller = seller
+        self.tagger = tagger
+        self.discussion_bit = np.uint64(dict(tagger.groups['funnel'])['2. Diskusi Lanjut (Harga/Jenis)'])
+        self.order_form_bit = np.uint64(dict(tagger.groups['funnel'])['3. Potensi Konversi (Kirim Alamat)'])
+        self.reset()
+
+    def reset(self):
+        self.conversations = {}
+        self.sender_counts = Counter()
+        self.hour_counts = np.zeros(24, dtype=np.int64)
+        self.weekday_counts = np.zeros(7, dtype=np.int64)
+        self.date_counts = Counter()
+        self.response_counts = np.zeros(len(RESPONSE_BIN_EDGES) - 1, dtype=np.int64)
+        self.response_total = 0.0
+        self.discussion = set()
+        self.order_form = set()
+        self.unreplied = set()
+
+    def _count(self, rows, mask, sign=1):
+        """Menambah (sign=1) atau mengurangi (sign=-1) hitungan pembeli untuk baris mask."""
+        mask = mask & ~rows['Is_seller'].to_numpy()
+        if not mask.any():
+            return
+        timestamps = rows['Timestamp'][mask]
+        np.add.at(self.hour_counts, timestamps.dt.hour.to_numpy(), sign)
+        np.add.at(self.weekday_counts, timestamps.dt.dayofweek.to_numpy(), sign)
+        for key, n in Counter(rows['Sender'][mask]).items():
+            self.sender_counts[key] += sign * n
+        for key, n in Counter(timestamps.dt.strftime('%Y-%m-%d')).items():
+            self.date_counts[key] += sign * n
+
+    def _is_new(self, conversation, filename, row_hash):
+        """Mencatat satu kemunculan pesan; False jika pesan ini salinan dari file lain."""
+        counts = conversation.files.setdefault(filename, Counter())
+        counts[row_hash] += 1
+        other = max((c[row_hash] for name, c in conversation.files.items() if name != filename), default=0)
+        return counts[row_hash] > other
+
+    def _tag(self, key, is_seller, tags):
+        if tags & self.discussion_bit:
+            self.discussion.add(key)
+        if is_seller and tags & self.order_form_bit:
+            self.order_form.add(key)
+
+    def _advance(self, key, conversation, is_seller, timestamp, tags):
+        """Memperbarui funnel, giliran bicara, waktu respons dan konteks akhir percakapan."""
+        self._tag(key, is_seller, tags)
+        if conversation.last_timestamp is not None and timestamp < conversation.last_timestamp:
+            return
+
+        if is_seller and conversation.last_is_seller is False and conversation.first_response is None:
+            # Balasan penjual atas pesan pembeli; hanya yang pertama dengan waktu > 0
+            minutes = (timestamp - conversation.last_timestamp) / np.timedelta64(1, 'm')
+            if minutes > 0:
+                conversation.first_response = minutes
+                if minutes < RESPONSE_BIN_EDGES[-1]:
+                    self.response_counts[np.searchsorted(RESPONSE_BIN_EDGES, minutes, side='right') - 1] += 1
+                    self.response_total += minutes
+
+        conversation.last_is_seller = bool(is_seller)
+        conversation.last_timestamp = timestamp
+        conversation.tail_tags.append(int(tags))
+        if is_seller:
+            self.unreplied.add(key)
+        else:
+            self.unreplied.discard(key)
+
+    def apply(self, key, filename, rows, retry_tail=None):
+        """
+        Menerapkan pesan baru (DataFrame dengan kolom Tags dan Is_seller) dari
+        satu file. retry_tail=(hash, terhitung) berarti baris pertama adalah
+        pesan terakhir sebelumnya yang di-parsing ulang karena mungkin bertambah
+        baris lanjutan. Mengembalikan (hash, terhitung) untuk baris terakhir.
+        """
+        if not len(rows):
+            return None, False
+
+        conversation = self.conversations.setdefault(key, ConversationState())
+        row_hashes = pd.util.hash_pandas_object(rows[['Timestamp', 'Sender', 'Message']], index=False).to_numpy()
+        is_seller = rows['Is_seller'].to_numpy()
+        timestamps = rows['Timestamp'].to_numpy()
+        tags = rows['Tags'].to_numpy()
+        counted = np.zeros(len(rows), dtype=bool)
+        # +1 untuk baris yang baru dihitung, -1 untuk baris yang ditarik kembali
+        delta = np.zeros(len(rows), dtype=np.int8)
+
+        first = 0
+        if retry_tail is not None:
+            old_hash, was_counted = retry_tail
+            conversation.files[filename][old_hash] -= 1
+            counted[0] = self._is_new(conversation, filename, row_hashes[0])
+            if counted[0] and was_counted:
+                # Pesan yang sama dengan teks lebih panjang: pengirim dan
+                # waktunya tetap, hanya tag yang bisa bertambah
+                self._tag(key, is_seller[0], tags[0])
+                if conversation.tail_tags:
+                    conversation.tail_tags[-1] |= int(tags[0])
+            elif counted[0]:
+                self._advance(key, conversation, is_seller[0], timestamps[0], tags[0])
+            delta[0] = int(counted[0]) - int(was_counted)
+            first = 1
+
+        for i in range(first, len(rows)):
+            counted[i] = self._is_new(conversation, filename, row_hashes[i])
+            if counted[i]:
+                self._advance(key, conversation, is_seller[i], timestamps[i], tags[i])
+                delta[i] = 1
+
+        self._count(rows, delta > 0)
+        self._count(rows, delta < 0, sign=-1)
+        return row_hashes[-1], bool(counted[-1])
+
+    def snapshot(self):
+        """Ringkasan agregat saat ini sebagai dict yang bisa ditulis ke JSON."""
+        drop_off = Counter(
+            self.tagger.first_label(np.bitwise_or.reduce(list(self.conversations[key].tail_tags)), 'drop_off')
+            or 'Lain-lain / Minat Awal Rendah'
+            for key in self.unreplied
+        )
+        responses = int(self.response_counts.sum())
+        return {
+            'messages': int(self.weekday_counts.sum()),
+            'top_10_senders': dict(most_common_senders(self.sender_counts)),
+            'hourly_activity': self.hour_counts.tolist(),
+            'daily_activity': dict(zip(DAY_NAMES, self.weekday_counts.tolist())),
+            'date_activity': {date: n for date, n in sorted(self.date_counts.items()) if n > 0},
+            'response_time_minutes': {
+                'bin_edges': RESPONSE_BIN_EDGES.tolist(),
+                'counts': self.response_counts.tolist(),
+                'mean': self.response_total / responses if responses else None,
+            },
+            'funnel': {
+                '1. Kontak Awal': len(self.conversations),
+                '2. Diskusi Lanjut (Harga/Jenis)': len(self.discussion),
+                '3. Potensi Konversi (Kirim Alamat)': len(self.order_form),
+            },
+            'unreplied': sorted(self.unreplied),
+            'drop_off': dict(drop_off.most_common()),
+        }
+
+
+class ChatWatcher:
+    """
+    Mengikuti folder ekspor chat: setiap scan hanya membaca byte baru dari
+    file yang berubah (mulai dari header pesan terakhir) dan meneruskan pesan
+    barunya ke LiveMetrics. Jika file dipotong, ditulis ulang dengan isi lain
+    atau dihapus, semua agregat dibangun ulang dari awal.
+
+    Seperti parse_whatsapp_chat, file yang isinya identik dengan file lain
+    dilewati (dicek saat ada file baru). Jika salinan atau file aslinya
+    kemudian berubah, isinya tidak lagi identik dan agregat dibangun ulang.
+    """
+
+    def __init__(self, folder_path, seller):
+        self.folder_path = folder_path
+        self.seller = seller
+        self.metrics = LiveMetrics(seller, KeywordTagger(KEYWORD_DICTIONARIES))
+        self.files = {}
+        # Nama file salinan -> (nama file yang dipertahankan, size, mtime_ns)
+        self.duplicates = {}
+
+    def _read(self, file_path, state, stat):
+        """Mem-parsing byte baru satu file; False jika file tidak lagi sekadar ditambah."""
+        filename = os.path.basename(file_path)
+        with open(file_path, 'rb') as f:
+            f.seek(state.offset)
+            data = f.read(stat.st_size - state.offset)
+        if not data.startswith(state.head):
+            return False
+
+        # Baris terakhir yang belum diakhiri newline mungkin masih ditulis
+        # (bisa terpotong di tengah karakter UTF-8); baru dibaca setelah file
+        # tidak diubah selama SETTLE_NS
+        if not data.endswith(b'\n') and time.time_ns() - stat.st_mtime_ns < SETTLE_NS:
+            data = data[:data.rfind(b'\n') + 1]
+        state.size, state.mtime_ns = stat.st_size, stat.st_mtime_ns
+        state.read_end = state.offset + len(data)
+        if not data:
+            return True
+
+        df, resume_offset, tail_rows = parse_bytes(data, filename)
+        df = tag_frame(df, self.metrics.tagger).assign(Is_seller=seller_mask(df['Sender'], self.seller))
+        retry_tail = (state.tail_hash, state.tail_counted) if state.tail_pending and len(df) else None
+        last_hash, last_counted = self.metrics.apply(state.conversation, filename, df, retry_tail)
+
+        state.offset += resume_offset
+        state.head = data[resume_offset:resume_offset + HEAD_CHECK_BYTES]
+        if len(df):
+            state.tail_pending = bool(tail_rows)
+            state.tail_hash, state.tail_counted = last_hash, last_counted
+        return True
+
+    def rebuild(self):
+        self.metrics.reset()
+        self.files = {}
+        self.duplicates = {}
+        self.scan()
+
+    def _find_duplicates(self, file_paths):
+        """Mencatat salinan di antara file_paths; False jika file yang sudah dibaca ternyata salinan."""
+        for file_path, keep in duplicate_chat_files(file_paths).items():
+            filename = os.path.basename(file_path)
+            if filename in self.files:
+                return False
+            if filename not in self.duplicates:
+                stat = os.stat(file_path)
+                self.duplicates[filename] = (os.path.basename(keep), stat.st_size, stat.st_mtime_ns)
+        return True
+
+    def scan(self):
+        """Memproses semua perubahan sejak scan terakhir; True jika ada pesan/berkas yang berubah."""
+        file_paths = list_chat_files(self.folder_path)
+        filenames = {os.path.basename(path) for path in file_paths}
+        known = set(self.files) | set(self.duplicates)
+        if known - filenames or (filenames - known and not self._find_duplicates(file_paths)):
+            self.rebuild()
+            return True
+
+        kept = {keep for keep, _, _ in self.duplicates.values()}
+        changed = False
+        for file_path in file_paths:
+            filename = os.path.basename(file_path)
+            stat = os.stat(file_path)
+            if filename in self.duplicates:
+                if self.duplicates[filename][1:] != (stat.st_size, stat.st_mtime_ns):
+                    self.rebuild()
+                    return True
+                continue
+            state = self.files.get(filename)
+            if state is None:
+                state = self.files[filename] = FileState(contact_identity(filename))
+            elif stat.st_size == state.read_end and stat.st_mtime_ns == state.mtime_ns:
+                continue
+            elif filename in kept:
+                # File asli dari salinan yang dilewati berubah: keduanya tidak identik lagi
+                self.rebuild()
+                return True
+            if stat.st_size < state.read_end or not self._read(file_path, state, stat):
+                self.rebuild()
+                return True
+            changed = True
+        return changed
+
+    def publish(self, output_folder, formats=('csv',)):
+        """Menulis ringkasan JSON dan tabel statistik (format sama dengan 'export')."""
+        os.makedirs(output_folder, exist_ok=True)
+        snapshot = self.metrics.snapshot()
+        snapshot_path = os.path.join(output_folder, SNAPSHOT_NAME)
+        with open(snapshot_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=1)
+        os.replace(snapshot_path + '.tmp', snapshot_path)
+
+        tables = {
+            'top_10_pengirim': pd.DataFrame(list(snapshot['top_10_senders'].items()), columns=['Pengirim', 'Jumlah Pesan']),
+            'aktivitas_harian': pd.DataFrame(list(snapshot['daily_activity'].items()), columns=['Hari', 'Jumlah Pesan']),
+            'aktivitas_per_tanggal': pd.DataFrame({
+                'Tanggal': pd.to_datetime(list(snapshot['date_activity'])),
+                'Jumlah Pesan': list(snapshot['date_activity'].values()),
+            }),
+        }
+        for fmt in formats:
+            for name, table in tables.items():
+                export_table(table, output_folder, name, fmt=fmt)
+        return snapshot
+
+
+def _start_observer(folder_path, wake):
+    """Memasang notifikasi perubahan folder (watchdog) jika tersedia."""
+    if Observer is None:
+        return None
+
+    class _Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            wake.set()
+
+    observer = Observer()
+    observer.schedule(_Handler(), folder_path, recursive=False)
+    observer.start()
+    return observer
+
+
+def watch(folder_path, seller, output_folder, formats=('csv',), debounce=2.0, poll_interval=0.5):
+    """
+    Mode pantau: memuat semua chat sekali, lalu memproses pesan baru begitu
+    file berubah (notifikasi watchdog, atau polling setiap poll_interval detik)
+    dan menerbitkan ulang hasil paling sering sekali setiap debounce detik.
+    Berhenti dengan Ctrl+C.
+    """
+    watcher = ChatWatcher(folder_path, seller)
+    started = time.perf_counter()
+    watcher.scan()
+    snapshot = watcher.publish(output_folder, formats)
+    print(f"Memantau '{folder_path}': {snapshot['messages']} pesan pembeli dimuat dalam "
+          f"{time.perf_counter() - started:.2f} detik; hasil di '{output_folder}'.")
+
+    wake = threading.Event()
+    observer = _start_observer(folder_path, wake)
+    print("Notifikasi folder aktif." if observer else f"Polling setiap {poll_interval} detik.",
+          "Tekan Ctrl+C untuk berhenti.")
+
+    dirty = False
+    last_publish = time.monotonic()
+    try:
+        while True:
+            # Dengan watchdog, scan dilakukan segera setelah ada event; polling
+            # tetap berjalan sebagai cadangan jika event terlewat
+            wake.wait(poll_interval if observer is None else max(poll_interval, debounce))
+            wake.clear()
+
+            started = time.perf_counter()
+            if watcher.scan():
+                dirty = True
+                print(f"- Pesan baru diproses dalam {(time.perf_counter() - started) * 1000:.0f} ms.")
+
+            if dirty and time.monotonic() - last_publish >= debounce:
+                watcher.publish(output_folder, formats)
+                dirty = False
+                last_publish = time.monotonic()
+    except KeyboardInterrupt:
+        if dirty:
+            watcher.publish(output_folder, formats)
+        print("\nMode pantau dihentikan.")
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
@@ -0,0 +1,372 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from chat_parser import list_chat_files, read_messages
+from conversation_turns import _group_starts
+from exporters import CHUNK_ROWS
+from text_normalizer import normalize_text
+
+# Store pesan terindeks untuk pertanyaan ad-hoc analis tanpa menjalankan ulang
+# pipeline: satu database SQLite berisi semua pesan (index pengirim,
+# percakapan, waktu), indeks full-text FTS5 trigram atas Message_norm, dan bitmask
+# kata kunci per pesan serta per percakapan (lihat KeywordTagger). Store
+# dibangun ulang hanya jika isi folder chat atau identitas penjual berubah.
+# Teks asli pesan tidak disalin ke store: setiap baris menyimpan file ekspor
+# dan posisi byte header-nya (kolom Offset hasil parser), dan teksnya dibaca
+# dari file hanya untuk baris hasil pencarian (lihat read_messages).
+
+STORE_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE categories ("Group" TEXT, Label TEXT, Bit INTEGER);
+CREATE TABLE messages (
+    id INTEGER PRIMARY KEY,
+    Timestamp INTEGER NOT NULL,
+    Sender TEXT,
+    Conversation TEXT,
+    Is_seller INTEGER,
+    File TEXT,
+    Offset INTEGER,
+    Message_norm TEXT,
+    Tags INTEGER
+);
+CREATE TABLE conversations (
+    Conversation TEXT PRIMARY KEY,
+    First_timestamp INTEGER,
+    Last_timestamp INTEGER,
+    Messages INTEGER,
+    Buyer_tags INTEGER
+);
+-- Trigram: kata kunci dicocokkan sebagai potongan teks seperti KeywordTagger
+-- ('سعر' juga menemukan 'السعر'), bukan sebagai token kata utuh. Isi indeks
+-- diambil dari messages.Message_norm, tidak disalin.
+CREATE VIRTUAL TABLE messages_fts USING fts5(Message_norm, content='messages', content_rowid='id', tokenize='trigram');
+"""
+
+INDEXES = """
+CREATE INDEX idx_messages_sender ON messages (Sender);
+CREATE INDEX idx_messages_conversation ON messages (Conversation, Timestamp);
+CREATE INDEX idx_messages_timestamp ON messages (Timestamp);
+"""
+
+RESULT_COLUMNS = ['Timestamp', 'Sender', 'Conversation', 'Is_seller', 'Message']
+# Kolom yang dibaca dari tabel messages; Message diambil dari File + Offset
+# Trigram hanya bisa menyaring kata minimal 3 karakter
+MIN_INDEXED_CHARS = 3
+# Di antara kata kunci boleh ada kata sandang 'ال' di awal kata berikutnya
+WORD_GAP = r'\s+(?:ال)?'
+STORED_COLUMNS = ['Timestamp', 'Sender', 'Conversation', 'Is_seller', 'File', 'Offset']
+
+
+def folder_fingerprint(folder_path):
+    """Sidik murah isi folder chat (nama, ukuran, mtime setiap file), tanpa membaca isinya."""
+    digest = hashlib.blake2b(digest_size=16)
+    for file_path in list_chat_files(folder_path):
+        stat = os.stat(file_path)
+        digest.update(f"{os.path.basename(file_path)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _seconds(timestamps):
+    """Timestamp (datetime64) sebagai detik int64, kunci index waktu di store."""
+    return np.asarray(timestamps, dtype='datetime64[s]').astype(np.int64)
+
+
+def _signed(tags):
+    # SQLite INTEGER bertanda 64-bit; bit ke-63 tetap utuh lewat view int64
+    return np.ascontiguousarray(tags, dtype=np.uint64).view(np.int64)
+
+
+def _conversation_tags(tagged):
+    """OR tag pesan pembeli, waktu awal/akhir dan jumlah pesan per percakapan."""
+    codes = tagged['Conversation'].cat.codes.to_numpy()
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    starts = np.flatnonzero(_group_starts(codes))
+    seconds = _seconds(tagged['Timestamp'])[order]
+    buyer_tags = np.where(tagged['Is_seller'].to_numpy()[order], np.uint64(0), tagged['Tags'].to_numpy(dtype=np.uint64)[order])
+    return pd.DataFrame({
+        'Conversation': tagged['Conversation'].cat.categories[codes[starts]].astype(str),
+        'First_timestamp': np.minimum.reduceat(seconds, starts),
+        'Last_timestamp': np.maximum.reduceat(seconds, starts),
+        'Messages': np.diff(np.append(starts, len(codes))),
+        'Buyer_tags': _signed(np.bitwise_or.reduceat(buyer_tags, starts)),
+    })
+
+
+def build_store(analysis, path, folder_path, fingerprint=None, chunk_rows=CHUNK_ROWS):
+    """
+    Menulis semua pesan analysis (dengan tag kata kuncinya) ke store SQLite di
+    path. folder_path adalah folder file ekspor asal analysis, tempat teks
+    pesan dibaca saat pencarian. Ditulis ke file sementara lalu diganti sekaligus, agar pembaca tidak
+    pernah melihat store setengah jadi.
+    """
+    tagged = analysis.tagged
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.executescript(SCHEMA)
+        connection.executemany(
+            'INSERT INTO categories VALUES (?, ?, ?)',
+            [(group, label, bit) for group, labels in analysis.tagger.groups.items() for label, bit in labels],
+        )
+        seller = analysis.seller if isinstance(analysis.seller, str) else list(analysis.seller)
+        connection.executemany('INSERT INTO meta VALUES (?, ?)', [
+            ('version', str(STORE_VERSION)),
+            ('seller', json.dumps(seller, ensure_ascii=False)),
+            ('fingerprint', fingerprint or ''),
+            ('folder', os.path.abspath(folder_path)),
+            ('rows', str(len(tagged))),
+        ])
+
+        for start in range(0, len(tagged), chunk_rows):
+            chunk = tagged.iloc[start:start + chunk_rows]
+            ids = np.arange(start, start + len(chunk)).tolist()
+            connection.executemany('INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', zip(
+                ids,
+                _seconds(chunk['Timestamp']).tolist(),
+                chunk['Sender'].astype(str).tolist(),
+                chunk['Conversation'].astype(str).tolist(),
+                chunk['Is_seller'].to_numpy(dtype=np.int64).tolist(),
+                chunk['Filename'].astype(str).tolist(),
+                chunk['Offset'].tolist(),
+                chunk['Message_norm'].tolist(),
+                _signed(chunk['Tags']).tolist(),
+            ))
+            connection.executemany(
+                'INSERT INTO messages_fts (rowid, Message_norm) VALUES (?, ?)',
+                zip(ids, chunk['Message_norm'].tolist()),
+            )
+
+        if len(tagged):
+            connection.executemany(
+                'INSERT INTO conversations VALUES (?, ?, ?, ?, ?)',
+                _conversation_tags(tagged).itertuples(index=False, name=None),
+            )
+        # Index dibuat setelah semua baris masuk: jauh lebih cepat daripada
+        # memperbarui index di setiap INSERT
+        connection.executescript(INDEXES)
+        connection.execute("INSERT INTO messages_fts (messages_fts) VALUES ('optimize')")
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def match_query(keyword):
+    """
+    Kata kunci sebagai (query FTS5, pola regex) dengan arti yang sama seperti
+    KeywordTagger: dinormalisasi seperti Message_norm, lalu setiap kata dicari
+    sebagai potongan teks, berurutan, dipisah spasi dengan kata sandang 'ال'
+    opsional di depan kata berikutnya ('كم سعر' menemukan 'كم السعر').
+
+    Query FTS5 (trigram) hanya menyaring kandidat dari kata yang panjangnya
+    minimal MIN_INDEXED_CHARS (None jika tidak ada); pola regex memastikan
+    urutannya. Akhiran '*' diterima demi kompatibilitas dan tidak berpengaruh,
+    karena setiap kata memang sudah dicocokkan sebagai potongan teks.
+    """
+    words = normalize_text(keyword.rstrip('*')).split()
+    if not words:
+        raise ValueError(f"Kata kunci kosong: '{keyword}'")
+    indexed = ['"' + word.replace('"', '""') + '"' for word in words if len(word) >= MIN_INDEXED_CHARS]
+    pattern = WORD_GAP.join(re.escape(word) for word in words)
+    return (' AND '.join(indexed) or None), pattern
+
+
+@lru_cache(maxsize=64)
+def _compiled(pattern):
+    return re.compile(pattern)
+
+
+def _regexp(pattern, text):
+    """Fungsi REGEXP SQLite ('text REGEXP pattern')."""
+    return text is not None and _compiled(pattern).search(text) is not None
+
+
+class MessageStore:
+    """
+    Akses baca ke store pesan. Semua pencarian dijawab dari index SQLite
+    (waktu, pengirim, percakapan) dan FTS5, tanpa membaca ulang file chat.
+
+    Waktu dalam filter dan hasil adalah waktu lokal ekspor WhatsApp, seperti
+    kolom Timestamp hasil parser. Teks pesan hasil pencarian dibaca dari file
+    ekspor di folder asal store.
+    """
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Store pesan '{path}' tidak ditemukan.")
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.create_function('regexp', 2, _regexp, deterministic=True)
+        self.meta = dict(self.connection.execute('SELECT key, value FROM meta'))
+        self.folder_path = self.meta.get('folder')
+        self.categories = {}
+        for group, label, bit in self.connection.execute('SELECT "Group", Label, Bit FROM categories'):
+            self.categories.setdefault(group, []).append((label, bit))
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def is_current(self, folder_path, seller, fingerprint):
+        """True jika store dibangun dari folder, isi folder dan penjual yang sama."""
+        seller = seller if isinstance(seller, str) else list(seller)
+        return (
+            self.meta.get('version') == str(STORE_VERSION)
+            and self.folder_path == os.path.abspath(folder_path)
+            and self.meta.get('seller') == json.dumps(seller, ensure_ascii=False)
+            and self.meta.get('fingerprint') == fingerprint
+        )
+
+    def category_mask(self, group, labels):
+        """
+        Bitmask kategori grup (misal 'location') yang labelnya mengandung salah
+        satu teks di labels (tanpa beda huruf besar/kecil), misal 'riyadh'.
+        """
+        if isinstance(labels, str):
+            labels = [labels]
+        available = self.categories.get(group, [])
+        mask = 0
+        for wanted in labels:
+            hits = [bit for label, bit in available if wanted.lower() in label.lower()]
+            if not hits:
+                choices = ', '.join(label for label, _ in available)
+                raise ValueError(f"Kategori '{wanted}' tidak ada di grup '{group}' (pilihan: {choices})")
+            for bit in hits:
+                mask |= bit
+        return mask
+
+    def last_timestamp(self):
+        """Waktu pesan terbaru di store (acuan untuk 'N hari terakhir')."""
+        seconds = self.connection.execute('SELECT MAX(Timestamp) FROM messages').fetchone()[0]
+        return None if seconds is None else pd.Timestamp(seconds, unit='s')
+
+    def search(self, keyword=None, start=None, end=None, role=None, location=None,
+               conversation=None, limit=None):
+        """
+        Pesan yang cocok dengan semua filter yang diberikan, urut waktu:
+
+        keyword      : potongan teks di pesan (lihat match_query)
+        start, end   : rentang waktu [start, end)
+        role         : 'buyer' atau 'seller'
+        location     : label (atau potongan label) kategori lokasi; dicocokkan
+                       per percakapan, yaitu pembeli yang pernah menyebut lokasi
+                       itu di pesan mana pun dalam percakapannya
+        conversation : nama percakapan
+        """
+        clauses = []
+        params = []
+        source = 'messages AS m'
+        if keyword is not None:
+            fts_query, pattern = match_query(keyword)
+            if fts_query is not None:
+                source = 'messages_fts JOIN messages AS m ON m.id = messages_fts.rowid'
+                clauses.append('messages_fts MATCH ?')
+                params.append(fts_query)
+            clauses.append('m.Message_norm REGEXP ?')
+            params.append(pattern)
+        if start is not None:
+            clauses.append('m.Timestamp >= ?')
+            params.append(int(_seconds([pd.Timestamp(start)])[0]))
+        if end is not None:
+            clauses.append('m.Timestamp < ?')
+            params.append(int(_seconds([pd.Timestamp(end)])[0]))
+        if role is not None:
+            if role not in ('buyer', 'seller'):
+                raise ValueError(f"role harus 'buyer' atau 'seller': {role}")
+            clauses.append('m.Is_seller = ?')
+            params.append(int(role == 'seller'))
+        if location is not None:
+            clauses.append('m.Conversation IN (SELECT Conversation FROM conversations WHERE (Buyer_tags & ?) != 0)')
+            params.append(int(np.uint64(self.category_mask('location', location)).view(np.int64)))
+        if conversation is not None:
+            clauses.append('m.Conversation = ?')
+            params.append(conversation)
+
+        sql = f"SELECT {', '.join('m.' + column for column in STORED_COLUMNS)} FROM {source}"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY m.Timestamp, m.id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        return self._frame(self.connection.execute(sql, params).fetchall())
+
+    def between(self, start, end, role=None):
+        """Semua pesan dalam rentang waktu [start, end)."""
+        return self.search(start=start, end=end, role=role)
+
+    def conversation(self, name):
+        """Seluruh isi satu percakapan, urut waktu."""
+        return self.search(conversation=name)
+
+    def conversations(self, location=None):
+        """Ringkasan percakapan (awal, akhir, jumlah pesan), opsional per lokasi pembeli."""
+        sql = 'SELECT Conversation, First_timestamp, Last_timestamp, Messages FROM conversations'
+        params = []
+        if location is not None:
+            sql += ' WHERE (Buyer_tags & ?) != 0'
+            params.append(int(np.uint64(self.category_mask('location', location)).view(np.int64)))
+        df = pd.DataFrame(
+            self.connection.execute(sql + ' ORDER BY Last_timestamp DESC', params).fetchall(),
+            columns=['Conversation', 'First_timestamp', 'Last_timestamp', 'Messages'],
+        )
+        for column in ('First_timestamp', 'Last_timestamp'):
+            df[column] = pd.to_datetime(df[column], unit='s')
+        return df
+
+    def _frame(self, rows):
+        df = pd.DataFrame(rows, columns=STORED_COLUMNS)
+        df['Timestamp'] = pd.to_datetime(df['Timestamp'], unit='s')
+        df['Is_seller'] = df['Is_seller'].astype(bool)
+        # Teks hanya dibaca untuk baris hasil, satu kali buka file per file ekspor
+        messages = np.empty(len(df), dtype=object)
+        for filename, positions in df.groupby('File', sort=False).indices.items():
+            offsets = df['Offset'].to_numpy()[positions].tolist()
+            messages[positions] = read_messages(os.path.join(self.folder_path, filename), offsets)
+        df['Message'] = messages
+        return df[RESULT_COLUMNS]
+
+
+def open_store(path, folder_path, seller, build_analysis):
+    """
+    Membuka store di path, dan membangunnya ulang lebih dulu (lewat
+    build_analysis(), yang memakai cache ingest) hanya jika belum ada atau
+    isi folder / penjual berubah sejak store dibuat.
+    """
+    fingerprint = folder_fingerprint(folder_path)
+    if os.path.exists(path):
+        store = MessageStore(path)
+        if store.is_current(folder_path, seller, fingerprint):
+            return store
+        store.close()
+
+    analysis = build_analysis()
+    if analysis is None:
+        return None
+    started = time.perf_counter()
+    build_store(analysis, path, folder_path, fingerprint=fingerprint)
+    print(f"- Store pesan '{path}' dibangun ({len(analysis.df_full)} pesan, {time.perf_counter() - started:.1f} detik).")
+    return MessageStore(path)
@@ -0,0 +1,215 @@
+import os
+import html
+import base64
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+REPORT_FORMATS = ('png', 'svg', 'html', 'pdf')
+
+
+@dataclass
+class Chart:
+    """
+    Deskripsi satu grafik sebagai data biasa, agar bisa digambar di jendela
+    interaktif maupun dikirim ke proses worker untuk dirender ke file.
+
+    kind    : 'barh' (bar horizontal), 'line', 'hist' atau 'wordcloud'
+    values  : nilai sumbu-x untuk 'barh', sumbu-y untuk 'line', data mentah untuk
+              'hist', frekuensi kata untuk 'wordcloud'
+    labels  : label kategori ('barh'), nilai sumbu-x ('line') atau kata ('wordcloud')
+    options : pengaturan tambahan per jenis grafik, lihat draw_chart
+    """
+    name: str
+    kind: str
+    title: str
+    xlabel: str
+    ylabel: str
+    values: list
+    labels: list = None
+    figsize: tuple = (12, 8)
+    palette: str = None
+    color: str = None
+    options: dict = field(default_factory=dict)
+
+
+@lru_cache(maxsize=None)
+def reshape_label(label):
+    """Reshape label agar teks Arab tampil benar; hasilnya di-cache lintas grafik."""
+    import arabic_reshaper
+    from bidi.algorithm import get_display
+    return get_display(arabic_reshaper.reshape(label))
+
+
+def prepare_charts(charts):
+    """Reshape label Arab sekali di proses utama, sebelum grafik dibagi ke worker."""
+    return [
+        replace(chart, labels=[reshape_label(str(label)) for label in chart.labels])
+        if chart.options.get('reshape') else chart
+        for chart in charts
+    ]
+
+
+def _pyplot(backend=None):
+    import matplotlib
+    if backend is not None:
+        matplotlib.use(backend)
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def setup_style(plt, font_family):
+    import seaborn as sns
+    sns.set_style("whitegrid")
+    # Mengatur font yang mendukung karakter Arab untuk semua grafik.
+    plt.rcParams['font.family'] = font_family
+
+
+def draw_chart(chart, plt):
+    """Menggambar satu Chart pada figure baru dan mengembalikan figure tersebut."""
+    import seaborn as sns
+
+    fig = plt.figure(figsize=chart.figsize)
+    options = chart.options
+
+    if chart.kind == 'barh':
+        # Palette tanpa hue sudah deprecated di seaborn 0.13: warna per bar
+        # diberikan lewat hue = label itu sendiri, tanpa legend
+        hue = {'hue': chart.labels, 'legend': False} if chart.palette is not None else {}
+        ax = sns.barplot(x=chart.values, y=chart.labels, palette=chart.palette, **hue)
+        if options.get('annotate') == 'value':
+            # Menambahkan label angka di ujung setiap bar
+            for index, value in enumerate(chart.values):
+                plt.text(value, index, f' {value}', va='center', ha='left')
+        elif options.get('annotate') == 'percent':
+            # Label angka absolut dan persentase terhadap bar pertama
+            total = chart.values[0]
+            for index, value in enumerate(chart.values):
+                if total > 0:
+                    ax.text(value, index, f' {value} ({value / total * 100:.1f}%)', va='center', ha='left', fontsize=12)
+    elif chart.kind == 'line':
+        ax = plt.gca()
+        ax.plot(chart.labels, chart.values, marker=options.get('marker', 'o'), color=chart.color, label=options.get('label'))
+        # Garis tambahan dengan sumbu-x yang sama, misal {'Penjual': [...]}
+        for label, values in options.get('series', {}).items():
+            ax.plot(chart.labels, values, marker=options.get('marker', 'o'), label=label)
+        if 'series' in options:
+            plt.legend()
+        if 'xticks' in options:
+            ax.set_xticks(options['xticks'])
+        if 'xticklabels' in options:
+            ax.set_xticklabels(options['xticklabels'], rotation=45, ha='right')
+        plt.grid(True)
+    elif chart.kind == 'hist':
+        sns.histplot(chart.values, bins=options.get('bins', 'auto'), kde=options.get('kde', False), color=chart.color)
+        if options.get('mean_line') and chart.values:
+            mean = sum(chart.values) / len(chart.values)
+            plt.axvline(mean, color='red', linestyle='--', label=f"Rata-rata: {mean:.2f} {options['mean_line']}")
+            plt.legend()
+    elif chart.kind == 'wordcloud':
+        from wordcloud import WordCloud
+        # Label sudah di-reshape (prepare_charts), font harus memuat huruf Arab
+        cloud = WordCloud(
+            font_path=options['font_path'], width=1600, height=900, background_color='white',
+            colormap=chart.palette, collocations=False,
+        ).generate_from_frequencies(dict(zip(chart.labels, chart.values)))
+        plt.imshow(cloud, interpolation='bilinear')
+        plt.axis('off')
+    else:
+        raise ValueError(f"Jenis grafik tidak dikenal: {chart.kind}")
+
+    plt.title(chart.title, fontsize=16)
+    plt.xlabel(chart.xlabel, fontsize=12)
+    plt.ylabel(chart.ylabel, fontsize=12)
+    plt.tight_layout()
+    return fig
+
+
+def show_charts(charts, font_family='Arial'):
+    """Mode interaktif: menggambar semua grafik lalu menampilkannya di jendela."""
+    plt = _pyplot()
+    setup_style(plt, font_family)
+    for chart in prepare_charts(charts):
+        draw_chart(chart, plt)
+    plt.show()
+
+
+def _render_file(chart, path, font_family):
+    """Dijalankan di proses worker: merender satu grafik ke file dengan backend Agg."""
+    plt = _pyplot('Agg')
+    setup_style(plt, font_family)
+    fig = draw_chart(chart, plt)
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def _svg_data_uri(path):
+    with open(path, 'rb') as f:
+        return 'data:image/svg+xml;base64,' + base64.b64encode(f.read()).decode('ascii')
+
+
+def _write_html(charts, image_paths, html_path):
+    # SVG disematkan sebagai data URI, jadi laporan.html tetap lengkap walaupun
+    # dipindahkan atau dibagikan tanpa file grafiknya. Data URI (bukan markup
+    # <svg> langsung) agar id glyph/clip path antar grafik tidak bentrok.
+    sections = [
+        f"<section>\n<h2>{html.escape(chart.title)}</h2>\n"
+        f"<img src=\"{_svg_data_uri(path)}\" alt=\"{html.escape(chart.title)}\">\n</section>"
+        for chart, path in zip(charts, image_paths)
+    ]
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(
+            "<!DOCTYPE html>\n<html lang=\"id\">\n<head>\n<meta charset=\"utf-8\">\n"
+            "<title>Laporan Analisis WhatsApp</title>\n</head>\n<body>\n"
+            "<h1>Laporan Analisis WhatsApp</h1>\n" + "\n".join(sections) + "\n</body>\n</html>\n"
+        )
+
+
+def render_report(charts, output_dir, fmt='png', workers=None, font_family='Arial'):
+    """
+    Mode non-interaktif (backend Agg): merender semua grafik ke output_dir.
+
+    'png'/'svg' menghasilkan satu file per grafik yang dirender paralel di
+    proses worker; 'html' menambahkan laporan.html yang memuat semua grafik SVG
+    di dalam filenya sendiri;
+    'pdf' menghasilkan satu laporan.pdf (satu halaman per grafik, dirender
+    berurutan karena semua halaman ditulis ke file yang sama).
+    Mengembalikan daftar file yang ditulis.
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Format laporan tidak dikenal: {fmt} (pilihan: {', '.join(REPORT_FORMATS)})")
+
+    os.makedirs(output_dir, exist_ok=True)
+    charts = prepare_charts(charts)
+
+    if fmt == 'pdf':
+        plt = _pyplot('Agg')
+        from matplotlib.backends.backend_pdf import PdfPages
+        setup_style(plt, font_family)
+        pdf_path = os.path.join(output_dir, 'laporan.pdf')
+        with PdfPages(pdf_path) as pdf:
+            for chart in charts:
+                fig = draw_chart(chart, plt)
+                pdf.savefig(fig)
+                plt.close(fig)
+        return [pdf_path]
+
+    image_format = 'png' if fmt == 'png' else 'svg'
+    image_paths = [os.path.join(output_dir, f"{chart.name}.{image_format}") for chart in charts]
+
+    n_workers = min(workers or os.cpu_count() or 1, len(charts))
+    if n_workers <= 1:
+        for chart, path in zip(charts, image_paths):
+            _render_file(chart, path, font_family)
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(_render_file, charts, image_paths, repeat(font_family)))
+
+    if fmt == 'html':
+        html_path = os.path.join(output_dir, 'laporan.html')
+        _write_html(charts, image_paths, html_path)
+        return [html_path] + image_paths
+
+    return image_paths
@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from conversation_turns import _codes, _group_starts
+
+# Jeda tanpa pesan (menit) yang memulai sesi baru dalam satu percakapan
+DEFAULT_SESSION_GAP_MINUTES = 24 * 60
+
+FUNNEL_STAGES = ['1. Kontak Awal', '2. Diskusi Lanjut (Harga/Jenis)', '3. Potensi Konversi (Kirim Alamat)']
+# Penyebab untuk sesi yang tidak dibalas tanpa kata kunci konteks apa pun (seperti Grafik 7)
+DROP_OFF_OTHER = 'Lain-lain / Minat Awal Rendah'
+
+
+@dataclass
+class Sessions:
+    """
+    Sesi percakapan: bagian percakapan yang dipisahkan jeda lebih dari gap_minutes.
+
+    messages : turns.messages dengan kolom Session (id sesi global, urut)
+    table    : satu baris per sesi, diindeks Session, dengan kolom Conversation,
+               Session_index (urutan sesi dalam percakapan), Start, End,
+               Duration_minutes, Messages, Buyer_messages, Seller_messages,
+               First_response_minutes (balasan penjual pertama > 0 menit dalam
+               sesi), Drop_off (sesi diakhiri pesan penjual), Tail_tags (OR
+               tag tail_size pesan terakhir sesi), Drop_off_reason (kategori
+               drop_off pertama di Tail_tags, hanya untuk sesi Drop_off) dan
+               Funnel_stage
+    """
+    messages: pd.DataFrame
+    table: pd.DataFrame
+    gap_minutes: float
+
+
+def build_sessions(turn_messages, tagger=None, gap_minutes=DEFAULT_SESSION_GAP_MINUTES, tail_size=5):
+    """
+    Membagi setiap percakapan menjadi sesi dalam satu lintasan linear atas
+    turn_messages (ConversationTurns.messages, sudah terurut per Conversation,
+    Timestamp): sesi baru dimulai di awal percakapan atau setelah jeda
+    Latency_seconds > gap_minutes. Semua kolom tabel sesi dihitung dengan
+    reduceat per blok sesi, tanpa groupby atau pengurutan ulang.
+
+    Jika turn_messages punya kolom Tags dan tagger diberikan, tabel sesi juga
+    berisi Tail_tags, Drop_off_reason dan Funnel_stage.
+    """
+    n = len(turn_messages)
+    conversation = _codes(turn_messages['Conversation'])
+    is_seller = turn_messages['Is_seller'].to_numpy(dtype=bool)
+    latency = turn_messages['Latency_seconds'].to_numpy()
+    timestamps = turn_messages['Timestamp'].to_numpy()
+
+    # Jeda NaN (awal percakapan) dibandingkan sebagai False; awal percakapan
+    # sudah ditandai lewat _group_starts
+    conversation_start = _group_starts(conversation)
+    with np.errstate(invalid='ignore'):
+        session_start = conversation_start | (latency > gap_minutes * 60)
+    session = np.cumsum(session_start) - 1
+    starts = np.flatnonzero(session_start)
+    ends = np.append(starts[1:], n) - 1
+
+    seller_messages = np.add.reduceat(is_seller.astype(np.int64), starts) if n else np.zeros(0, dtype=np.int64)
+    messages = np.diff(np.append(starts, n))
+    # Nomor sesi dalam percakapan: posisi sesi dikurangi posisi sesi pertama percakapannya
+    first_session = np.maximum.accumulate(np.where(conversation_start[starts], np.arange(len(starts)), 0))
+
+    # Balasan penjual atas pesan pembeli di dalam sesi yang sama, > 0 detik
+    is_response = turn_messages['Turn_start'].to_numpy(dtype=bool) & ~session_start & is_seller & (latency > 0)
+    response_rows = np.flatnonzero(is_response)
+    first_response = np.full(len(starts), np.nan)
+    if len(response_rows):
+        first_rows = response_rows[_group_starts(session[response_rows])]
+        first_response[session[first_rows]] = latency[first_rows] / 60
+
+    table = pd.DataFrame({
+        'Conversation': turn_messages['Conversation'].iloc[starts].array,
+        'Session_index': np.arange(len(starts)) - first_session,
+        'Start': timestamps[starts],
+        'End': timestamps[ends],
+        'Duration_minutes': (timestamps[ends] - timestamps[starts]) / np.timedelta64(1, 'm'),
+        'Messages': messages,
+        'Buyer_messages': messages - seller_messages,
+        'Seller_messages': seller_messages,
+        'First_response_minutes': first_response,
+        'Drop_off': is_seller[ends] if n else np.zeros(0, dtype=bool),
+    }, index=pd.RangeIndex(len(starts), name='Session'))
+
+    if tagger is not None and 'Tags' in turn_messages and n:
+        tags = turn_messages['Tags'].to_numpy(dtype=np.uint64)
+        # tail_size pesan terakhir setiap sesi: jarak ke akhir sesinya < tail_size
+        tail = (ends[session] - np.arange(n)) < tail_size
+        tail_rows = np.flatnonzero(tail)
+        tail_tags = np.bitwise_or.reduceat(tags[tail_rows], np.flatnonzero(_group_starts(session[tail_rows])))
+        table['Tail_tags'] = tail_tags
+
+        # Kategori pertama (urutan prioritas) yang cocok, dipilih dari belakang
+        # agar kategori berprioritas tinggi menimpa yang rendah
+        drop_off = tagger.groups['drop_off']
+        reason = np.full(len(starts), len(drop_off))
+        for code in range(len(drop_off) - 1, -1, -1):
+            reason = np.where((tail_tags & np.uint64(drop_off[code][1])) != 0, code, reason)
+        table['Drop_off_reason'] = pd.Categorical.from_codes(
+            np.where(table['Drop_off'].to_numpy(), reason, -1),
+            categories=[label for label, _ in drop_off] + [DROP_OFF_OTHER],
+        )
+
+        funnel = dict(tagger.groups['funnel'])
+        session_tags = np.bitwise_or.reduceat(tags, starts)
+        seller_tags = np.bitwise_or.reduceat(np.where(is_seller, tags, np.uint64(0)), starts)
+        discussion = (session_tags & np.uint64(funnel[FUNNEL_STAGES[1]])) != 0
+        order_form = (seller_tags & np.uint64(funnel[FUNNEL_STAGES[2]])) != 0
+        table['Funnel_stage'] = pd.Categorical.from_codes(
+            np.where(order_form, 2, np.where(discussion, 1, 0)), categories=FUNNEL_STAGES, ordered=True,
+        )
+
+    return Sessions(turn_messages.assign(Session=session), table, gap_minutes)
@@ -0,0 +1,149 @@
+import os
+import argparse
+import random
+from datetime import datetime, timedelta
+
+# Generator ekspor chat WhatsApp sintetis untuk benchmark. Hasilnya
+# deterministik untuk seed yang sama, dengan format dan isi yang meniru
+# data-whatsapp: header "DD/MM/YY HH.MM - Pengirim: Pesan", teks Arab,
+# pesan multi-baris, baris sistem, nama kontak berupa nomor atau nama.
+
+SELLER = 'Nusa Restoria'
+SELLER_AGENTS = ['ابو عبد الله بومي العود', 'Monzer Abdal Galil Bumi Oud']
+
+SYSTEM_ENCRYPTION = (
+    'Pesan dan panggilan terenkripsi secara end-to-end. Hanya orang di chat ini yang bisa '
+    'membaca, mendengarkan, atau membagikannya. Pelajari selengkapnya.'
+)
+SYSTEM_AD = (
+    'Chat ini dimulai dari iklan di Facebook atau Instagram. Berbagi data aktivitas terkait '
+    'pelanggan dinyalakan. <b>Kelola</b>.'
+)
+SYSTEM_AD_REPLY = '‎{name} membalas iklan Facebook Anda. Ketuk untuk melihat iklan.'
+
+BUYER_OPENING = 'مرحبا! هل يمكنني الحصول على تفاصيل أكثر عن هذا؟'
+
+BUYER_MESSAGES = [
+    'كم السعر؟', 'كم سعر التولة', 'الأسعار لو سمحت', 'ابغى عود طبيعي', 'عندكم محسن؟',
+    'هل يوجد عود سومطرة', 'كاليمانتان متوفر؟', 'ابي صور', 'ارسل العرض', 'اي نوع افضل للبخور',
+    'انا من الرياض', 'في جدة', 'من مكة المكرمة', 'تبوك', 'انا في الكويت', 'كيف ترسل للسعودية',
+    'المكان فين', 'تمام', 'شكرا', 'السلام عليكم', 'وعليكم السلام', 'ابغى عينة', 'Hi', 'Price?',
+    'ok', '👍', 'ممتاز', 'بخور معطر موجود؟', 'ميروكي كم سعره', 'ان شاء الله',
+]
+
+SELLER_MESSAGES = [
+    'السلام عليكم ورحمة الله وبركاته\nحياكم الله شيخنا الفاضل 🌿\n\nسعداء جداً باهتمامكم بمنتجاتنا في بومي عود.',
+    'أي العود رغبت فيه شيخنا؟ المحسن أو الصناعي أو الطبيعي؟ 🌳',
+    'سيختلف سعره',
+    'السعر 250 ريال للتولة',
+    'تفضل هذه الصور',
+    'نوع سومطرة ممتاز للبخور',
+    'نرسل لكم عينة مجانا',
+    'ممكن اتصال سريع؟ هذا رابط الاجتماع meet.google.com/abc-defg-hij',
+    'لتجهيز طلبك نحتاج البيانات التالية:\nالاسم الكامل:\nالدولة والمدينة:\nالعنوان:\nالرمز البريدي:',
+    'الشحن خلال 7 أيام',
+    '🌿 متابعة بسيطة 🌿\nشيخنا الفاضل، فقط للتأكد أن رسالتنا وصلتكم.\n\nنحن جاهزون نساعدكم.',
+    'To help you choose the most suitable oud, may I know your name and city?',
+    'شكرا لكم',
+]
+
+BUYER_NAMES = ['ابو عبدالله', 'محمد', 'ناشط تجاري', 'القلب الأبيض', 'محمد عبدالسلام', 'ابو فهد', 'سالم']
+COUNTRY_CODES = ['+966', '+965', '+971', '+20', '+92']
+
+
+def _phone(rng):
+    code = rng.choice(COUNTRY_CODES)
+    return f"{code} {rng.randint(50, 59)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}"
+
+
+def _header(moment):
+    return moment.strftime('%d/%m/%y %H.%M')
+
+
+def split_messages(n_messages, n_conversations, rng):
+    """Membagi n_messages ke n_conversations dengan panjang percakapan bervariasi (minimal 1)."""
+    weights = [rng.lognormvariate(0, 1) for _ in range(n_conversations)]
+    spare = n_messages - n_conversations
+    total = sum(weights)
+    counts = [1 + int(spare * w / total) for w in weights]
+    for i in range(n_messages - sum(counts)):
+        counts[i % n_conversations] += 1
+    return counts
+
+
+def write_conversation(f, rng, n_messages, start, phone):
+    """Menulis satu percakapan (n_messages pesan, tanpa menghitung baris sistem) ke file f."""
+    moment = start
+    buyer = phone if rng.random() < 0.7 else f"~ {rng.choice(BUYER_NAMES)}"
+    f.write(f"{_header(moment)} - {SYSTEM_ENCRYPTION}\n")
+    f.write(f"{_header(moment)} - {buyer}: {BUYER_OPENING}\n")
+    if rng.random() < 0.6:
+        f.write(f"{_header(moment)} - {SYSTEM_AD}\n")
+    if rng.random() < 0.1:
+        f.write(f"{_header(moment)} - {SYSTEM_AD_REPLY.format(name=rng.choice(BUYER_NAMES))}\n")
+
+    seller_turn = True
+    for _ in range(n_messages - 1):
+        # Jeda antar pesan: kebanyakan beberapa menit, sesekali berjam-jam atau berhari-hari
+        gap = rng.expovariate(1 / 20)
+        if rng.random() < 0.05:
+            gap += rng.uniform(6 * 60, 3 * 24 * 60)
+        moment += timedelta(minutes=int(gap))
+        if seller_turn:
+            sender = SELLER if rng.random() < 0.85 else rng.choice(SELLER_AGENTS)
+            message = rng.choice(SELLER_MESSAGES)
+        else:
+            sender = buyer
+            message = rng.choice(BUYER_MESSAGES)
+            if rng.random() < 0.1:
+                message += '\n' + rng.choice(BUYER_MESSAGES)
+        f.write(f"{_header(moment)} - {sender}: {message}\n")
+        # Penjual cenderung mengirim beberapa pesan berturut-turut
+        seller_turn = rng.random() < (0.55 if seller_turn else 0.7)
+
+
+def generate_exports(folder_path, n_messages, n_conversations=None, seed=0,
+                     start=datetime(2025, 1, 1), span_days=240):
+    """
+    Menulis n_messages pesan dalam n_conversations file ekspor ke folder_path
+    (bawaan: rata-rata 15 pesan per percakapan, seperti data contoh).
+    Mengembalikan daftar file yang ditulis.
+    """
+    rng = random.Random(seed)
+    if n_conversations is None:
+        n_conversations = max(1, n_messages // 15)
+    n_conversations = min(n_conversations, n_messages)
+    os.makedirs(folder_path, exist_ok=True)
+
+    paths = []
+    seen = set()
+    for n in split_messages(n_messages, n_conversations, rng):
+        phone = _phone(rng)
+        while phone in seen:
+            phone = _phone(rng)
+        seen.add(phone)
+        # Sebagian ekspor memakai nama file ganda seperti hasil ekspor ulang
+        name = f"Chat WhatsApp dengan {phone}"
+        filename = f"{name}__{name}.txt" if rng.random() < 0.3 else f"{name}.txt"
+        start_moment = start + timedelta(minutes=rng.randrange(span_days * 24 * 60))
+        path = os.path.join(folder_path, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            write_conversation(f, rng, n, start_moment, phone)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Membuat ekspor chat WhatsApp sintetis untuk benchmark.')
+    parser.add_argument('folder', help='folder tujuan file .txt')
+    parser.add_argument('--messages', type=int, default=10_000, help='jumlah pesan (default: 10000)')
+    parser.add_argument('--conversations', type=int, default=None, help='jumlah percakapan (default: pesan / 15)')
+    parser.add_argument('--seed', type=int, default=0, help='seed acak; seed sama menghasilkan file sama')
+    args = parser.parse_args(argv)
+
+    paths = generate_exports(args.folder, args.messages, args.conversations, seed=args.seed)
+    print(f"{len(paths)} file ekspor ({args.messages} pesan) ditulis ke '{args.folder}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+import io
+import os
+import json
+from collections import Counter
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from analysis import Analysis, RESPONSE_BIN_EDGES, most_common_senders
+from chat_parser import parse_whatsapp_chat
+from exporters import export_table
+from sessionizer import DEFAULT_SESSION_GAP_MINUTES
+from time_series import DAY_NAMES
+
+try:
+    import resource
+except ImportError:
+    # Windows: batas memori per tenant tidak didukung
+    resource = None
+
+COMBINED_NAME = 'gabungan'
+SUMMARY_NAME = 'ringkasan_batch.json'
+# Subfolder cache ingest untuk tenant, terpisah dari cache mode satu penjual
+TENANT_CACHE_DIR = 'tenants'
+
+
+@dataclass
+class Tenant:
+    """
+    Satu akun penjual dengan arsip ekspornya sendiri.
+
+    seller : nama akun penjual, atau daftar nama jika satu toko dilayani
+             beberapa akun (misal admin-admin 'Bumi Oud')
+    cache  : folder cache ingest khusus tenant ini (None = tanpa cache)
+    session_gap_minutes : jeda tanpa pesan yang memulai sesi baru
+    """
+    name: str
+    seller: object
+    folder: str
+    cache: str = None
+    session_gap_minutes: float = DEFAULT_SESSION_GAP_MINUTES
+
+
+def _check_name(name):
+    """
+    Nama tenant dipakai sebagai nama folder hasil dan cache, jadi harus satu
+    komponen path biasa: bukan '.'/'..', tanpa pemisah folder, dan bukan nama
+    folder gabungan.
+    """
+    separators = {'/', '\\', os.sep, os.altsep} - {None}
+    if (not name.strip() or name in ('.', '..') or any(sep in name for sep in separators)
+            or not name.isprintable()):
+        raise ValueError(f"Nama tenant tidak bisa dipakai sebagai nama folder: {name!r} (atur 'name' tenant)")
+    if name.casefold() == COMBINED_NAME:
+        raise ValueError(f"Nama tenant '{name}' dipakai untuk folder hasil gabungan; pilih nama lain.")
+
+
+def parse_tenants(entries, cache_root=None, session_gap_minutes=DEFAULT_SESSION_GAP_MINUTES):
+    """
+    Membuat daftar Tenant dari konfigurasi: list dict berkunci 'seller',
+    'folder' dan opsional 'name', 'cache', 'session_gap_minutes'. Nama bawaan
+    adalah nama penjual (yang pertama jika berupa daftar); cache bawaan
+    cache_root/tenants/<nama>; jeda sesi bawaan session_gap_minutes.
+    """
+    tenants = []
+    for entry in entries:
+        unknown = set(entry) - {'name', 'seller', 'folder', 'cache', 'session_gap_minutes'}
+        if unknown or 'seller' not in entry or 'folder' not in entry:
+            raise ValueError(
+                f"Tenant harus berisi 'seller' dan 'folder' (opsional 'name', 'cache', 'session_gap_minutes'): {entry}"
+            )
+        seller = entry['seller']
+        name = entry.get('name') or (seller if isinstance(seller, str) else seller[0])
+        _check_name(name)
+        default_cache = os.path.join(cache_root, TENANT_CACHE_DIR, name) if cache_root is not None else None
+        tenants.append(Tenant(
+            name, seller, entry['folder'], entry.get('cache', default_cache),
+            entry.get('session_gap_minutes', session_gap_minutes),
+        ))
+
+    names = Counter(tenant.name for tenant in tenants)
+    duplicates = [name for name, n in names.items() if n > 1]
+    if duplicates:
+        raise ValueError(f"Nama tenant harus unik: {', '.join(duplicates)}")
+    return tenants
+
+
+def _limit_memory(memory_mb):
+    """Initializer worker: membatasi memori data (heap dan alokasi anonim) proses tenant (Linux/macOS)."""
+    if memory_mb is not None and resource is not None:
+        limit = int(memory_mb) * 2**20
+        resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+
+
+def summarize(analysis):
+    """
+    Agregat satu tenant yang kecil dan bisa dijumlahkan antar tenant: hitungan
+    per pengirim/jam/hari/tanggal pembeli, funnel, kata kunci, histogram waktu
+    respons pertama dan percakapan yang belum dibalas.
+    """
+    buyers = analysis.buyers
+    cube = analysis.cube
+    tagger = analysis.tagger
+    buyer_tags = analysis.tagged_buyers['Tags']
+    turns = analysis.turns
+
+    sender_counts = buyers['Sender'].value_counts()
+    response_minutes = turns.first_response['Response_minutes'].to_numpy()
+    response_minutes = response_minutes[response_minutes < RESPONSE_BIN_EDGES[-1]]
+    unreplied = turns.last_speaker.index[turns.last_speaker['Is_seller']]
+
+    return {
+        'messages': len(analysis.df_full),
+        'buyer_messages': len(buyers),
+        'conversations': int(analysis.df_full['Conversation'].nunique()),
+        'sender_counts': {str(sender): int(n) for sender, n in sender_counts[sender_counts > 0].items()},
+        'hourly_activity': cube.hourly('buyer').tolist(),
+        'daily_activity': cube.weekday('buyer').tolist(),
+        'date_activity': {
+            date.strftime('%Y-%m-%d'): int(n) for date, n in analysis.stats['date_activity'].items()
+        },
+        'funnel': {stage: int(n) for stage, n in analysis.funnel_counts.items()},
+        'gaharu': tagger.count(buyer_tags, 'gaharu'),
+        'question': tagger.count_first(buyer_tags, 'question'),
+        'location': tagger.count_first(buyer_tags, 'location'),
+        'response_time_minutes': {
+            'counts': np.histogram(response_minutes, bins=RESPONSE_BIN_EDGES)[0].tolist(),
+            'total': float(response_minutes.sum()),
+        },
+        'unreplied': sorted(map(str, unreplied)),
+    }
+
+
+def run_tenant(tenant, output_folder, formats=('csv',)):
+    """
+    Dijalankan di proses worker: parsing, analisis dan ekspor satu tenant
+    (ke output_folder/<nama tenant>), lalu mengembalikan ringkasannya saja
+    agar yang dikirim kembali ke proses utama tetap kecil.
+    """
+    # Parsing berurutan di dalam worker; paralelisme ada di tingkat tenant
+    df_full = parse_whatsapp_chat(tenant.folder, workers=1, cache_dir=tenant.cache)
+    if df_full.empty:
+        raise ValueError(f"Tidak ada pesan yang terbaca di '{tenant.folder}'.")
+
+    analysis = Analysis(df_full, tenant.seller, session_gap_minutes=tenant.session_gap_minutes)
+    with redirect_stdout(io.StringIO()):
+        analysis.export_tables(os.path.join(output_folder, tenant.name), formats=formats)
+    return summarize(analysis)
+
+
+def combine(summaries):
+    """Menjumlahkan ringkasan beberapa tenant menjadi satu ringkasan gabungan."""
+    combined = {
+        'messages': 0, 'buyer_messages': 0, 'conversations': 0,
+        'hourly_activity': np.zeros(24, dtype=np.int64), 'daily_activity': np.zeros(7, dtype=np.int64),
+        'response_time_minutes': {'counts': np.zeros(len(RESPONSE_BIN_EDGES) - 1, dtype=np.int64), 'total': 0.0},
+        'unreplied': [],
+    }
+    counters = {key: Counter() for key in ('sender_counts', 'date_activity', 'funnel', 'gaharu', 'question', 'location')}
+
+    for name, summary in summaries.items():
+        for key in ('messages', 'buyer_messages', 'conversations'):
+            combined[key] += summary[key]
+        for key in ('hourly_activity', 'daily_activity'):
+            combined[key] += summary[key]
+        combined['response_time_minutes']['counts'] += summary['response_time_minutes']['counts']
+        combined['response_time_minutes']['total'] += summary['response_time_minutes']['total']
+        # Percakapan diberi awalan nama tenant agar kontak yang sama di dua toko tidak tertukar
+        combined['unreplied'] += [f"{name}/{conversation}" for conversation in summary['unreplied']]
+        for key, counter in counters.items():
+            counter.update(summary[key])
+
+    for key in ('hourly_activity', 'daily_activity'):
+        combined[key] = combined[key].tolist()
+    combined['response_time_minutes']['counts'] = combined['response_time_minutes']['counts'].tolist()
+    combined.update({key: dict(counter) for key, counter in counters.items()})
+    combined['date_activity'] = dict(sorted(combined['date_activity'].items()))
+    return combined
+
+
+def _mean_response(summary):
+    responses = sum(summary['response_time_minutes']['counts'])
+    return summary['response_time_minutes']['total'] / responses if responses else None
+
+
+def export_summaries(summaries, combined, output_folder, formats=('csv',)):
+    """Menulis ringkasan per tenant dan gabungan ke output_folder/gabungan."""
+    folder = os.path.join(output_folder, COMBINED_NAME)
+    rows = []
+    for name, summary in list(summaries.items()) + [(COMBINED_NAME, combined)]:
+        rows.append({
+            'Tenant': name,
+            'Jumlah Pesan': summary['messages'],
+            'Pesan Pembeli': summary['buyer_messages'],
+            'Percakapan': summary['conversations'],
+            **summary['funnel'],
+            'Belum Dibalas': len(summary['unreplied']),
+            'Rata-rata Respons (Menit)': _mean_response(summary),
+        })
+
+    top_senders = most_common_senders(combined['sender_counts'])
+    tables = {
+        'ringkasan_tenant': pd.DataFrame(rows),
+        'top_10_pengirim': pd.DataFrame(top_senders, columns=['Pengirim', 'Jumlah Pesan']),
+        'aktivitas_harian': pd.DataFrame({'Hari': DAY_NAMES, 'Jumlah Pesan': combined['daily_activity']}),
+        'aktivitas_per_tanggal': pd.DataFrame({
+            'Tanggal': pd.to_datetime(list(combined['date_activity'])),
+            'Jumlah Pesan': list(combined['date_activity'].values()),
+        }),
+    }
+    for fmt in formats:
+        for name, table in tables.items():
+            export_table(table, folder, name, fmt=fmt)
+
+    summary_path = os.path.join(output_folder, SUMMARY_NAME)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump({'tenants': summaries, COMBINED_NAME: combined}, f, ensure_ascii=False, indent=1)
+    return summary_path
+
+
+def _run_shared(tenants, output_folder, formats, n_workers, memory_mb):
+    """Semua tenant di satu process pool; menghasilkan (tenant, future) saat selesai."""
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_limit_memory,
+                             initargs=(memory_mb,), max_tasks_per_child=1) as executor:
+        futures = {executor.submit(run_tenant, tenant, output_folder, formats): tenant for tenant in tenants}
+        for future in as_completed(futures):
+            yield futures[future], future
+
+
+def _run_isolated(tenants, output_folder, formats, n_workers, memory_mb):
+    """
+    Seperti _run_shared, tetapi setiap tenant di process pool-nya sendiri
+    (paling banyak n_workers sekaligus): proses yang mati mendadak hanya
+    menggagalkan tenant yang sedang dijalankannya.
+    """
+    pending = list(tenants)
+    running = {}
+    while pending or running:
+        while pending and len(running) < n_workers:
+            tenant = pending.pop(0)
+            executor = ProcessPoolExecutor(max_workers=1, initializer=_limit_memory, initargs=(memory_mb,))
+            running[executor.submit(run_tenant, tenant, output_folder, formats)] = (tenant, executor)
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            tenant, executor = running.pop(future)
+            executor.shutdown()
+            yield tenant, future
+
+
+def _collect(tenant, future, summaries, errors, memory_mb):
+    """Mencatat hasil satu tenant ke summaries atau errors dan mencetak statusnya."""
+    try:
+        summaries[tenant.name] = future.result()
+    except BrokenProcessPool:
+        errors[tenant.name] = "proses tenant berhenti mendadak (crash atau dihentikan sistem)"
+    except MemoryError:
+        errors[tenant.name] = f"melebihi batas memori {memory_mb} MB"
+    except Exception as error:
+        errors[tenant.name] = str(error)
+    if tenant.name in summaries:
+        print(f"- Tenant '{tenant.name}': {summaries[tenant.name]['messages']} pesan selesai dianalisis.")
+    else:
+        print(f"- Tenant '{tenant.name}' gagal: {errors[tenant.name]}")
+
+
+def run_batch(tenants, output_folder, formats=('csv',), workers=None, memory_mb=None):
+    """
+    Memproses semua tenant secara paralel (satu tenant per proses worker,
+    proses diganti setelah setiap tenant agar memorinya dikembalikan), lalu
+    menulis hasil per tenant dan gabungannya. memory_mb membatasi memori
+    setiap proses tenant; tenant yang melebihinya gagal tanpa menghentikan
+    tenant lain. Mengembalikan (ringkasan per tenant, error per tenant).
+
+    Jika sebuah proses worker mati mendadak (crash, dibunuh OOM killer),
+    seluruh pool rusak dan semua tenant yang belum selesai ikut gagal. Tenant
+    itu dijalankan ulang, masing-masing di proses tersendiri, sehingga hanya
+    tenant penyebabnya yang dilaporkan gagal.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    if memory_mb is not None and resource is None:
+        print("Peringatan: batas memori per tenant tidak didukung di sistem ini; diabaikan.")
+
+    summaries = {}
+    errors = {}
+    n_workers = max(1, min(workers or os.cpu_count() or 1, len(tenants)))
+    # Tenant yang belum selesai saat pool bersama rusak
+    unfinished = []
+    for tenant, future in _run_shared(tenants, output_folder, formats, n_workers, memory_mb):
+        if isinstance(future.exception(), BrokenProcessPool):
+            unfinished.append(tenant)
+        else:
+            _collect(tenant, future, summaries, errors, memory_mb)
+    if unfinished:
+        print(f"- Proses worker berhenti mendadak; {len(unfinished)} tenant dijalankan ulang di proses tersendiri.")
+        for tenant, future in _run_isolated(unfinished, output_folder, formats, n_workers, memory_mb):
+            _collect(tenant, future, summaries, errors, memory_mb)
+
+    # Urutan tenant mengikuti konfigurasi, bukan urutan selesai
+    summaries = {tenant.name: summaries[tenant.name] for tenant in tenants if tenant.name in summaries}
+    if summaries:
+        path = export_summaries(summaries, combine(summaries), output_folder, formats)
+        print(f"- Ringkasan per tenant dan gabungan disimpan ke '{path}' dan folder '{COMBINED_NAME}'.")
+    return summaries, errors
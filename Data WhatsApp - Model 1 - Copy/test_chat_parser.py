@@ -0,0 +1,151 @@
+import os
+import re
+
+import pandas as pd
+import pytest
+
+from chat_parser import list_chat_files, parse_bytes, parse_chat_files, read_messages
+from synthetic_chats import generate_exports
+from text_normalizer import normalize_text
+
+LINE_HEADER = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{2}) (\d{1,2})\.(\d{2}) - ")
+
+# Kasus tepi format ekspor, satu file per kasus
+EDGE_CASES = {
+    'multiline.txt': (
+        "01/08/25 10.00 - Pesan dan panggilan terenkripsi secara end-to-end.\n"
+        "baris lanjutan pesan sistem\n"
+        "01/08/25 10.01 - +966 50 000 0001: السلام عليكم\n"
+        "كم السعر؟\n"
+        "\n"
+        "ابغى عود طبيعي\n"
+        "01/08/25 10.05 - \u200eNusa Restoria: حياكم الله: تفضل\n"
+    ),
+    'no_trailing_newline.txt': (
+        "02/08/25 09.00 - +966 50 000 0002: مرحبا\n"
+        "02/08/25 09.01 - Nusa Restoria: أهلا بك"
+    ),
+    'partial_header.txt': (
+        "03/08/25 11.00 - +966 50 000 0003: عندكم محسن؟\n"
+        "03/08/25 11."
+    ),
+    'system_header_at_eof.txt': (
+        "04/08/25 12.00 - +966 50 000 0004: تمام\n"
+        "04/08/25 12.01 - "
+    ),
+    'crlf.txt': (
+        "05/08/25 13.00 - +966 50 000 0005: السعر\r\n"
+        "للتولة\r\n"
+        "05/08/25 13.02 - Nusa Restoria: 250 ريال\r\n"
+    ),
+    'invalid_date.txt': (
+        "31/02/25 14.00 - +966 50 000 0006: تاريخ غير صالح\n"
+        "06/08/25 14.01 - +966 50 000 0006: تاريخ صالح\n"
+    ),
+    'empty.txt': "",
+}
+
+
+def reference_parse(file_paths):
+    """
+    Parser acuan yang sengaja sederhana: membaca teks baris per baris, baris
+    tanpa header menjadi lanjutan pesan sebelumnya, header tanpa 'Pengirim: '
+    (baris sistem) dilewati beserta lanjutannya.
+    """
+    rows = []
+    for file_path in file_paths:
+        filename = os.path.basename(file_path)
+        with open(file_path, 'rb') as f:
+            lines = f.read().decode('utf-8').split('\n')
+        # (komponen header, pengirim, baris pesan); pengirim None untuk baris sistem
+        records = []
+        for line in lines:
+            header = LINE_HEADER.match(line)
+            if header is None:
+                if records:
+                    records[-1][2].append(line)
+                continue
+            sender, separator, message = line[header.end():].partition(': ')
+            if not separator:
+                records.append((header.groups(), None, []))
+            else:
+                sender = ''.join(c for c in sender if c.isprintable()).strip()
+                records.append((header.groups(), sender, [message]))
+        rows += [record + (filename,) for record in records if record[1] is not None]
+
+    df = pd.DataFrame({
+        'Timestamp': pd.to_datetime(
+            ['{}/{}/{} {}.{}'.format(*groups) for groups, _, _, _ in rows], format='%d/%m/%y %H.%M', errors='coerce'),
+        'Sender': [sender for _, sender, _, _ in rows],
+        'Message': ['\n'.join(lines).strip().replace('\r\n', '\n') for _, _, lines, _ in rows],
+        'Filename': [filename for _, _, _, filename in rows],
+    })
+    return df.dropna(subset=['Timestamp']).reset_index(drop=True)
+
+
+@pytest.fixture(scope='module')
+def edge_folder(tmp_path_factory):
+    folder = tmp_path_factory.mktemp('edge')
+    for filename, text in EDGE_CASES.items():
+        (folder / filename).write_bytes(text.encode('utf-8'))
+    return str(folder)
+
+
+@pytest.fixture(scope='module')
+def synthetic_folder(tmp_path_factory):
+    folder = str(tmp_path_factory.mktemp('synthetic'))
+    generate_exports(folder, 3000, seed=3)
+    return folder
+
+
+def assert_matches_reference(df, file_paths):
+    expected = reference_parse(file_paths)
+    pd.testing.assert_frame_equal(
+        df[['Timestamp', 'Sender', 'Message', 'Filename']].reset_index(drop=True), expected, check_dtype=False)
+    assert df['Message_norm'].tolist() == [normalize_text(message) for message in expected['Message']]
+
+
+def test_edge_cases_match_reference(edge_folder):
+    file_paths = list_chat_files(edge_folder)
+    df = parse_chat_files(file_paths, workers=1)
+    assert_matches_reference(df, file_paths)
+
+    messages = dict(zip(df['Filename'] + '|' + df['Sender'], df['Message']))
+    assert messages['multiline.txt|+966 50 000 0001'] == 'السلام عليكم\nكم السعر؟\n\nابغى عود طبيعي'
+    assert messages['multiline.txt|Nusa Restoria'] == 'حياكم الله: تفضل'
+    assert messages['no_trailing_newline.txt|Nusa Restoria'] == 'أهلا بك'
+    assert messages['partial_header.txt|+966 50 000 0003'] == 'عندكم محسن؟\n03/08/25 11.'
+    assert messages['crlf.txt|+966 50 000 0005'] == 'السعر\nللتولة'
+    assert 'تاريخ غير صالح' not in set(df['Message'])
+
+
+def test_synthetic_exports_match_reference(synthetic_folder):
+    file_paths = list_chat_files(synthetic_folder)
+    assert_matches_reference(parse_chat_files(file_paths, workers=1), file_paths)
+
+
+@pytest.mark.parametrize('fixture_name', ['edge_folder', 'synthetic_folder'])
+def test_parallel_parse_matches_reference(fixture_name, request, monkeypatch):
+    monkeypatch.setattr('chat_parser.MIN_BYTES_PER_WORKER', 1)
+    file_paths = list_chat_files(request.getfixturevalue(fixture_name))
+    assert_matches_reference(parse_chat_files(file_paths, workers=3), file_paths)
+
+
+def test_resumed_parse_matches_full_parse(edge_folder):
+    # Parsing dilanjutkan dari header terakhir, seperti saat file ditambah
+    with open(os.path.join(edge_folder, 'multiline.txt'), 'rb') as f:
+        data = f.read()
+    full, _, _ = parse_bytes(data, 'multiline.txt')
+    # Potong di tengah pesan multi-baris: pesan terakhir belum lengkap
+    head, tail_start, tail_rows = parse_bytes(data[:data.index('ابغى'.encode('utf-8'))], 'multiline.txt')
+    rest, _, _ = parse_bytes(data, 'multiline.txt', start=tail_start)
+    resumed = pd.concat([head.iloc[:len(head) - tail_rows], rest], ignore_index=True)
+    pd.testing.assert_frame_equal(resumed, full)
+
+
+def test_offsets_fetch_the_same_messages(edge_folder, synthetic_folder):
+    file_paths = list_chat_files(edge_folder) + list_chat_files(synthetic_folder)[:20]
+    df = parse_chat_files(file_paths, workers=1)
+    for file_path in file_paths:
+        rows = df[df['Filename'] == os.path.basename(file_path)]
+        assert read_messages(file_path, rows['Offset'].tolist()) == rows['Message'].tolist()
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chat_parser import parse_whatsapp_chat
+from conversation_turns import build_turns
+from keyword_matcher import KeywordTagger, tag_frame
+from keywords import KEYWORD_DICTIONARIES
+from synthetic_chats import SELLER, generate_exports
+
+
+@pytest.fixture(scope='module')
+def df_full(tmp_path_factory):
+    folder = str(tmp_path_factory.mktemp('chat'))
+    generate_exports(folder, 3000, seed=5)
+    df = parse_whatsapp_chat(folder, workers=1)
+    return tag_frame(df, KeywordTagger(KEYWORD_DICTIONARIES))
+
+
+def loop_conversations(df_full):
+    """Percakapan seperti loop lama: groupby lalu urut waktu (stabil, agar pesan semenit tetap berurutan)."""
+    for conversation, group in df_full.groupby('Conversation', observed=True):
+        yield conversation, group.sort_values('Timestamp', kind='stable')
+
+
+def loop_first_responses(df_full, seller):
+    """Waktu respons pertama (> 0 menit) per percakapan dengan iloc per baris, seperti Grafik 8 lama."""
+    responses = {}
+    for conversation, group in loop_conversations(df_full):
+        for i in range(len(group) - 1):
+            if group.iloc[i]['Sender'] != seller and group.iloc[i + 1]['Sender'] == seller:
+                time_diff = group.iloc[i + 1]['Timestamp'] - group.iloc[i]['Timestamp']
+                if time_diff.total_seconds() > 0:
+                    responses[conversation] = time_diff.total_seconds() / 60
+                    break
+    return responses
+
+
+def test_first_responses_match_row_loop(df_full):
+    turns = build_turns(df_full, SELLER)
+    expected = loop_first_responses(df_full, SELLER)
+    assert len(expected) > 0
+    assert turns.first_response['Response_minutes'].to_dict() == pytest.approx(expected)
+
+
+def test_unreplied_and_tail_tags_match_row_loop(df_full):
+    turns = build_turns(df_full, SELLER)
+    unreplied = set(turns.last_speaker.index[turns.last_speaker['Is_seller']])
+    expected_unreplied = set()
+    for conversation, group in loop_conversations(df_full):
+        if group.iloc[-1]['Sender'] == SELLER:
+            expected_unreplied.add(conversation)
+        tail = np.bitwise_or.reduce(group.tail(5)['Tags'].to_numpy(dtype=np.uint64))
+        assert turns.tail_tags[conversation] == tail
+    assert unreplied == expected_unreplied
+    assert len(unreplied) > 0
+
+
+def test_turns_number_speaker_changes():
+    df = pd.DataFrame({
+        'Timestamp': pd.to_datetime([
+            '2025-08-01 10:00', '2025-08-01 10:01', '2025-08-01 10:03', '2025-08-01 10:03', '2025-08-01 11:00',
+            '2025-08-02 09:00',
+        ]),
+        'Sender': ['Ali', 'Ali', SELLER, SELLER, 'Ali', SELLER],
+        'Conversation': ['ali', 'ali', 'ali', 'ali', 'ali', 'badr'],
+    })
+    turns = build_turns(df, SELLER)
+    assert turns.messages['Turn'].tolist() == [0, 0, 1, 1, 2, 3]
+    assert turns.responses['Response_minutes'].tolist() == [2.0]
+    assert turns.first_response['Response_minutes'].to_dict() == {'ali': 2.0}
+    assert turns.last_speaker['Is_seller'].to_dict() == {'ali': False, 'badr': True}
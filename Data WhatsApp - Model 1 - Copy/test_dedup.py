@@ -0,0 +1,91 @@
+import os
+from collections import Counter
+
+import pandas as pd
+
+from chat_parser import list_chat_files, parse_chat_files
+from dedup import contact_identity, duplicate_chat_files, merge_conversations, unique_chat_files
+
+CONTACT = '+966 53 490 8315'
+
+# Dua ekspor yang tumpang tindih dari kontak yang sama, dan satu kontak lain
+EXPORTS = {
+    f'Chat WhatsApp dengan {CONTACT}.txt': (
+        "01/08/25 10.00 - +966 53 490 8315: السلام عليكم\n"
+        "01/08/25 10.01 - +966 53 490 8315: تمام\n"
+        "01/08/25 10.01 - +966 53 490 8315: تمام\n"
+        "01/08/25 10.05 - Nusa Restoria: حياكم الله\n"
+    ),
+    f'Chat WhatsApp dengan {CONTACT}__Chat WhatsApp dengan {CONTACT}.txt': (
+        "01/08/25 10.01 - +966 53 490 8315: تمام\n"
+        "01/08/25 10.05 - Nusa Restoria: حياكم الله\n"
+        "02/08/25 09.00 - +966 53 490 8315: كم السعر؟\n"
+    ),
+    'Chat WhatsApp dengan Ahmad.txt': (
+        "01/08/25 11.00 - Ahmad: تمام\n"
+    ),
+}
+
+
+def write_exports(folder, exports):
+    os.makedirs(folder, exist_ok=True)
+    for filename, text in exports.items():
+        with open(os.path.join(folder, filename), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def reference_merge(df):
+    """
+    Penggabungan acuan dengan loop per baris: dalam satu percakapan, sebuah
+    pesan (Timestamp, Sender, Message) dipertahankan sebanyak kemunculan
+    terbanyaknya di salah satu file.
+    """
+    seen_in_file = Counter()
+    kept = Counter()
+    rows = []
+    for row in df.itertuples(index=False):
+        conversation = contact_identity(row.Filename)
+        key = (conversation, row.Timestamp, row.Sender, row.Message)
+        seen_in_file[(row.Filename,) + key] += 1
+        if seen_in_file[(row.Filename,) + key] > kept[key]:
+            kept[key] += 1
+            rows.append(row._asdict() | {'Conversation': conversation})
+    merged = pd.DataFrame(rows)
+    return merged.sort_values(['Conversation', 'Timestamp'], kind='stable').reset_index(drop=True)
+
+
+def test_contact_identity_normalizes_export_names():
+    assert contact_identity(f'Chat WhatsApp dengan {CONTACT}.txt') == '+966534908315'
+    assert contact_identity(f'Chat WhatsApp dengan {CONTACT}__Chat WhatsApp dengan {CONTACT}.txt') == '+966534908315'
+    assert contact_identity('Chat WhatsApp dengan \u200eAhmad  Ali.txt') == 'Ahmad Ali'
+
+
+def test_identical_copies_keep_the_plain_name(tmp_path):
+    folder = str(tmp_path)
+    text = EXPORTS[f'Chat WhatsApp dengan {CONTACT}.txt']
+    write_exports(folder, {
+        f'Chat WhatsApp dengan {CONTACT}.txt': text,
+        f'Chat WhatsApp dengan {CONTACT}__Chat WhatsApp dengan {CONTACT}.txt': text,
+        'Chat WhatsApp dengan Ahmad.txt': EXPORTS['Chat WhatsApp dengan Ahmad.txt'],
+    })
+    file_paths = list_chat_files(folder)
+    plain = os.path.join(folder, f'Chat WhatsApp dengan {CONTACT}.txt')
+
+    assert duplicate_chat_files(file_paths) == {
+        os.path.join(folder, f'Chat WhatsApp dengan {CONTACT}__Chat WhatsApp dengan {CONTACT}.txt'): plain,
+    }
+    assert plain in unique_chat_files(file_paths)
+
+
+def test_overlapping_exports_merge_like_row_loop(tmp_path):
+    folder = str(tmp_path)
+    write_exports(folder, EXPORTS)
+    df = parse_chat_files(list_chat_files(folder), workers=1)
+
+    merged = merge_conversations(df)
+    expected = reference_merge(df)
+    pd.testing.assert_frame_equal(merged[expected.columns], expected, check_dtype=False)
+
+    conversation = merged[merged['Conversation'] == '+966534908315']
+    # 'تمام' dua kali di satu file dan sekali di file lain: tetap dua
+    assert conversation['Message'].tolist() == ['السلام عليكم', 'تمام', 'تمام', 'حياكم الله', 'كم السعر؟']
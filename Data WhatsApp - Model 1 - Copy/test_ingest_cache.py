@@ -0,0 +1,120 @@
+import os
+
+import pandas as pd
+import pytest
+
+from chat_parser import list_chat_files, parse_chat_files, parse_whatsapp_chat
+from ingest_cache import load_files, load_manifest
+from synthetic_chats import generate_exports
+
+APPENDED = "30/09/25 09.15 - +966 50 000 0001: ابغى عينة\n"
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = str(tmp_path / 'chat')
+    generate_exports(folder, 600, seed=2)
+    return folder
+
+
+def cached_parse(folder, cache_dir, workers=1):
+    """Hasil lewat cache dibanding parsing ulang penuh; mengembalikan status per file."""
+    cached = parse_whatsapp_chat(folder, workers=workers, cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(cached, parse_whatsapp_chat(folder, workers=workers))
+    files, _ = load_manifest(cache_dir)
+    return {key: entry['status'] for key, entry in files.items()}
+
+
+def append(file_path, text):
+    with open(file_path, 'a', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_cold_and_warm_cache(folder, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    assert set(cached_parse(folder, cache_dir).values()) == {'parsed'}
+    assert set(cached_parse(folder, cache_dir).values()) == {'cached'}
+
+
+def test_manifest_is_keyed_by_relative_path(folder, tmp_path):
+    # File bernama sama di dua subfolder tidak saling menimpa entri manifest
+    name = os.path.basename(list_chat_files(folder)[0])
+    file_paths = []
+    for subfolder in ['a', 'b']:
+        os.makedirs(os.path.join(folder, subfolder))
+        file_paths.append(os.path.join(folder, subfolder, name))
+    with open(file_paths[0], 'w', encoding='utf-8') as f:
+        f.write(APPENDED)
+    with open(file_paths[1], 'w', encoding='utf-8') as f:
+        f.write(APPENDED.replace('ابغى عينة', 'كم السعر'))
+
+    cache_dir = str(tmp_path / 'cache')
+    for _ in range(2):
+        cached = load_files(file_paths, folder, cache_dir, workers=1)
+        pd.testing.assert_frame_equal(cached, parse_chat_files(file_paths, workers=1))
+    files, _ = load_manifest(cache_dir)
+    assert sorted(files) == [f'a/{name}', f'b/{name}']
+    assert {entry['status'] for entry in files.values()} == {'cached'}
+
+
+def test_appended_file_resumes_from_last_message(folder, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    cached_parse(folder, cache_dir)
+    first, second = list_chat_files(folder)[:2]
+    append(first, APPENDED)
+    # Baris lanjutan untuk pesan terakhir: pesan itu harus di-parsing ulang
+    append(second, "baris lanjutan pesan terakhir\n")
+
+    statuses = cached_parse(folder, cache_dir)
+    assert statuses[os.path.basename(first)] == 'appended'
+    assert statuses[os.path.basename(second)] == 'appended'
+    assert set(statuses.values()) == {'appended', 'cached'}
+
+
+def test_same_content_with_new_mtime_is_unchanged(folder, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    cached_parse(folder, cache_dir)
+    path = list_chat_files(folder)[0]
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert cached_parse(folder, cache_dir)[os.path.basename(path)] == 'unchanged'
+
+
+def test_truncated_and_rewritten_files_are_parsed_again(folder, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    cached_parse(folder, cache_dir)
+    truncated, rewritten = list_chat_files(folder)[:2]
+    with open(truncated, 'rb') as f:
+        data = f.read()
+    with open(truncated, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    with open(rewritten, 'w', encoding='utf-8') as f:
+        f.write(APPENDED)
+
+    statuses = cached_parse(folder, cache_dir)
+    assert statuses[os.path.basename(truncated)] == 'parsed'
+    assert statuses[os.path.basename(rewritten)] == 'parsed'
+
+
+def test_deleted_files_leave_the_cache(folder, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    cached_parse(folder, cache_dir)
+    paths = list_chat_files(folder)
+    # Lebih dari separuh baris store hilang: store dipadatkan
+    for path in paths[:len(paths) * 2 // 3]:
+        os.remove(path)
+
+    statuses = cached_parse(folder, cache_dir)
+    assert sorted(statuses) == sorted(os.path.basename(path) for path in list_chat_files(folder))
+    files, stores = load_manifest(cache_dir)
+    assert sum(stores.values()) == sum(entry['rows'] for entry in files.values())
+    assert sorted(stores) == sorted(name for name in os.listdir(cache_dir) if name != 'manifest.json')
+
+
+def test_parallel_ingest_matches_full_parse(folder, tmp_path, monkeypatch):
+    monkeypatch.setattr('chat_parser.MIN_BYTES_PER_WORKER', 1)
+    cache_dir = str(tmp_path / 'cache')
+    cached_parse(folder, cache_dir, workers=3)
+    append(list_chat_files(folder)[-1], APPENDED)
+    assert 'appended' in cached_parse(folder, cache_dir, workers=3).values()
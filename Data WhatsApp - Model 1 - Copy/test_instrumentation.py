@@ -0,0 +1,21 @@
+from instrumentation import Tracer, activate, span
+
+
+def test_span_without_tracer_ignores_writes():
+    with span('parse', rows_in=3) as first:
+        first.rows_out = 10
+    with span('tag') as second:
+        assert second.rows_out is None
+        assert second.name is None
+
+
+def test_active_tracer_records_rows():
+    tracer = Tracer()
+    activate(tracer)
+    try:
+        with span('parse', rows_in=3) as record:
+            record.rows_out = 2
+    finally:
+        activate(None)
+    assert [(s.name, s.rows_in, s.rows_out) for s in tracer.spans] == [('parse', 3, 2)]
+    assert tracer.spans[0].wall_ms >= 0
@@ -0,0 +1,66 @@
+import pytest
+
+import keyword_matcher
+from chat_parser import list_chat_files, parse_chat_files
+from keyword_matcher import AhoCorasick, KeywordTagger
+from keywords import KEYWORD_DICTIONARIES
+from synthetic_chats import generate_exports
+from text_normalizer import normalize_text
+
+EXTRA_MESSAGES = [
+    'كم السعر؟', 'الأسعار لو سمحت', 'كم سعر التولة', 'عود سومطره', 'SUMATRA', 'ابي عينة', 'بخور معطر موجود؟',
+    'انا من الرياض', 'مكة', '', 'ok',
+]
+
+
+@pytest.fixture(scope='module')
+def messages(tmp_path_factory):
+    folder = str(tmp_path_factory.mktemp('chat'))
+    generate_exports(folder, 3000, seed=4)
+    df = parse_chat_files(list_chat_files(folder), workers=1)
+    return df['Message_norm'].tolist() + [normalize_text(message) for message in EXTRA_MESSAGES]
+
+
+def naive_labels(message, categories):
+    """Kategori yang cocok dengan scan 'kata kunci in pesan' per kata kunci, seperti loop lama."""
+    return [
+        label for label, keywords in categories.items()
+        if any(normalize_text(keyword) in message for keyword in keywords)
+    ]
+
+
+@pytest.fixture(params=['python', 'pyahocorasick'])
+def tagger(request, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr(keyword_matcher, 'ahocorasick', None)
+    elif keyword_matcher.ahocorasick is None:
+        pytest.skip('pyahocorasick tidak terpasang')
+    return KeywordTagger(KEYWORD_DICTIONARIES)
+
+
+def test_overlapping_patterns_all_match():
+    automaton = AhoCorasick({'he': 1, 'she': 2, 'hers': 4, 'x': 8})
+    assert automaton.match_mask('ushers') == 7
+    assert automaton.match_mask('') == 0
+
+
+def test_tags_match_naive_scan(tagger, messages):
+    tags = tagger.tag(messages)
+    for group, categories in KEYWORD_DICTIONARIES.items():
+        for label in categories:
+            expected = [label in naive_labels(message, categories) for message in messages]
+            assert tagger.matches(tags, group, label).tolist() == expected, (group, label)
+
+
+def test_first_label_counts_match_naive_scan(tagger, messages):
+    tags = tagger.tag(messages)
+    for group, categories in KEYWORD_DICTIONARIES.items():
+        expected = dict.fromkeys(categories, 0)
+        for message in messages:
+            labels = naive_labels(message, categories)
+            if labels:
+                expected[labels[0]] += 1
+        assert tagger.count_first(tags, group) == expected
+        assert tagger.count(tags, group) == {
+            label: sum(label in naive_labels(message, categories) for message in messages) for label in categories
+        }
@@ -0,0 +1,82 @@
+import os
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from analysis import RESPONSE_BIN_EDGES, Analysis, most_common_senders
+from chat_parser import list_chat_files, parse_whatsapp_chat
+from live_watch import ChatWatcher
+from synthetic_chats import SELLER, generate_exports
+from time_series import DAY_NAMES
+
+NEW_CONTACT = 'Chat WhatsApp dengan +966 50 000 0009.txt'
+
+
+def batch_snapshot(folder):
+    """Agregat yang sama seperti LiveMetrics.snapshot, dihitung ulang penuh lewat Analysis."""
+    analysis = Analysis(parse_whatsapp_chat(folder, workers=1), SELLER)
+    cube = analysis.cube
+    turns = analysis.turns
+    unreplied = sorted(map(str, turns.last_speaker.index[turns.last_speaker['Is_seller']]))
+    drop_off = Counter(
+        analysis.tagger.first_label(turns.tail_tags[conversation], 'drop_off') or 'Lain-lain / Minat Awal Rendah'
+        for conversation in unreplied
+    )
+    response_minutes = turns.first_response['Response_minutes'].to_numpy()
+    response_minutes = response_minutes[response_minutes < RESPONSE_BIN_EDGES[-1]]
+    return {
+        'messages': len(analysis.buyers),
+        'top_10_senders': dict(most_common_senders(analysis.buyers['Sender'].value_counts())),
+        'hourly_activity': cube.hourly('buyer').tolist(),
+        'daily_activity': dict(zip(DAY_NAMES, cube.weekday('buyer').tolist())),
+        'date_activity': {date.strftime('%Y-%m-%d'): int(n) for date, n in analysis.stats['date_activity'].items()},
+        'response_counts': np.histogram(response_minutes, bins=RESPONSE_BIN_EDGES)[0].tolist(),
+        'response_mean': response_minutes.mean() if len(response_minutes) else None,
+        'funnel': {stage: int(n) for stage, n in analysis.funnel_counts.items()},
+        'unreplied': unreplied,
+        'drop_off': dict(drop_off),
+    }
+
+
+def live_snapshot(watcher):
+    snapshot = watcher.metrics.snapshot()
+    snapshot['response_counts'] = snapshot['response_time_minutes']['counts']
+    snapshot['response_mean'] = snapshot.pop('response_time_minutes')['mean']
+    return snapshot
+
+
+def assert_same_aggregates(watcher, folder):
+    live = live_snapshot(watcher)
+    batch = batch_snapshot(folder)
+    for key, expected in batch.items():
+        if key == 'response_mean':
+            assert live[key] == pytest.approx(expected), key
+        elif key == 'drop_off':
+            assert dict(live[key]) == expected, key
+        else:
+            assert live[key] == expected, key
+
+
+def append(file_path, text):
+    with open(file_path, 'a', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_watch_aggregates_match_batch_after_append(tmp_path):
+    folder = str(tmp_path / 'chat')
+    generate_exports(folder, 800, seed=6)
+    watcher = ChatWatcher(folder, SELLER)
+    watcher.scan()
+    assert_same_aggregates(watcher, folder)
+
+    first, second = list_chat_files(folder)[:2]
+    # Balasan penjual, pesan pembeli baru, dan baris lanjutan pesan terakhir
+    append(first, "30/09/25 09.15 - Nusa Restoria: السعر 250 ريال للتولة\n30/09/25 09.40 - +966 50 000 0001: ابغى عينة\n")
+    append(second, "baris lanjutan: كم سعر التولة\n")
+    with open(os.path.join(folder, NEW_CONTACT), 'w', encoding='utf-8') as f:
+        f.write("30/09/25 10.00 - +966 50 000 0009: انا من الرياض\n30/09/25 10.02 - Nusa Restoria: حياكم الله\n")
+
+    assert watcher.scan()
+    assert_same_aggregates(watcher, folder)
+    assert not watcher.scan()
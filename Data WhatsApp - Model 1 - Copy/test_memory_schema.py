@@ -0,0 +1,46 @@
+import pytest
+
+from analysis import Analysis
+from chat_parser import CATEGORICAL_COLUMNS, parse_whatsapp_chat
+from synthetic_chats import SELLER, generate_exports
+
+# Batas memori skema pesan (memory_usage(deep=True)) per pesan, diukur pada
+# korpus sintetis (synthetic_chats.py, rata-rata 15 pesan per percakapan).
+# Angka di tabel "Skema pesan di memori" README berasal dari pengukuran ini.
+N_MESSAGES = 20_000
+# Semua kolom selain teks pesan: Timestamp, Sender, Filename, Offset, Conversation, Is_seller
+MAX_SCHEMA_BYTES = 32
+# Kolom kalender tabel ekspor: Hour, Weekday, Date
+MAX_CALENDAR_BYTES = 12
+# Seluruh baris, termasuk Message dan Message_norm
+MAX_TOTAL_BYTES = 192
+
+TEXT_COLUMNS = ['Message', 'Message_norm']
+
+
+def bytes_per_message(df):
+    """memory_usage(deep=True) per kolom dibagi jumlah baris, tanpa index."""
+    return df.memory_usage(deep=True, index=False) / len(df)
+
+
+@pytest.fixture(scope='module')
+def analysis(tmp_path_factory):
+    folder = tmp_path_factory.mktemp('chat')
+    generate_exports(str(folder), N_MESSAGES, seed=0)
+    return Analysis(parse_whatsapp_chat(str(folder), workers=1), SELLER)
+
+
+def test_repeated_columns_are_categorical(analysis):
+    for column in CATEGORICAL_COLUMNS:
+        assert analysis.df_full[column].dtype == 'category'
+    assert analysis.df_full['Is_seller'].dtype == bool
+
+
+def test_schema_bytes_per_message(analysis):
+    usage = bytes_per_message(analysis.df_full)
+    assert usage.drop(TEXT_COLUMNS).sum() <= MAX_SCHEMA_BYTES
+    assert usage.sum() <= MAX_TOTAL_BYTES
+
+
+def test_calendar_bytes_per_message(analysis):
+    assert bytes_per_message(analysis.calendar).sum() <= MAX_CALENDAR_BYTES
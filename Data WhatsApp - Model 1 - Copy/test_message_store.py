@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from analysis import Analysis
+from chat_parser import parse_whatsapp_chat
+from message_store import open_store
+from synthetic_chats import SELLER, generate_exports
+
+SMALL_CHAT = (
+    "01/08/25 10.00 - +966 50 000 0001: كم السعر؟\n"
+    "01/08/25 10.05 - Nusa Restoria: السعر 250 ريال للتولة\n"
+    "01/08/25 10.07 - +966 50 000 0001: كم سعر التولة\n"
+    "01/08/25 10.09 - +966 50 000 0001: كم كان السعر قبل\n"
+    "01/08/25 10.11 - +966 50 000 0001: ميروكي كم سعره\n"
+)
+
+
+def build_analysis(folder):
+    return Analysis(parse_whatsapp_chat(folder, workers=1), SELLER)
+
+
+def write_chat(folder, text):
+    with open(os.path.join(folder, 'WhatsApp Chat dengan +966 50 000 0001.txt'), 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+@pytest.fixture
+def small_store(tmp_path):
+    folder = str(tmp_path / 'chat')
+    os.makedirs(folder)
+    write_chat(folder, SMALL_CHAT)
+    store = open_store(str(tmp_path / 'store.sqlite'), folder, SELLER, lambda: build_analysis(folder))
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize('keyword, expected', [
+    # Potongan kata: 'سعر' juga ada di 'السعر' dan 'سعره'
+    ('سعر', ['كم السعر؟', 'السعر 250 ريال للتولة', 'كم سعر التولة', 'كم كان السعر قبل', 'ميروكي كم سعره']),
+    # Kata sandang 'ال' boleh ada di antara kata kunci, kata lain tidak
+    ('كم سعر', ['كم السعر؟', 'كم سعر التولة', 'ميروكي كم سعره']),
+    ('كم السعر', ['كم السعر؟']),
+    # Dinormalisasi seperti Message_norm (taa marbuta, tashkeel)
+    ('تولَة', ['السعر 250 ريال للتولة', 'كم سعر التولة']),
+    # Kata di bawah 3 karakter tidak bisa disaring trigram, tetapi tetap dicocokkan
+    ('كم', ['كم السعر؟', 'كم سعر التولة', 'كم كان السعر قبل', 'ميروكي كم سعره']),
+])
+def test_keyword_search_matches_substrings(small_store, keyword, expected):
+    assert small_store.search(keyword=keyword)['Message'].tolist() == expected
+
+
+def test_keyword_search_matches_tagger_substring_scan(tmp_path):
+    folder = str(tmp_path / 'chat')
+    generate_exports(folder, 2000, seed=1)
+    analysis = build_analysis(folder)
+    with open_store(str(tmp_path / 'store.sqlite'), folder, SELLER, lambda: analysis) as store:
+        for keyword in ['سعر', 'عود', 'الرياض', 'price']:
+            found = store.search(keyword=keyword)
+            expected = analysis.df_full[analysis.df_full['Message_norm'].str.contains(keyword, regex=False)]
+            assert len(found) == len(expected) > 0
+            assert sorted(found['Message']) == sorted(expected['Message'])
+
+
+def test_store_is_rebuilt_when_folder_changes(tmp_path):
+    folder = str(tmp_path / 'chat')
+    os.makedirs(folder)
+    write_chat(folder, SMALL_CHAT)
+    path = str(tmp_path / 'store.sqlite')
+    builds = []
+
+    def counted_analysis():
+        builds.append(1)
+        return build_analysis(folder)
+
+    open_store(path, folder, SELLER, counted_analysis).close()
+    with open_store(path, folder, SELLER, counted_analysis) as store:
+        assert len(builds) == 1
+        assert store.search(keyword='عينة').empty
+
+    write_chat(folder, SMALL_CHAT + "01/08/25 10.20 - +966 50 000 0001: ابغى عينة\n")
+    with open_store(path, folder, SELLER, counted_analysis) as store:
+        assert len(builds) == 2
+        assert store.search(keyword='عينة')['Message'].tolist() == ['ابغى عينة']
+
+    # Penjual lain juga membuat store dibangun ulang
+    open_store(path, folder, [SELLER, 'Admin'], counted_analysis).close()
+    assert len(builds) == 3
@@ -0,0 +1,18 @@
+import warnings
+
+from report_renderer import Chart, _pyplot, draw_chart
+
+
+def test_barh_with_palette_renders_without_warnings():
+    plt = _pyplot('Agg')
+    chart = Chart('top', 'barh', 'Top', 'Jumlah', 'Pengirim', values=[5, 3, 3], labels=['a', 'b', 'c'],
+                  palette='viridis', options={'annotate': 'value'})
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        fig = draw_chart(chart, plt)
+    ax = fig.axes[0]
+    assert [patch.get_width() for patch in ax.patches] == [5, 3, 3]
+    assert ax.get_legend() is None
+    # Setiap bar mendapat warnanya sendiri dari palette
+    assert len({patch.get_facecolor() for patch in ax.patches}) == 3
+    plt.close(fig)
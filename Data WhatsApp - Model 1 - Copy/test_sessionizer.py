@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chat_parser import parse_whatsapp_chat
+from conversation_turns import build_turns
+from sessionizer import build_sessions
+from synthetic_chats import SELLER, generate_exports
+
+
+def loop_sessions(turn_messages, gap_minutes):
+    """Sesi acuan dengan loop per baris: sesi baru di awal percakapan atau setelah jeda > gap_minutes."""
+    rows = []
+    previous = None
+    for message in turn_messages.itertuples(index=False):
+        new_conversation = previous is None or message.Conversation != previous.Conversation
+        gap = None if new_conversation else (message.Timestamp - previous.Timestamp).total_seconds() / 60
+        if new_conversation or gap > gap_minutes:
+            rows.append({
+                'Conversation': message.Conversation,
+                'Session_index': 0 if new_conversation else rows[-1]['Session_index'] + 1,
+                'Start': message.Timestamp,
+                'Messages': 0,
+                'Seller_messages': 0,
+                'First_response_minutes': np.nan,
+            })
+        elif message.Is_seller and not previous.Is_seller and gap > 0 and np.isnan(rows[-1]['First_response_minutes']):
+            rows[-1]['First_response_minutes'] = gap
+        session = rows[-1]
+        session['End'] = message.Timestamp
+        session['Messages'] += 1
+        session['Seller_messages'] += int(message.Is_seller)
+        session['Drop_off'] = bool(message.Is_seller)
+        previous = message
+    return pd.DataFrame(rows)
+
+
+def frame(minutes, senders, conversations=None):
+    start = pd.Timestamp('2025-08-01 10:00')
+    return pd.DataFrame({
+        'Timestamp': [start + pd.Timedelta(minutes=m) for m in minutes],
+        'Sender': senders,
+        'Conversation': conversations or ['ali'] * len(minutes),
+    })
+
+
+@pytest.mark.parametrize('gap_minutes', [60, 24 * 60])
+def test_sessions_match_row_loop(tmp_path, gap_minutes):
+    folder = str(tmp_path / 'chat')
+    generate_exports(folder, 3000, seed=7)
+    turns = build_turns(parse_whatsapp_chat(folder, workers=1), SELLER)
+    table = build_sessions(turns.messages, gap_minutes=gap_minutes).table
+
+    expected = loop_sessions(turns.messages, gap_minutes)
+    assert len(table) > table['Conversation'].nunique()
+    columns = ['Conversation', 'Session_index', 'Start', 'End', 'Messages', 'Seller_messages',
+               'First_response_minutes', 'Drop_off']
+    pd.testing.assert_frame_equal(
+        table.reset_index(drop=True)[columns].astype({'Conversation': str}),
+        expected[columns].astype({'Conversation': str}),
+        check_dtype=False,
+    )
+
+
+def test_gap_exactly_at_threshold_stays_in_session():
+    # Jeda 60 menit tepat: sesi yang sama; 61 menit: sesi baru
+    df = frame([0, 60, 121, 122], ['Ali', SELLER, 'Ali', SELLER])
+    turns = build_turns(df, SELLER)
+    sessions = build_sessions(turns.messages, gap_minutes=60)
+
+    assert sessions.messages['Session'].tolist() == [0, 0, 1, 1]
+    assert sessions.table['First_response_minutes'].tolist() == [60.0, 1.0]
+    assert sessions.table['Drop_off'].tolist() == [True, True]
+
+
+def test_seller_reply_after_gap_is_not_a_response():
+    # Balasan yang datang setelah jeda memulai sesi baru, bukan waktu respons
+    df = frame([0, 90, 200], ['Ali', SELLER, 'Ali'], ['ali', 'ali', 'ali'])
+    table = build_sessions(build_turns(df, SELLER).messages, gap_minutes=60).table
+
+    assert table['Messages'].tolist() == [1, 1, 1]
+    assert table['First_response_minutes'].isna().all()
+    assert table['Drop_off'].tolist() == [False, True, False]
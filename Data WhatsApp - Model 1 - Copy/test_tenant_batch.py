@@ -0,0 +1,41 @@
+import os
+
+import tenant_batch
+from synthetic_chats import SELLER, generate_exports
+from tenant_batch import COMBINED_NAME, parse_tenants, run_batch
+
+CRASHING_TENANT = 'crash'
+
+run_tenant = tenant_batch.run_tenant
+
+
+def crash_or_run_tenant(tenant, output_folder, formats=('csv',)):
+    """run_tenant yang mematikan proses worker-nya untuk CRASHING_TENANT."""
+    if tenant.name == CRASHING_TENANT:
+        os._exit(1)
+    return run_tenant(tenant, output_folder, formats)
+
+
+def make_tenants(tmp_path, names):
+    entries = []
+    for i, name in enumerate(names):
+        folder = str(tmp_path / 'chat' / name)
+        generate_exports(folder, 300, seed=i)
+        entries.append({'name': name, 'seller': SELLER, 'folder': folder})
+    return parse_tenants(entries)
+
+
+def test_crashed_worker_only_fails_its_tenant(tmp_path, monkeypatch):
+    monkeypatch.setattr(tenant_batch, 'run_tenant', crash_or_run_tenant)
+    tenants = make_tenants(tmp_path, ['a', CRASHING_TENANT, 'b', 'c'])
+    output = tmp_path / 'hasil'
+
+    summaries, errors = run_batch(tenants, str(output), workers=2)
+
+    assert list(summaries) == ['a', 'b', 'c']
+    assert list(errors) == [CRASHING_TENANT]
+    for name in ['a', 'b', 'c']:
+        assert summaries[name]['messages'] > 0
+        assert (output / name).is_dir()
+    assert not (output / CRASHING_TENANT).exists()
+    assert (output / COMBINED_NAME).is_dir()
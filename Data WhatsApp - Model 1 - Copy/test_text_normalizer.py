@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from text_normalizer import normalize_series, normalize_text
+
+
+@pytest.mark.parametrize('text, expected', [
+    # Alef dengan hamza/madda/wasla
+    ('الأسعار', 'الاسعار'),
+    ('إرسال', 'ارسال'),
+    ('آخر', 'اخر'),
+    ('ٱلعود', 'العود'),
+    # Taa marbuta dan alef maqsura
+    ('جدة', 'جده'),
+    ('على', 'علي'),
+    # Tashkeel, tatweel dan alef kecil
+    ('عُودٌ طَبِيعِيّ', 'عود طبيعي'),
+    ('ســـعر', 'سعر'),
+    ('هٰذا', 'هذا'),
+    # Tanda arah teks dan zero-width
+    ('\u200f+966 53\u200e \u2066سعر\u2069', '+966 53 سعر'),
+    ('عي\u200cنة', 'عينه'),
+    # Huruf Latin menjadi huruf kecil
+    ('Price SUMATRA', 'price sumatra'),
+])
+def test_normalize_text(text, expected):
+    assert normalize_text(text) == expected
+
+
+def test_normalized_variants_share_one_keyword():
+    # Loop lama membandingkan teks mentah: varian ejaan tidak cocok
+    messages = ['كم الأسعار؟', 'كم الاسعار؟', 'كم الأَسْعَار؟', 'كم الإسعار؟']
+    keyword = 'الأسعار'
+    assert [keyword in message for message in messages] == [True, False, False, False]
+    assert [normalize_text(keyword) in normalize_text(message) for message in messages] == [True] * 4
+
+
+def test_normalize_series_matches_normalize_text():
+    messages = pd.Series(['جدة', 'Kuwait الكويت', 'عُودٌ', '', None], dtype='str')
+    expected = [normalize_text(message) if isinstance(message, str) else message for message in messages]
+    assert normalize_series(messages).tolist() == expected
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chat_parser import parse_whatsapp_chat
+from conversation_turns import seller_mask
+from synthetic_chats import SELLER, generate_exports
+from time_series import DAY_NAMES, build_cube, date_labels
+
+
+@pytest.fixture(scope='module')
+def df_full(tmp_path_factory):
+    folder = str(tmp_path_factory.mktemp('chat'))
+    generate_exports(folder, 5000, seed=8)
+    df = parse_whatsapp_chat(folder, workers=1)
+    return df.assign(Is_seller=seller_mask(df['Sender'], SELLER))
+
+
+@pytest.fixture(scope='module')
+def cube(df_full):
+    return build_cube(df_full['Timestamp'], df_full['Is_seller'])
+
+
+@pytest.mark.parametrize('role', ['buyer', 'seller', None])
+def test_views_match_groupby(df_full, cube, role):
+    if role is None:
+        rows = df_full
+    else:
+        rows = df_full[df_full['Is_seller'] == (role == 'seller')]
+    timestamps = rows['Timestamp']
+    dates = pd.date_range(df_full['Timestamp'].min().normalize(), df_full['Timestamp'].max().normalize(), name='Date')
+
+    daily = timestamps.groupby(timestamps.dt.normalize()).size().reindex(dates, fill_value=0)
+    assert cube.daily(role).tolist() == daily.tolist()
+
+    hourly = timestamps.groupby(timestamps.dt.hour).size().reindex(range(24), fill_value=0)
+    assert cube.hourly(role).tolist() == hourly.tolist()
+
+    weekday = timestamps.dt.day_name().value_counts().reindex(DAY_NAMES, fill_value=0)
+    assert cube.weekday(role).to_dict() == weekday.to_dict()
+
+    # Minggu Senin-Minggu, diberi label tanggal Senin
+    weekly = daily.resample('W-MON', label='left', closed='left').sum()
+    assert cube.weekly(role).to_dict() == weekly.to_dict()
+
+    rolling = daily.rolling(7, min_periods=1)
+    np.testing.assert_allclose(cube.rolling(7, role).to_numpy(), rolling.mean().to_numpy())
+    np.testing.assert_array_equal(cube.rolling(7, role, mean=False).to_numpy(), rolling.sum().to_numpy())
+
+
+def test_empty_cube():
+    cube = build_cube(pd.Series([], dtype='datetime64[ns]'), np.zeros(0, dtype=bool))
+    assert cube.daily().empty
+    assert cube.hourly().sum() == 0
+    assert cube.weekday().tolist() == [0] * 7
+    assert cube.weekly().empty
+
+
+def test_date_labels():
+    assert date_labels(pd.to_datetime(['2025-08-25', '2025-08-31'])) == ['Senin, 25-08-25', 'Minggu, 31-08-25']
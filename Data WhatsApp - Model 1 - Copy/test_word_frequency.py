@@ -0,0 +1,67 @@
+import random
+from collections import Counter
+
+import pytest
+
+from chat_parser import list_chat_files, parse_chat_files
+from synthetic_chats import generate_exports
+from word_frequency import ARABIC_STOP_WORDS, PLACEHOLDER_MESSAGES, TopKCounter, count_terms, tokenize
+
+
+@pytest.fixture(scope='module')
+def messages(tmp_path_factory):
+    folder = str(tmp_path_factory.mktemp('chat'))
+    generate_exports(folder, 3000, seed=9)
+    return parse_chat_files(list_chat_files(folder), workers=1)['Message_norm'].tolist()
+
+
+def naive_counts(messages):
+    """Counter biasa atas semua token, seperti loop lama, untuk dibandingkan dengan TopKCounter."""
+    unigrams = Counter()
+    bigrams = Counter()
+    for message in messages:
+        if message in PLACEHOLDER_MESSAGES:
+            continue
+        tokens = tokenize(message)
+        unigrams.update(token for token in tokens if token not in ARABIC_STOP_WORDS)
+        bigrams.update(
+            f"{first} {second}" for first, second in zip(tokens, tokens[1:])
+            if first not in ARABIC_STOP_WORDS and second not in ARABIC_STOP_WORDS
+        )
+    return unigrams, bigrams
+
+
+def test_counts_are_exact_below_capacity(messages):
+    terms = count_terms(messages, chunk_rows=500)
+    unigrams, bigrams = naive_counts(messages)
+    assert terms.unigrams.error == 0
+    assert terms.unigrams.most_common() == unigrams.most_common()
+    assert terms.bigrams.most_common() == bigrams.most_common()
+    assert terms.unigrams.most_common(10) == unigrams.most_common(10)
+
+
+def test_pruned_counts_stay_within_error_bound():
+    rng = random.Random(0)
+    # Distribusi Zipf: beberapa kata sangat sering, ekor panjang kata jarang
+    items = [f"w{int(rng.paretovariate(1.1))}" for _ in range(50_000)]
+    counter = TopKCounter(capacity=20)
+    for start in range(0, len(items), 1000):
+        counter.update(items[start:start + 1000])
+    exact = Counter(items)
+
+    assert counter.error > 0
+    assert counter.error <= counter.total / (counter.capacity + 1)
+    for item, n in exact.items():
+        estimate = counter.counts.get(item, 0)
+        assert n - counter.error <= estimate <= n
+        if n > counter.error:
+            assert item in counter.counts
+    top = [item for item, n in exact.most_common(5)]
+    assert [item for item, _ in counter.most_common(5)] == top
+
+
+def test_bigrams_stay_inside_messages_and_skip_stop_words():
+    terms = count_terms(['كم سعر العود', 'العود في جده', 'pesan ini dihapus', None])
+    assert terms.messages == 2
+    assert dict(terms.bigrams.most_common()) == {'كم سعر': 1, 'سعر العود': 1}
+    assert dict(terms.unigrams.most_common()) == {'العود': 2, 'كم': 1, 'سعر': 1, 'جده': 1}
@@ -0,0 +1,37 @@
+# Normalisasi teks Arab untuk pencocokan kata kunci. Dijalankan sekali saat
+# ingest (kolom 'Message_norm') dan sekali saat kamus kata kunci dikompilasi,
+# sehingga varian ejaan seperti جدة/جده atau الأسعار/الاسعار cukup ditulis
+# satu kali di kamus.
+
+_REMOVED = (
+    # Tashkeel (harakat, tanwin, sukun, shadda, dll.) dan alef kecil di atas huruf
+    [chr(c) for c in range(0x064B, 0x0660)] + ['\u0670']
+    # Tanda baca Al-Qur'an
+    + [chr(c) for c in range(0x06D6, 0x06EE)]
+    # Tatweel (kashida)
+    + ['\u0640']
+    # Tanda kontrol arah teks (LTR/RTL marks, embedding, isolate) dan zero-width
+    + ['\u061c', '\u200b', '\u200c', '\u200d', '\u200e', '\u200f', '\ufeff']
+    + [chr(c) for c in range(0x202A, 0x202F)]
+    + [chr(c) for c in range(0x2066, 0x206A)]
+)
+
+_REPLACED = {
+    # Alef dengan hamza/madda/wasla -> alef polos
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    # Taa marbuta -> haa, alef maqsura -> yaa
+    'ة': 'ه',
+    'ى': 'ي',
+}
+
+NORMALIZATION_TABLE = str.maketrans({**{char: None for char in _REMOVED}, **_REPLACED})
+
+
+def normalize_text(text):
+    """Menormalkan satu teks: hapus tashkeel/tatweel/tanda arah, satukan huruf, huruf kecil."""
+    return text.translate(NORMALIZATION_TABLE).lower()
+
+
+def normalize_series(messages):
+    """Versi vektor normalize_text untuk satu kolom pesan pandas."""
+    return messages.str.translate(NORMALIZATION_TABLE).str.lower()
@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Nama hari (0 = Senin, seperti dayofweek pandas). DAY_NAMES dipakai di tabel
+# ekspor; DAY_NAMES_ID untuk label grafik. Nama hari selalu diambil lewat
+# tabel ini dengan indeks hari, bukan diformat ulang per label.
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAY_NAMES_ID = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+# Sumbu jenis pengirim pada cube
+ROLES = {'buyer': 0, 'seller': 1}
+
+_EPOCH_WEEKDAY = 3  # 1970-01-01 adalah hari Kamis
+
+
+@dataclass
+class CountCube:
+    """
+    Jumlah pesan yang sudah di-bin per (tanggal, jam, jenis pengirim):
+    counts[hari ke-i sejak first_date, jam, 0 = pembeli / 1 = penjual].
+
+    Semua tampilan (harian, mingguan, per jam, per hari dalam minggu, rolling)
+    hanya menjumlahkan irisan array kecil ini, tanpa menyentuh pesan lagi.
+    Tanggal tanpa pesan tetap ada di cube dengan jumlah 0.
+    """
+    counts: np.ndarray
+    first_date: np.datetime64
+
+    def _select(self, role):
+        if role is None:
+            return self.counts.sum(axis=2)
+        return self.counts[:, :, ROLES[role]]
+
+    @property
+    def dates(self):
+        """Semua tanggal di cube (DatetimeIndex tengah malam, berurutan tanpa celah)."""
+        return pd.DatetimeIndex(self.first_date + np.arange(len(self.counts)), name='Date')
+
+    @property
+    def weekdays(self):
+        """Hari dalam minggu (0 = Senin) untuk setiap tanggal di cube."""
+        return (self.first_date.astype(np.int64) + np.arange(len(self.counts)) + _EPOCH_WEEKDAY) % 7
+
+    def daily(self, role=None):
+        """Jumlah pesan per tanggal ('buyer', 'seller' atau None = semua)."""
+        return pd.Series(self._select(role).sum(axis=1), index=self.dates, name='count')
+
+    def hourly(self, role=None):
+        """Jumlah pesan per jam (0-23), jam tanpa pesan bernilai 0."""
+        return pd.Series(self._select(role).sum(axis=0), index=pd.RangeIndex(24, name='Hour'), name='count')
+
+    def weekday(self, role=None):
+        """Jumlah pesan per hari dalam minggu, diindeks dengan DAY_NAMES."""
+        counts = np.bincount(self.weekdays, weights=self._select(role).sum(axis=1), minlength=7)
+        return pd.Series(counts.astype(np.int64), index=pd.Index(DAY_NAMES, name='Day'), name='count')
+
+    def weekly(self, role=None):
+        """Jumlah pesan per minggu (Senin-Minggu), diindeks dengan tanggal Senin awal minggu."""
+        daily = self._select(role).sum(axis=1)
+        # Hari di depan first_date sampai Senin sebelumnya diisi 0 agar minggu pas dengan kalender
+        offset = int(self.weekdays[0]) if len(daily) else 0
+        padded = np.concatenate([np.zeros(offset, dtype=daily.dtype), daily])
+        weeks = np.add.reduceat(padded, np.arange(0, len(padded), 7)) if len(padded) else padded
+        start = self.first_date - np.timedelta64(offset, 'D')
+        return pd.Series(weeks, index=pd.DatetimeIndex(start + 7 * np.arange(len(weeks)), name='Week'), name='count')
+
+    def rolling(self, window_days, role=None, mean=True):
+        """
+        Jumlah (atau rata-rata per hari) pesan dalam window_days hari terakhir
+        untuk setiap tanggal, dari selisih jumlah kumulatif. Tanggal awal yang
+        belum punya window_days hari dihitung dari hari yang tersedia saja.
+        """
+        cumulative = np.concatenate([[0], np.cumsum(self._select(role).sum(axis=1))])
+        ends = np.arange(1, len(cumulative))
+        starts = np.maximum(ends - window_days, 0)
+        totals = cumulative[ends] - cumulative[starts]
+        values = totals / (ends - starts) if mean else totals
+        return pd.Series(values, index=self.dates, name='count')
+
+
+def build_cube(timestamps, is_seller):
+    """
+    Membangun CountCube dari kolom Timestamp dan penanda penjual dengan satu
+    np.bincount atas jam sejak epoch (int64), tanpa kolom kalender per pesan.
+    """
+    hours = np.asarray(timestamps, dtype='datetime64[h]').astype(np.int64)
+    is_seller = np.asarray(is_seller, dtype=bool)
+    if not len(hours):
+        return CountCube(np.zeros((0, 24, 2), dtype=np.int64), np.datetime64('1970-01-01', 'D'))
+
+    days = hours // 24
+    first_day = days.min()
+    n_days = int(days.max() - first_day) + 1
+    bins = ((days - first_day) * 24 + hours % 24) * 2 + is_seller
+    counts = np.bincount(bins, minlength=n_days * 48).reshape(n_days, 24, 2)
+    return CountCube(counts, np.datetime64(int(first_day), 'D'))
+
+
+def date_labels(dates):
+    """Label sumbu tanggal "Hari, DD-MM-YY" dengan nama hari Indonesia dari tabel lookup."""
+    dates = pd.DatetimeIndex(dates)
+    day_names = np.array(DAY_NAMES_ID, dtype=object)[dates.dayofweek]
+    return (day_names + ', ' + np.asarray(dates.strftime('%d-%m-%y'), dtype=object)).tolist()
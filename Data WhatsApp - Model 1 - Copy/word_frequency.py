@@ -0,0 +1,132 @@
+import re
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+from itertools import islice
+
+from exporters import CHUNK_ROWS
+from text_normalizer import normalize_text
+
+# Frekuensi kata (unigram) dan pasangan kata berurutan (bigram) untuk word
+# cloud dan tabel frekuensi. Pesan dibaca per potongan dan dihitung ke
+# TopKCounter yang jumlah entrinya dibatasi, jadi memori tidak bertambah
+# mengikuti ukuran korpus. Token diambil dari teks ternormalisasi
+# (Message_norm), sehingga varian ejaan terhitung sebagai satu kata.
+
+# Kata fungsi Arab (kata depan, kata ganti, kata sambung, partikel) dan
+# beberapa kata Inggris/Indonesia yang sering muncul di chat; ditulis dalam
+# ejaan biasa lalu dinormalisasi seperti pesan. 'كم' sengaja tidak termasuk
+# agar pertanyaan harga ('كم سعر') tetap terbaca sebagai bigram.
+ARABIC_STOP_WORDS = frozenset(normalize_text(word) for word in [
+    'في', 'من', 'على', 'إلى', 'الى', 'عن', 'مع', 'أو', 'او', 'ثم', 'أن', 'ان', 'إن', 'لا', 'لم',
+    'لن', 'ما', 'ماذا', 'هل', 'قد', 'كل', 'بعد', 'قبل', 'عند', 'عندي', 'حتى', 'إذا', 'اذا', 'لو', 'بس', 'أي',
+    'اي', 'يا', 'هذا', 'هذه', 'هذي', 'ذلك', 'تلك', 'هنا', 'هناك', 'الذي', 'التي', 'الذين', 'اللي', 'انا', 'أنا',
+    'انت', 'أنت', 'انتم', 'أنتم', 'نحن', 'هو', 'هي', 'هم', 'لك', 'لكم', 'لي', 'لنا', 'له', 'لها', 'منك', 'منكم',
+    'عليكم', 'عليك', 'فيه', 'فيها', 'بها', 'به', 'كان', 'كانت', 'يكون', 'تكون', 'فقط', 'ايضا', 'أيضا', 'جدا',
+    'جداً', 'ال', 'ولا', 'وما', 'وش', 'ايش', 'شي', 'شيء', 'الله',
+    'the', 'and', 'to', 'of', 'is', 'in', 'you', 'for', 'your', 'me', 'my', 'it', 'we', 'our', 'this',
+    'that', 'be', 'are', 'or', 'on', 'with', 'yang', 'dan', 'di', 'ke', 'ini', 'itu',
+])
+
+# Token: huruf saja (Arab maupun Latin), minimal 2 karakter; angka, emoji dan
+# tanda baca menjadi pemisah
+TOKEN_PATTERN = re.compile(r"[^\W\d_]{2,}")
+# Bagian pesan yang bukan kata pengirim: URL, lampiran (misal
+# 'PTT-20250823-WA0005.opus (file terlampir)') dan penanda WhatsApp seperti
+# '<Media tidak disertakan>' atau '<Pesan ini diedit>'; keterangan di baris
+# berikutnya tetap dihitung
+NOISE_PATTERN = re.compile(
+    r"https?://\S+|\S+\.(?:com|net|org|me)\S*"
+    r"|\S+ \((?:file terlampir|file attached)\)"
+    r"|<(?:media tidak disertakan|media omitted|pesan ini diedit|this message was edited)>"
+)
+
+# Isi pesan pengganti dari WhatsApp (setelah normalisasi) yang bukan teks pengirim
+PLACEHOLDER_MESSAGES = frozenset(normalize_text(message) for message in [
+    'Pesan ini dihapus', 'This message was deleted', 'Anda menghapus pesan ini', 'You deleted this message',
+])
+
+# Batas entri per counter; korpus dengan kosakata lebih kecil dihitung persis
+DEFAULT_CAPACITY = 50_000
+
+
+class TopKCounter:
+    """
+    Counter dengan jumlah entri terbatas (algoritma Misra-Gries versi batch).
+
+    Selama jumlah entri unik tidak melebihi 2 x capacity, hitungannya persis.
+    Jika melebihi, hitungan entri ke-(capacity + 1) terbesar dikurangkan dari
+    semua entri dan entri yang habis dibuang. Setiap hitungan lalu bisa kurang
+    dari yang sebenarnya paling banyak sebesar error (<= total / (capacity + 1)),
+    tetapi setiap entri yang muncul lebih sering dari itu dijamin tetap ada.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.counts = Counter()
+        self.total = 0
+        self.error = 0
+
+    def update(self, items):
+        self.counts.update(items)
+        self.total += len(items)
+        if len(self.counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self):
+        threshold = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+        self.error += threshold
+        self.counts = Counter({item: n - threshold for item, n in self.counts.items() if n > threshold})
+
+    def most_common(self, n=None):
+        return self.counts.most_common(n)
+
+
+@dataclass
+class TermCounts:
+    """Hasil count_terms: counter unigram dan bigram, serta jumlah pesan yang dihitung."""
+    unigrams: TopKCounter
+    bigrams: TopKCounter
+    messages: int
+
+    def cloud_frequencies(self, n=150):
+        """Kata dan pasangan kata terbanyak sebagai {teks: jumlah}, masukan WordCloud.generate_from_frequencies."""
+        return dict(heapq.nlargest(n, self.unigrams.most_common(n) + self.bigrams.most_common(n), key=lambda item: item[1]))
+
+
+def tokenize(message):
+    """Token satu pesan ternormalisasi (tanpa URL dan penanda media), sebelum stop word dibuang."""
+    return TOKEN_PATTERN.findall(NOISE_PATTERN.sub(' ', message))
+
+
+def count_terms(messages, stop_words=ARABIC_STOP_WORDS, capacity=DEFAULT_CAPACITY, chunk_rows=CHUNK_ROWS):
+    """
+    Menghitung unigram dan bigram dari iterable pesan ternormalisasi (kolom
+    Message_norm, atau generator dari sumber lain) per potongan chunk_rows
+    pesan. Bigram tidak melewati batas pesan dan tidak memuat stop word.
+    """
+    unigrams = TopKCounter(capacity)
+    bigrams = TopKCounter(capacity)
+    n_messages = 0
+    messages = iter(messages)
+    while True:
+        chunk = list(islice(messages, chunk_rows))
+        if not chunk:
+            break
+        chunk_unigrams = []
+        chunk_bigrams = []
+        for message in chunk:
+            if not isinstance(message, str) or message in PLACEHOLDER_MESSAGES:
+                continue
+            n_messages += 1
+            tokens = tokenize(message)
+            kept = [token not in stop_words for token in tokens]
+            chunk_unigrams.extend(token for token, keep in zip(tokens, kept) if keep)
+            chunk_bigrams.extend(
+                f"{first} {second}"
+                for first, second, keep_first, keep_second in zip(tokens, tokens[1:], kept, kept[1:])
+                if keep_first and keep_second
+            )
+        unigrams.update(chunk_unigrams)
+        bigrams.update(chunk_bigrams)
+    return TermCounts(unigrams, bigrams, n_messages)